@@ -1,9 +1,40 @@
+/**
+ * HTTP API for a fleet of Mineflayer bots (BOT_NAMES), plus an in-game chat command listener.
+ *
+ * Each bot's routes are under /bots/:name/...; the first bot also answers them un-prefixed.
+ * GET/POST /bots and DELETE /bots/:name list, add and remove bots; GET /metrics serves
+ * Prometheus text for all of them. Per bot:
+ *
+ *   /travel /mine /use /drop /place /place_block /craft /mine_resource /kill
+ *       Actions. Mining, placing and using skip the pathfinder when the block is already in
+ *       reach; /craft takes several targets in one visit; /mine_resource mines `count`
+ *       blocks as one tour, or a whole vein (`mode: "vein"`). /travel, /mine,
+ *       /mine_resource, /place_block and /kill take `"async": true` and answer 202 with a
+ *       job: GET /jobs/:id (`?wait=`), DELETE /jobs/:id to cancel.
+ *   POST /batch
+ *       A compiled instruction list in one request, one NDJSON line per step; each step's
+ *       outcome is checked against the world (see instructionOutcomes).
+ *   GET /state_data, GET /events
+ *       Versioned state (ETag, `?since=` deltas, `?wait=` long-poll) and a Server-Sent
+ *       Events stream of state deltas and action progress.
+ *   /find_block /find_blocks
+ *       Nearest blocks from the block index (blockIndex.js), optionally ranked by path cost.
+ *   /path_cache /mining_stats /block_index /combat /status /health
+ *       Stats for the path cache (pathCache.js), dig lookahead, block index and fights.
+ *
+ * Requests carrying X-Trace-Id are traced to TRACE_PATH (tracing.js).
+ */
 const mineflayer = require('mineflayer');
 const { pathfinder, Movements, goals } = require('mineflayer-pathfinder');
 const Vec3 = require('vec3');
 const mcDataLoader = require('minecraft-data');
 const express = require('express');
 const rateLimit = require('express-rate-limit'); // For rate limiting
+const { BlockIndex } = require('./blockIndex');
+const { PathCache } = require('./pathCache');
+const { CombatController } = require('./combat');
+const { Registry, registerProcessMetrics } = require('./metrics');
+const { Tracer } = require('./tracing');
 const app = express();
 
 const winston = require('winston'); // For logging
@@ -41,831 +72,2185 @@ if (API_KEY) {
 // -------------------- Basic Rate Limiting -------------------- //
 const limiter = rateLimit({
   windowMs: 60 * 1000,
-  max: 120,
+  max: () => 120 * Math.max(fleet.size, 1), // 120 requests per minute per bot
   standardHeaders: true,
   legacyHeaders: false,
 });
 app.use(limiter);
 
-// Variables to store bot and mcData
-let bot;
-let mcData;
+// -------------------- Tracing -------------------- //
+
+// Requests carrying X-Trace-Id (the Python wrappers send it when their TRACE_PATH is set)
+// get spans in TRACE_PATH, under the caller's span
+const tracer = new Tracer(process.env.TRACE_PATH);
+app.use(tracer.middleware());
+
+// -------------------- Metrics -------------------- //
+
+// Served at GET /metrics in the Prometheus text format; per-bot series carry a `bot` label
+const metrics = new Registry();
+registerProcessMetrics(metrics);
+const httpDuration = metrics.histogram('http_request_duration_seconds', 'HTTP request latency by route');
+const pathPlanSeconds = metrics.histogram('pathfinder_plan_seconds', 'Pathfinder planning time per path_update, by result status');
+const pathLength = metrics.histogram('pathfinder_path_length', 'Nodes in each computed path', [1, 2, 5, 10, 20, 50, 100, 200, 500]);
+const digSeconds = metrics.histogram('dig_duration_seconds', 'Time to dig one block, by block type');
+const blockSearchSeconds = metrics.histogram('block_search_seconds', 'Nearest-block lookup time, by source (index or findBlock scan)');
+const failures = metrics.counter('bot_failures_total', 'Failed actions, by kind');
+
+// Latency of every request, labelled with the route pattern (/travel, not /travel?x=..) and
+// the bot that served it, once the response is done
+app.use((req, res, next) => {
+  const started = process.hrtime.bigint();
+  res.on('finish', () => {
+    httpDuration.observeSince({
+      bot: req.botName ?? '',
+      method: req.method,
+      route: req.route ? req.route.path : 'unmatched',
+      status: res.statusCode,
+    }, started);
+  });
+  next();
+});
+
+// -------------------- Fleet Configuration -------------------- //
+
+// Minecraft server every bot connects to, and the bots to start with
+const MC_HOST = process.env.MC_HOST || 'localhost'; // Replace with your server IP if different
+const MC_PORT = Number(process.env.MC_PORT) || 7754;
+const BOT_NAMES = (process.env.BOT_NAMES || 'BlockBot').split(',').map((n) => n.trim()).filter(Boolean);
+
+// Paths each bot keeps for reuse (see pathCache.js)
+const PATH_CACHE_SIZE = Number(process.env.PATH_CACHE_SIZE) || 256;
 
 // Define authorized users
 const authorizedUsers = ['Magic_karp24', 'martin874183']; // Replace with your Minecraft username(s)
 
-// Create the bot with updated username and port
-bot = mineflayer.createBot({
-  host: 'localhost',             // Replace with your server IP if different
-  port: 7754,                    // Updated server port
-  username: 'BlockBot',    // Updated bot username
-  // Additional options can be added here if needed
-});
+// Same log format as the root logger, prefixed with the bot's name
+function botLogger(name) {
+  return {
+    info: (message) => logger.info(`[${name}] ${message}`),
+    warn: (message) => logger.warn(`[${name}] ${message}`),
+    error: (message) => logger.error(`[${name}] ${message}`),
+  };
+}
+
+// One minecraft-data instance per game version, however many bots use it
+const mcDataByVersion = new Map();
+
+function sharedMcData(version) {
+  if (!mcDataByVersion.has(version)) {
+    mcDataByVersion.set(version, mcDataLoader(version));
+    logger.info(`mcData loaded for ${version}`);
+  }
+  return mcDataByVersion.get(version);
+}
 
-// Load the pathfinder plugin
-bot.loadPlugin(pathfinder);
+// Movements builds its block tables (blocks it can't break, liquids, replaceables, ...) from
+// minecraft-data on construction. The first bot on a version builds them; later bots get a
+// copy that shares those read-only tables and has its own bot and per-path scratch state.
+const movementsByVersion = new Map();
+
+function sharedMovements(bot) {
+  const template = movementsByVersion.get(bot.version);
+  if (!template) {
+    const movements = new Movements(bot, sharedMcData(bot.version));
+    movementsByVersion.set(bot.version, movements);
+    return movements;
+  }
+  return Object.assign(Object.create(Object.getPrototypeOf(template)), template, {
+    bot,
+    entityIntersections: {},
+    exclusionAreasStep: [],
+    exclusionAreasBreak: [],
+    exclusionAreasPlace: [],
+  });
+}
 
-// Handle connection errors
-bot.on('error', (err) => logger.error(`Bot encountered an error: ${err}`));
-bot.on('end', () => logger.info('Bot has disconnected from the server'));
+// -------------------- Bot Instances -------------------- //
 
-// Wait for the bot to spawn in the world
-bot.once('spawn', async () => {
-  try {
-    logger.info('Bot has spawned in the game');
+/**
+ * Connects one named bot and builds its API router. Everything below (actions, state
+ * versioning, events, jobs, batch and the chat listener) is per bot; minecraft-data and
+ * the pathfinder movement tables are shared through sharedMcData/sharedMovements.
+ * @param {string} name - The bot's Minecraft username, also its key in /bots/:name.
+ */
+function createBotInstance(name) {
+  const logger = botLogger(name);
+  const router = express.Router();
+
+  // Variables to store bot and mcData
+  let bot;
+  let mcData;
+  let blockIndex; // block type -> chunk sections, built once mcData is known
+  let pathCache;
+
+  // Create the bot with updated username and port
+  bot = mineflayer.createBot({
+    host: MC_HOST,
+    port: MC_PORT,
+    username: name,
+    // Additional options can be added here if needed
+  });
 
-    // Initialize Minecraft data based on the bot's version
-    mcData = mcDataLoader(bot.version);
-    logger.info('mcData loaded successfully');
+  // Load the pathfinder plugin
+  bot.loadPlugin(pathfinder);
 
-    // Initialize movements with Minecraft data
-    const defaultMove = new Movements(bot, mcData);
-    bot.pathfinder.setMovements(defaultMove);
-    logger.info('Pathfinder movements set');
+  // Fights are driven by physicsTick and hold listeners only while they last
+  const combat = new CombatController(bot);
 
-    // Start the Express server after the bot is ready
-    const PORT = process.env.PORT || 5001; // Use port from .env or default to 5001
-    app.listen(PORT, () => {
-      logger.info(`Express server is running on port ${PORT}`);
-    });
+  // Planning time and length of every path the pathfinder settles on (cached paths report 0 ms)
+  bot.on('path_update', (r) => {
+    pathPlanSeconds.observe({ bot: name, status: r.status }, (r.time || 0) / 1000);
+    if (r.status === 'noPath') {
+      failures.inc({ bot: name, kind: 'no_path' });
+    } else if (r.path) {
+      pathLength.observe({ bot: name }, r.path.length);
+    }
+  });
 
-    // You can add more initialization tasks here if needed
-  } catch (err) {
-    logger.error(`An error occurred during initialization: ${err.message}`);
-  }
-});
+  // Handle connection errors
+  bot.on('error', (err) => logger.error(`Bot encountered an error: ${err}`));
+  bot.on('end', () => logger.info('Bot has disconnected from the server'));
 
-// -------------------- Function Definitions -------------------- //
+  // Wait for the bot to spawn in the world
+  bot.once('spawn', async () => {
+    try {
+      logger.info('Bot has spawned in the game');
 
-// Function to travel to specific coordinates
-function travelToCoordinates(x, y, z) {
-  return new Promise((resolve, reject) => {
-    const goal = new goals.GoalBlock(x, y, z);
-    bot.pathfinder.setGoal(goal);
+      // Minecraft data and movement tables are shared by every bot on the same version
+      mcData = sharedMcData(bot.version);
+      bot.pathfinder.setMovements(sharedMovements(bot));
+      logger.info('Pathfinder movements set');
+      // Reuse A* results for routes travelled again, until a block along them changes
+      pathCache = new PathCache(bot, { maxEntries: PATH_CACHE_SIZE }).attach();
 
-    const onGoalReached = () => {
-      logger.info(`Reached destination (${x}, ${y}, ${z})`);
-      bot.removeListener('goal_reached', onGoalReached);
-      resolve();
-    };
+      bot.inventory.on('updateSlot', refreshState);
+      refreshState();
 
-    const onGoalFailed = (reason) => {
-      logger.warn(`Failed to reach destination: ${reason}`);
-      bot.removeListener('goal_reached', onGoalReached);
-      reject(new Error(reason));
-    };
+      // Index the chunks loaded so far, then follow chunk loads/unloads and block updates
+      blockIndex = new BlockIndex(bot, mcData).attach();
+      logger.info(`Block index built: ${JSON.stringify(blockIndex.stats())}`);
 
-    bot.once('goal_reached', onGoalReached);
-    bot.once('path_update', (r) => {
-      if (r.status === 'noPath') {
-        onGoalFailed('No path found');
-      }
-    });
+      // You can add more initialization tasks here if needed
+    } catch (err) {
+      logger.error(`An error occurred during initialization: ${err.message}`);
+    }
   });
-}
 
-// Function to mine a block at specific coordinates
-function mineBlockAt(x, y, z) {
-  return new Promise(async (resolve, reject) => {
-    try {
-      // Define the offset (you can adjust this as needed)
-      const offsetX = -1;
-      const offsetY = -1;
-      const offsetZ = 0;
-      const targetX = x + offsetX;
-      const targetY = y + offsetY;
-      const targetZ = z + offsetZ;
+  // -------------------- Function Definitions -------------------- //
 
-      // Move to the offset position using the existing travelToCoordinates function
-      await travelToCoordinates(targetX, targetY, targetZ);
+  // Function to travel to specific coordinates
+  // Rejects when no path exists, when the goal is replaced or cleared (another action or a
+  // cancelled job), or when the bot stops getting closer for TRAVEL_STALL_MS.
+  const TRAVEL_STALL_MS = 20000;
 
-      // Now attempt to mine the block at (x, y, z)
-      const targetBlock = bot.blockAt(new Vec3(x, y, z));
+  function travelToCoordinates(x, y, z) {
+    return travelToGoal(new goals.GoalBlock(x, y, z), new Vec3(x, y, z));
+  }
 
-      if (!targetBlock) {
-        return reject(new Error(`No block found at (${x}, ${y}, ${z})`));
-      }
+  // Runs the pathfinder to `goal`; `target` is the point progress is measured against.
+  // Resolves with how long the bot waited for its first path and how long it then walked.
+  function travelToGoal(goal, target) {
+    const { x, y, z } = target;
+    return tracer.span('travel', { bot: name, x, y, z }, (attrs) => new Promise((resolve, reject) => {
+      let closest = Infinity;
+      let lastProgressAt = Date.now();
+      const startedAt = Date.now();
+      let pathWaitMs = null;
+
+      const cleanup = () => {
+        clearInterval(watchdog);
+        bot.removeListener('goal_reached', onGoalReached);
+        bot.removeListener('path_update', onPathUpdate);
+        bot.removeListener('goal_updated', onGoalUpdated);
+      };
+
+      const onGoalReached = () => {
+        logger.info(`Reached destination (${x}, ${y}, ${z})`);
+        cleanup();
+        const elapsedMs = Date.now() - startedAt;
+        const timing = { pathWaitMs: pathWaitMs ?? elapsedMs, walkMs: elapsedMs - (pathWaitMs ?? elapsedMs) };
+        Object.assign(attrs, timing);
+        resolve(timing);
+      };
+
+      const onGoalFailed = (reason, kind) => {
+        logger.warn(`Failed to reach destination: ${reason}`);
+        failures.inc({ bot: name, kind });
+        cleanup();
+        if (bot.pathfinder.goal === goal) {
+          bot.pathfinder.setGoal(null);
+        }
+        reject(new Error(reason));
+      };
+
+      const onPathUpdate = (r) => {
+        if (r.status === 'noPath') {
+          onGoalFailed('No path found', 'travel_no_path');
+        } else if (pathWaitMs === null) {
+          pathWaitMs = Date.now() - startedAt;
+        }
+      };
 
-      if (!bot.canDigBlock(targetBlock)) {
-        return reject(new Error(`Cannot dig block at (${x}, ${y}, ${z})`));
-      }
+      const onGoalUpdated = (newGoal) => {
+        if (newGoal !== goal) {
+          onGoalFailed(newGoal ? 'Travel superseded by a new goal' : 'Travel cancelled', newGoal ? 'travel_superseded' : 'travel_cancelled');
+        }
+      };
+
+      const watchdog = setInterval(() => {
+        const distance = bot.entity.position.distanceTo(target);
+        if (distance < closest - 0.5) {
+          closest = distance;
+          lastProgressAt = Date.now();
+        } else if (Date.now() - lastProgressAt > TRAVEL_STALL_MS) {
+          onGoalFailed(`No progress for ${TRAVEL_STALL_MS / 1000}s, ${distance.toFixed(1)} blocks from destination`, 'travel_stalled');
+        }
+      }, 1000);
+
+      bot.pathfinder.setGoal(goal);
+      bot.on('goal_reached', onGoalReached);
+      bot.on('path_update', onPathUpdate);
+      bot.on('goal_updated', onGoalUpdated);
+    }));
+  }
+
+  // How far the bot can dig, place or use a block from (eyes to block centre)
+  const BLOCK_REACH = 4.5;
+
+  function withinReach(position) {
+    return bot.entity.position.offset(0, 1.62, 0).distanceTo(position.offset(0.5, 0.5, 0.5)) <= BLOCK_REACH;
+  }
 
-      // Optionally, look at the block before mining
-      await bot.lookAt(targetBlock.position, true);
+  // Walks only when the block at `position` is out of reach or out of sight. The goal takes
+  // any standing cell with a clear view of one of its faces, not one fixed offset that may
+  // be blocked, so instructions on adjacent blocks cost no pathfinder run at all.
+  // Resolves with travelToGoal's timings, or null when no travel was needed.
+  async function reachBlock(position) {
+    const block = bot.blockAt(position);
+    if (block && withinReach(position) && bot.canSeeBlock(block)) return null;
+    if (activeJob) activeJob.target = position;
+    return travelToGoal(reachGoal(position), position);
+  }
+
+  function reachGoal(position) {
+    return new goals.GoalLookAtBlock(position, bot.world, { reach: BLOCK_REACH });
+  }
+
+  // Same for placing a block at `position` against the top face of `reference` (the block
+  // below it); the bot must also not be standing in the cell it fills
+  async function reachPlacement(position, reference) {
+    const feet = bot.entity.position.floored();
+    const occupied = feet.equals(position) || feet.offset(0, 1, 0).equals(position);
+    if (!occupied && withinReach(reference.position) && bot.canSeeBlock(reference)) return;
+    if (activeJob) activeJob.target = position;
+    const goal = new goals.GoalPlaceBlock(position, bot.world, { range: BLOCK_REACH, LOS: true, faces: [new Vec3(0, -1, 0)] });
+    await travelToGoal(goal, position);
+  }
+
+  // -------------------- Mining Executor -------------------- //
+
+  // A gap between digs longer than this starts a new mining run instead of counting as idle
+  const MINING_RUN_GAP_MS = 10000;
+  const PREFETCH_TIMEOUT_MS = 2000;
+
+  const miningStats = { blocksMined: 0, digMs: 0, walkMs: 0, pathWaitMs: 0, idleMs: 0, prefetched: 0, prefetchFailed: 0 };
+  let lastDigEndedAt = null;
+
+  /**
+   * Computes the path to `position`'s reach goal from where the bot stands now, one A* slice
+   * (the pathfinder's tickTimeout) per event-loop turn so a dig in progress keeps running,
+   * and leaves it in the path cache for the travel that follows.
+   * The block being dug, `digging`, is still solid while the search runs: the entry does not
+   * depend on it (see PathCache.prime), so its removal keeps the entry, and a path that
+   * needs it is not cached. Neither is one by any other block that changed meanwhile.
+   * @returns {Promise<boolean>} - Whether a complete path was cached.
+   */
+  async function prefetchPath(position, digging) {
+    const start = bot.entity.position.clone();
+    const movements = bot.pathfinder.movements;
+    const goal = reachGoal(position);
+    const startedAt = performance.now();
+    const changed = pathCache ? pathCache.watch() : null;
+    let result = null;
+    try {
+      for (const step of bot.pathfinder.getPathFromTo(movements, start, goal, { timeout: PREFETCH_TIMEOUT_MS })) {
+        result = step.result;
+        if (result.status !== 'partial') break;
+        await new Promise((resolve) => setImmediate(resolve));
+      }
+    } finally {
+      if (changed) pathCache.unwatch(changed);
+    }
+    const primed = Boolean(pathCache && result &&
+      pathCache.prime(start, movements, goal, result, performance.now() - startedAt, { changed, removing: digging }));
+    miningStats[primed ? 'prefetched' : 'prefetchFailed']++;
+    return primed;
+  }
 
-      // Start mining the block
-      await bot.dig(targetBlock);
-      logger.info(`Successfully mined block at (${x}, ${y}, ${z})`);
-      resolve();
+  /**
+   * Digs `block` (already in reach) and records mining metrics. When `next`, the following
+   * dig target, is out of reach from here, its path is computed while this dig runs, so the
+   * walk on to it starts from the path cache without an A* wait.
+   * @param {Block} block - The block to dig.
+   * @param {Vec3|null} next - Where the next dig will be, if known.
+   * @param {Object|null} travel - reachBlock's timings for the walk to `block`.
+   */
+  async function digWithLookahead(block, next, travel) {
+    const started = Date.now();
+    if (lastDigEndedAt !== null && started - lastDigEndedAt < MINING_RUN_GAP_MS) {
+      // Anything but walking between two digs of a run (path waits, requests, looking) is idle
+      const walkMs = travel?.walkMs ?? 0;
+      miningStats.walkMs += walkMs;
+      miningStats.pathWaitMs += travel?.pathWaitMs ?? 0;
+      miningStats.idleMs += Math.max(0, started - lastDigEndedAt - walkMs);
+    }
+    const prefetch = next && !withinReach(next) ? prefetchPath(next, block.position).catch(() => false) : null;
+    const digStarted = process.hrtime.bigint();
+    try {
+      await tracer.span('dig', { bot: name, block: block.name }, () => bot.dig(block));
+      miningStats.blocksMined++;
+      digSeconds.observeSince({ bot: name, block: block.name }, digStarted);
     } catch (err) {
-      logger.error(`Error while mining: ${err.message}`);
-      reject(err);
+      failures.inc({ bot: name, kind: 'dig' });
+      throw err;
+    } finally {
+      lastDigEndedAt = Date.now();
+      miningStats.digMs += lastDigEndedAt - started;
     }
-  });
-}
+    // A search still running is cheaper to finish than to restart from scratch
+    if (prefetch) await prefetch;
+  }
+
+  function miningReport() {
+    const { blocksMined, digMs, walkMs, pathWaitMs, idleMs } = miningStats;
+    const activeMs = digMs + walkMs + idleMs;
+    return {
+      ...miningStats,
+      // Prefetched paths the travel to the next dig actually took from the cache
+      prefetchHits: pathCache ? pathCache.counters.primedHits : 0,
+      blocksPerMinute: activeMs > 0 ? Number((blocksMined / activeMs * 60000).toFixed(1)) : null,
+      idleFraction: activeMs > 0 ? Number((idleMs / activeMs).toFixed(3)) : null,
+      avgPathWaitMs: blocksMined ? Number((pathWaitMs / blocksMined).toFixed(1)) : null,
+    };
+  }
 
-// Function to use a block like a crafting table
-function useBlockAt(x, y, z) {
-  return new Promise((resolve, reject) => {
-    const targetBlock = bot.blockAt(new Vec3(x, y, z));
+  // Function to mine a block at specific coordinates
+  // `next` is the position of the dig that follows, if any (see digWithLookahead)
+  function mineBlockAt(x, y, z, next = null) {
+    return new Promise(async (resolve, reject) => {
+      try {
+        const travel = await reachBlock(new Vec3(x, y, z));
 
-    if (!targetBlock) {
-      return reject(new Error(`No block found at (${x}, ${y}, ${z})`));
-    }
+        // Now attempt to mine the block at (x, y, z)
+        const targetBlock = bot.blockAt(new Vec3(x, y, z));
 
-    bot.lookAt(targetBlock.position.offset(0.5, 0.5, 0.5), true)
-      .then(() => bot.activateBlock(targetBlock))
-      .then(() => {
-        logger.info(`Interacted with block at (${x}, ${y}, ${z})`);
-        resolve();
-      })
-      .catch((err) => {
-        logger.error(`Error while using block: ${err.message}`);
-        reject(err);
-      });
-  });
-}
+        if (!targetBlock) {
+          return reject(new Error(`No block found at (${x}, ${y}, ${z})`));
+        }
 
-// Function to drop an item by name
-function dropItemByName(itemName) {
-  return new Promise((resolve, reject) => {
-    const item = bot.inventory.items().find((i) => i.name === itemName);
+        if (!bot.canDigBlock(targetBlock)) {
+          return reject(new Error(`Cannot dig block at (${x}, ${y}, ${z})`));
+        }
 
-    if (!item) {
-      return reject(new Error(`Item "${itemName}" not found in inventory`));
-    }
+        // Optionally, look at the block before mining
+        await bot.lookAt(targetBlock.position, true);
 
-    bot.tossStack(item)
-      .then(() => {
-        logger.info(`Dropped item: ${itemName}`);
+        // Start mining the block
+        await digWithLookahead(targetBlock, next, travel);
+        logger.info(`Successfully mined block at (${x}, ${y}, ${z})`);
         resolve();
-      })
-      .catch((err) => {
-        logger.error(`Error while dropping item: ${err.message}`);
+      } catch (err) {
+        logger.error(`Error while mining: ${err.message}`);
         reject(err);
-      });
-  });
-}
+      }
+    });
+  }
 
-// Function to place a block at specific coordinates
-function placeBlockAt(blockName, x, y, z) {
-  return new Promise(async (resolve, reject) => {
+  // Function to use a block like a crafting table
+  async function useBlockAt(x, y, z) {
     try {
-      const referenceBlock = bot.blockAt(new Vec3(x, y - 1, z));
-      const targetPosition = new Vec3(x, y, z);
-
-      if (!referenceBlock) {
-        return reject(new Error(`No block to place against at (${x}, ${y - 1}, ${z})`));
+      const position = new Vec3(x, y, z);
+      if (!bot.blockAt(position)) {
+        throw new Error(`No block found at (${x}, ${y}, ${z})`);
       }
+      await reachBlock(position);
 
-      const item = bot.inventory.items().find((i) => i.name === blockName);
+      const targetBlock = bot.blockAt(position);
+      await bot.lookAt(targetBlock.position.offset(0.5, 0.5, 0.5), true);
+      await bot.activateBlock(targetBlock);
+      logger.info(`Interacted with block at (${x}, ${y}, ${z})`);
+    } catch (err) {
+      logger.error(`Error while using block: ${err.message}`);
+      throw err;
+    }
+  }
+
+  // Function to drop an item by name
+  function dropItemByName(itemName) {
+    return new Promise((resolve, reject) => {
+      const item = bot.inventory.items().find((i) => i.name === itemName);
 
       if (!item) {
-        return reject(new Error(`No "${blockName}" in inventory`));
+        return reject(new Error(`Item "${itemName}" not found in inventory`));
       }
 
-      await bot.equip(item, 'hand');
-      const faceVector = new Vec3(0, 1, 0); // Adjust as needed for placement
-      await bot.placeBlock(referenceBlock, faceVector);
-      logger.info(`Placed "${blockName}" at (${x}, ${y}, ${z})`);
-      resolve();
-    } catch (err) {
-      logger.error(`Error while placing block: ${err.message}`);
-      reject(err);
-    }
-  });
-}
+      bot.tossStack(item)
+        .then(() => {
+          logger.info(`Dropped item: ${itemName}`);
+          resolve();
+        })
+        .catch((err) => {
+          logger.error(`Error while dropping item: ${err.message}`);
+          reject(err);
+        });
+    });
+  }
 
-async function craftItem(itemName) {
-    try {
-      // Ensure mcData is available and load item information
-      if (!mcData) {
-        bot.chat("Minecraft data not loaded.");
-        return;
+  // Function to place a block at specific coordinates
+  function placeBlockAt(blockName, x, y, z) {
+    return new Promise(async (resolve, reject) => {
+      try {
+        const referenceBlock = bot.blockAt(new Vec3(x, y - 1, z));
+        const targetPosition = new Vec3(x, y, z);
+
+        if (!referenceBlock) {
+          return reject(new Error(`No block to place against at (${x}, ${y - 1}, ${z})`));
+        }
+
+        const item = bot.inventory.items().find((i) => i.name === blockName);
+
+        if (!item) {
+          return reject(new Error(`No "${blockName}" in inventory`));
+        }
+
+        await reachPlacement(targetPosition, referenceBlock);
+        await bot.equip(item, 'hand');
+        const faceVector = new Vec3(0, 1, 0); // Adjust as needed for placement
+        await bot.placeBlock(referenceBlock, faceVector);
+        logger.info(`Placed "${blockName}" at (${x}, ${y}, ${z})`);
+        resolve();
+      } catch (err) {
+        logger.error(`Error while placing block: ${err.message}`);
+        reject(err);
       }
-  
-      const item = mcData.itemsByName[itemName];
-      if (!item) {
-        bot.chat(`Item "${itemName}" does not exist.`);
-        logger.info(`Attempted to craft "${itemName}", but it does not exist.`);
-        return;
+    });
+  }
+
+  // -------------------- Crafting -------------------- //
+
+  let craftingTablePosition = null; // the table last crafted at, tried before any search
+
+  // Item name -> count carried
+  function inventoryCounts() {
+    const counts = {};
+    for (const item of bot.inventory.items()) {
+      counts[item.name] = (counts[item.name] || 0) + item.count;
+    }
+    return counts;
+  }
+
+  // Per-item change between two inventoryCounts() snapshots; unchanged items are left out
+  function inventoryDelta(before, after) {
+    const delta = {};
+    for (const name of new Set([...Object.keys(before), ...Object.keys(after)])) {
+      const change = (after[name] || 0) - (before[name] || 0);
+      if (change !== 0) delta[name] = change;
+    }
+    return delta;
+  }
+
+  // "2x oak_planks, 1x stick": what the inventory lacks to run `recipe` `times` times
+  function missingMaterials(recipe, times) {
+    const missing = [];
+    for (const ingredient of recipe.delta) {
+      if (ingredient.count >= 0) continue;
+      const required = -ingredient.count * times;
+      const carried = bot.inventory.count(ingredient.id, null);
+      if (carried < required) missing.push(`${required - carried}x ${mcData.items[ingredient.id].name}`);
+    }
+    return missing.join(', ');
+  }
+
+  /**
+   * The crafting table to craft at: the remembered one if it is still there, otherwise the
+   * nearest one from the block index. The bot only walks when the table is out of reach.
+   * @returns {Promise<Block>} - The crafting table block.
+   */
+  async function reachCraftingTable() {
+    const tableId = mcData.blocksByName.crafting_table.id;
+    let position = craftingTablePosition;
+    if (!position || bot.blockAt(position)?.type !== tableId) {
+      position = findNearestBlock(tableId, 64);
+      if (!position) {
+        throw new Error('No crafting table nearby');
       }
-  
-      const itemId = item.id;
-  
-      // Check for recipes without a crafting table first
-      let recipes = bot.recipesFor(itemId, null, 1, null);
-  
-      // If no recipe is found without a crafting table, search for a crafting table nearby
-      let craftingTableBlock = null;
-      if (recipes.length === 0) {
-        const craftingTablePosition = getBlockCoordinates('crafting_table', 64);
-  
-        if (!craftingTablePosition) {
-          bot.chat("No crafting table nearby.");
-          logger.info("Crafting table not found nearby.");
-          return;
+    }
+    await reachBlock(position);
+    craftingTablePosition = position;
+    return bot.blockAt(position);
+  }
+
+  /**
+   * Crafts several items in one go. Each target's recipe is looked up once for its whole
+   * count and run with bot.craft(recipe, times), and the crafting table is found (and walked
+   * to) at most once, only if some target needs it. Targets are crafted in order, so list
+   * intermediates (planks before sticks) first.
+   * @param {{itemName: string, count: number}[]} targets - Items and how many of each to make.
+   * @returns {Promise<Object>} - Items made per target (recipes can overshoot the count) and
+   *   the inventory delta. On failure the error carries the same report as `err.report`.
+   */
+  async function craftItems(targets) {
+    if (!mcData) {
+      throw new Error('Minecraft data not loaded');
+    }
+    const before = inventoryCounts();
+    const crafted = [];
+    let table = null;
+    try {
+      for (const { itemName, count = 1 } of targets) {
+        const item = mcData.itemsByName[itemName];
+        if (!item) {
+          throw new Error(`Item "${itemName}" does not exist`);
         }
-  
-        // Move to the crafting table and get the block instance
-        await travelToCoordinates(craftingTablePosition.x - 1, craftingTablePosition.y, craftingTablePosition.z - 1);
-        craftingTableBlock = bot.blockAt(craftingTablePosition);
-  
-        // Ensure the bot is close enough to the crafting table
-        if (bot.entity.position.distanceTo(craftingTableBlock.position) > 3) {
-          bot.chat("Cannot reach the crafting table.");
-          logger.info("Cannot reach the crafting table.");
-          return;
+
+        // Items with a 2x2 recipe are crafted in the inventory
+        const needsTable = bot.recipesAll(item.id, null, null).length === 0;
+        if (needsTable && !table) {
+          table = await reachCraftingTable();
         }
-  
-        await bot.lookAt(craftingTableBlock.position.offset(0.5, 1, 0.5));
-  
-        // Get recipes that require a crafting table
-        recipes = bot.recipesFor(itemId, null, 1, craftingTableBlock);
-      }
-  
-      // If still no recipe is found even with a crafting table, exit
-      if (recipes.length === 0) {
-        bot.chat(`No recipe found for "${itemName}".`);
-        logger.info(`No recipe found for "${itemName}".`);
-        return;
-      }
-  
-      const recipe = recipes[0];
-  
-      // Check if bot has all the required materials
-      const missingItems = [];
-      for (const ingredient of recipe.delta) {
-        if (ingredient.count < 0) {
-          const requiredItem = mcData.items[ingredient.id];
-          const requiredCount = -ingredient.count;
-          const inventoryCount = bot.inventory.count(ingredient.id, null);
-  
-          if (inventoryCount < requiredCount) {
-            missingItems.push(`${requiredCount - inventoryCount}x ${requiredItem.name}`);
+        const tableBlock = needsTable ? table : null;
+
+        const recipe = bot.recipesFor(item.id, null, count, tableBlock)[0];
+        if (!recipe) {
+          const known = bot.recipesAll(item.id, null, tableBlock)[0];
+          if (!known) {
+            throw new Error(`No recipe found for "${itemName}"`);
           }
+          throw new Error(`Missing materials to craft ${count} "${itemName}": ${missingMaterials(known, Math.ceil(count / known.result.count))}`);
         }
+
+        const times = Math.ceil(count / recipe.result.count);
+        await tracer.span('craft', { bot: name, item: itemName, times }, () => bot.craft(recipe, times, tableBlock));
+        crafted.push({ itemName, count: times * recipe.result.count });
+        logger.info(`Crafted ${times * recipe.result.count} "${itemName}"${tableBlock ? ' at the crafting table' : ''}.`);
       }
-  
-      if (missingItems.length > 0) {
-        bot.chat(`Missing materials: ${missingItems.join(', ')}`);
-        logger.info(`Missing materials to craft "${itemName}": ${missingItems.join(', ')}`);
-        return;
-      }
-  
-      // Craft the item using the crafting table if required
-      await bot.craft(recipe, 1, craftingTableBlock);
-  
-      bot.chat(`Successfully crafted "${itemName}".`);
-      logger.info(`Successfully crafted "${itemName}".`);
     } catch (err) {
-      bot.chat(`Failed to craft "${itemName}": ${err.message}`);
-      logger.error(`Failed to craft "${itemName}": ${err.message}`);
+      bot.chat(`Failed to craft: ${err.message}`);
+      logger.error(`Failed to craft: ${err.message}`);
+      err.report = { crafted, inventoryDelta: inventoryDelta(before, inventoryCounts()) };
+      throw err;
     }
+
+    bot.chat(`Crafted ${crafted.map((c) => `${c.count} "${c.itemName}"`).join(', ')}.`);
+    return { crafted, inventoryDelta: inventoryDelta(before, inventoryCounts()) };
   }
-  
-// Function to find the nearest block and return its coordinates
-/**
- * Finds the nearest block of the specified type within a given range.
- * @param {string} blockName - The name of the block to find (e.g., 'stone', 'dirt').
- * @param {number} [maxDistance=64] - The maximum distance to search for the block.
- * @returns {Vec3|null} - The position of the found block or null if not found.
- */
-function getBlockCoordinates(blockName, maxDistance = 64) {
-  // Get the block ID from the block name
-  const blockId = mcData.blocksByName[blockName]?.id;
 
-  if (blockId === undefined) {
-    // Block name is invalid
-    logger.warn(`Block "${blockName}" does not exist.`);
-    bot.chat(`Block "${blockName}" does not exist.`);
-    return null;
+  function craftItem(itemName, count = 1) {
+    return craftItems([{ itemName, count }]);
   }
 
-  // Use bot.findBlock to locate the nearest block
-  const block = bot.findBlock({
-    matching: blockId,
-    maxDistance: maxDistance,
-    count: 1, // Find only one block
-  });
+  /**
+   * Position of the nearest block with the given id, from the chunk index (which only scans
+   * the few sections that can hold it) or, before spawn, from bot.findBlock.
+   * @param {number} blockId - The block id to look for.
+   * @param {number} [maxDistance=64] - The maximum distance to search for the block.
+   * @returns {Vec3|null} - The block's position or null if none is in range.
+   */
+  function findNearestBlock(blockId, maxDistance = 64) {
+    return nearestBlocks(blockId, bot.entity.position, maxDistance, 1)[0] || null;
+  }
 
-  if (block) {
-    return block.position;
-  } else {
-    // Block not found within the specified range
-    logger.info(`"${blockName}" not found within ${maxDistance} blocks.`);
-    bot.chat(`"${blockName}" not found within ${maxDistance} blocks.`);
-    return null;
+  // Index lookup, or a findBlocks scan before spawn; timed either way
+  function nearestBlocks(blockId, origin, maxDistance, count) {
+    const started = process.hrtime.bigint();
+    const positions = blockIndex
+      ? blockIndex.nearest(blockId, origin, { maxDistance, count })
+      : bot.findBlocks({ matching: blockId, maxDistance, count });
+    blockSearchSeconds.observeSince({ bot: name, source: blockIndex ? 'index' : 'scan' }, started);
+    return positions;
   }
-}
 
-// Function to follow a user
-/**
- * Makes the bot follow the specified user.
- * @param {string} username - The Minecraft username to follow.
- */
-async function followUser(username) {
-  try {
-    const player = bot.players[username];
-    if (!player || !player.entity) {
-      bot.chat(`Player "${username}" not found.`);
-      logger.warn(`Player "${username}" not found.`);
-      return;
+  // Bounds on the pathfinder work spent ranking candidate blocks by travel cost
+  const PATH_RANK_TIMEOUT_MS = 150;      // one A* search
+  const PATH_RANK_BUDGET_MS = 1000;      // all searches of one query
+  const PATH_RANK_POOL = 4;              // nearest candidates searched per block asked for
+  const PATH_RANK_MAX_CANDIDATES = 24;
+
+  // Best path from `start` to `goal` found within timeoutMs. A* yields a 'partial' result
+  // after each slice (the pathfinder's tickTimeout) until it finds a path, proves there is
+  // none, or times out; the event loop gets a turn between slices, as in prefetchPath, so
+  // physics, keepalives and the other bots' requests are not held up by a ranked lookup
+  async function searchPath(start, goal, timeoutMs) {
+    let result = null;
+    for (const step of bot.pathfinder.getPathFromTo(bot.pathfinder.movements, start, goal, { timeout: timeoutMs })) {
+      result = step.result;
+      if (result.status !== 'partial') break;
+      await new Promise((resolve) => setImmediate(resolve));
     }
+    return result;
+  }
 
-    const goal = new goals.GoalFollow(player.entity, 1); // Follow at a distance of 1 block
-    bot.pathfinder.setGoal(goal, true); // True for dynamic goal (following movement)
-
-    bot.chat(`Now following "${username}".`);
-    logger.info(`Now following "${username}".`);
+  /**
+   * Up to `count` blocks of a type with an estimated travel cost, cheapest first.
+   * With rank 'euclidean' the cost is the straight-line distance. With rank 'path' the
+   * nearest count * PATH_RANK_POOL candidates are each given a bounded pathfinder search to
+   * within reach; blocks with no path are dropped, searches that ran out of time count the
+   * rest of the way as straight line, and candidates left once the query's budget is spent
+   * keep their straight-line distance.
+   * @param {number} blockId - The block id to look for.
+   * @param {Object} [options]
+   * @param {number} [options.count=1] - How many candidates to return at most.
+   * @param {number} [options.maxDistance=64] - Search radius in blocks.
+   * @param {string} [options.rank='euclidean'] - 'euclidean' or 'path'.
+   * @returns {Promise<{position: Vec3, distance: number, cost: number, costSource: string}[]>}
+   */
+  async function findBlocks(blockId, { count = 1, maxDistance = 64, rank = 'euclidean' } = {}) {
+    const origin = bot.entity.position.clone();
+    const pool = rank === 'path' ? Math.min(count * PATH_RANK_POOL, PATH_RANK_MAX_CANDIDATES) : count;
+    const positions = nearestBlocks(blockId, origin, maxDistance, pool);
+    const candidates = positions.map((position) => ({ position, distance: Number(origin.distanceTo(position).toFixed(1)) }));
+    if (rank !== 'path') {
+      return candidates.map((candidate) => ({ ...candidate, cost: candidate.distance, costSource: 'euclidean' }));
+    }
 
-    // Optionally, listen for 'playerMoved' or other events to update the goal dynamically
-  } catch (err) {
-    bot.chat(`Failed to follow "${username}": ${err.message}`);
-    logger.error(`Failed to follow "${username}": ${err.message}`);
+    const started = Date.now();
+    const ranked = [];
+    for (const candidate of candidates) {
+      const remainingMs = PATH_RANK_BUDGET_MS - (Date.now() - started);
+      if (remainingMs <= 0) {
+        ranked.push({ ...candidate, cost: candidate.distance, costSource: 'unsearched' });
+        continue;
+      }
+      const result = await searchPath(origin, new goals.GoalLookAtBlock(candidate.position, bot.world), Math.min(PATH_RANK_TIMEOUT_MS, remainingMs));
+      if (!result || result.status === 'noPath') continue;
+      let cost = result.cost;
+      if (result.status !== 'success') {
+        const end = result.path.length ? result.path[result.path.length - 1] : origin;
+        cost += candidate.position.distanceTo(new Vec3(end.x, end.y, end.z));
+      }
+      ranked.push({ ...candidate, cost: Number(cost.toFixed(1)), costSource: result.status === 'success' ? 'path' : 'partial_path' });
+    }
+    ranked.sort((a, b) => a.cost - b.cost);
+    return ranked.slice(0, count);
   }
-}
 
-// -------------------- mineResource Function -------------------- //
+  // Function to find the nearest block and return its coordinates
+  /**
+   * Finds the nearest block of the specified type within a given range.
+   * @param {string} blockName - The name of the block to find (e.g., 'stone', 'dirt').
+   * @param {number} [maxDistance=64] - The maximum distance to search for the block.
+   * @returns {Vec3|null} - The position of the found block or null if not found.
+   */
+  function getBlockCoordinates(blockName, maxDistance = 64) {
+    // Get the block ID from the block name
+    const blockId = mcData.blocksByName[blockName]?.id;
+
+    if (blockId === undefined) {
+      // Block name is invalid
+      logger.warn(`Block "${blockName}" does not exist.`);
+      bot.chat(`Block "${blockName}" does not exist.`);
+      return null;
+    }
 
-/**
- * Combines finding the nearest specified block and mining it.
- * @param {string} blockName - The name of the block to find and mine (e.g., 'stone', 'diamond_ore').
- * @param {number} [maxDistance=64] - The maximum distance to search for the block.
- */
-async function mineResource(blockName, maxDistance = 64) {
-  try {
-    // Find the nearest block coordinates
-    const blockPosition = getBlockCoordinates(blockName, maxDistance);
+    const position = findNearestBlock(blockId, maxDistance);
 
-    if (!blockPosition) {
-      // getBlockCoordinates already informs the user if block not found
-      return;
+    if (position) {
+      return position;
+    } else {
+      // Block not found within the specified range
+      logger.info(`"${blockName}" not found within ${maxDistance} blocks.`);
+      bot.chat(`"${blockName}" not found within ${maxDistance} blocks.`);
+      return null;
     }
+  }
 
-    const { x, y, z } = blockPosition;
+  // Function to follow a user
+  /**
+   * Makes the bot follow the specified user.
+   * @param {string} username - The Minecraft username to follow.
+   */
+  async function followUser(username) {
+    try {
+      const player = bot.players[username];
+      if (!player || !player.entity) {
+        bot.chat(`Player "${username}" not found.`);
+        logger.warn(`Player "${username}" not found.`);
+        return;
+      }
 
-    bot.chat(`Starting to mine "${blockName}" at (${x}, ${y}, ${z}).`);
-    logger.info(`Starting to mine "${blockName}" at (${x}, ${y}, ${z}).`);
+      const goal = new goals.GoalFollow(player.entity, 1); // Follow at a distance of 1 block
+      bot.pathfinder.setGoal(goal, true); // True for dynamic goal (following movement)
 
-    // Mine the block
-    await mineBlockAt(x, y, z);
+      bot.chat(`Now following "${username}".`);
+      logger.info(`Now following "${username}".`);
 
-    bot.chat(`Successfully mined "${blockName}" at (${x}, ${y}, ${z}).`);
-    logger.info(`Successfully mined "${blockName}" at (${x}, ${y}, ${z}).`);
-  } catch (err) {
-    bot.chat(`Failed to mine "${blockName}": ${err.message}`);
-    logger.error(`Failed to mine "${blockName}": ${err.message}`);
+      // Optionally, listen for 'playerMoved' or other events to update the goal dynamically
+    } catch (err) {
+      bot.chat(`Failed to follow "${username}": ${err.message}`);
+      logger.error(`Failed to follow "${username}": ${err.message}`);
+    }
   }
-}
 
-async function killEntity(entityType) {
+  // -------------------- mineResource Function -------------------- //
+
+  /**
+   * Combines finding the nearest specified block and mining it.
+   * @param {string} blockName - The name of the block to find and mine (e.g., 'stone', 'diamond_ore').
+   * @param {number} [maxDistance=64] - The maximum distance to search for the block.
+   * @param {string} [rank='euclidean'] - 'path' mines the block cheapest to walk to instead of the nearest.
+   * @param {number} [count=1] - Blocks to mine, as one tour (mineResourceTour).
+   * @param {string} [mode='blocks'] - 'vein' mines the whole cluster around the chosen block instead (mineVein).
+   */
+  async function mineResource(blockName, maxDistance = 64, rank = 'euclidean', count = 1, mode = 'blocks') {
+    if (mode === 'vein') {
+      return mineVein(blockName, maxDistance, rank);
+    }
+    if (count > 1) {
+      return mineResourceTour(blockName, count, maxDistance, rank);
+    }
     try {
-      const targetEntity = bot.nearestEntity(entity => (entity.mobType === entityType || entity.name === entityType));
-  
-      if (!targetEntity) {
-        bot.chat(`No ${entityType} found nearby.`);
-        logger.info(`No ${entityType} found nearby.`);
-        return;
+      // Find the nearest (or, ranked by path, the cheapest to reach) block coordinates
+      let blockPosition;
+      if (rank === 'path' && mcData.blocksByName[blockName]) {
+        const [best] = await findBlocks(mcData.blocksByName[blockName].id, { maxDistance, rank });
+        blockPosition = best ? best.position : null;
+        if (!blockPosition) bot.chat(`No reachable "${blockName}" within ${maxDistance} blocks.`);
+      } else {
+        blockPosition = getBlockCoordinates(blockName, maxDistance);
       }
-  
-      bot.chat(`Starting to attack the nearest ${entityType}.`);
-      logger.info(`Starting to attack the nearest ${entityType} at position (${targetEntity.position.x}, ${targetEntity.position.y}, ${targetEntity.position.z})`);
-  
-      const goal = new goals.GoalFollow(targetEntity, 1);
-      bot.pathfinder.setGoal(goal, true);
-  
-      bot.on('entityGone', (entity) => {
-        if (entity === targetEntity) {
-          bot.chat(`Successfully killed the ${entityType}.`);
-          logger.info(`Successfully killed the ${entityType}.`);
-          bot.pathfinder.setGoal(null);
-        }
-      });
-  
-      const attackInterval = setInterval(() => {
-        if (targetEntity.isValid) {
-          bot.attack(targetEntity);
-        } else {
-          clearInterval(attackInterval);
-        }
-      }, 1000);
+
+      if (!blockPosition) {
+        // getBlockCoordinates already informs the user if block not found
+        throw new Error(`"${blockName}" not found within ${maxDistance} blocks`);
+      }
+
+      const { x, y, z } = blockPosition;
+
+      bot.chat(`Starting to mine "${blockName}" at (${x}, ${y}, ${z}).`);
+      logger.info(`Starting to mine "${blockName}" at (${x}, ${y}, ${z}).`);
+
+      // Mine the block
+      await mineBlockAt(x, y, z);
+
+      bot.chat(`Successfully mined "${blockName}" at (${x}, ${y}, ${z}).`);
+      logger.info(`Successfully mined "${blockName}" at (${x}, ${y}, ${z}).`);
     } catch (err) {
-      bot.chat(`Failed to attack ${entityType}: ${err.message}`);
-      logger.error(`Failed to attack ${entityType}: ${err.message}`);
+      bot.chat(`Failed to mine "${blockName}": ${err.message}`);
+      logger.error(`Failed to mine "${blockName}": ${err.message}`);
+      throw err;
     }
-}
+  }
 
-async function placeBlock(blockName, x, y, z) {
-    try {
-      // Check if the bot has the specified block in its inventory
-      const blockItem = bot.inventory.items().find(item => item.name === blockName);
-  
-      if (!blockItem) {
-        bot.chat(`I don't have any ${blockName}.`);
-        logger.info(`Attempted to place ${blockName}, but it was not found in inventory.`);
-        return;
+  // -------------------- Mining Tours -------------------- //
+
+  const MAX_TOUR_BLOCKS = 64;
+  const TOUR_ROUNDS = 3;            // re-selections when tour blocks turn out unminable
+  const TOUR_VERTICAL_WEIGHT = 2;   // digging down or pillaring up costs more than walking
+
+  // Travel cost estimate between two blocks for tour ordering (a path search per pair
+  // would cost more than the tour saves)
+  function travelEstimate(a, b) {
+    const dx = a.x - b.x;
+    const dy = (a.y - b.y) * TOUR_VERTICAL_WEIGHT;
+    const dz = a.z - b.z;
+    return Math.sqrt(dx * dx + dy * dy + dz * dz);
+  }
+
+  /**
+   * Orders block positions into a short open tour from `start`: nearest neighbour first,
+   * then 2-opt (reverse any segment whose reversal shortens the tour) until nothing improves.
+   * @param {Vec3} start - Where the bot is.
+   * @param {Vec3[]} positions - Blocks to visit.
+   * @returns {Vec3[]} - The same positions in visiting order.
+   */
+  function planTour(start, positions) {
+    const remaining = positions.slice();
+    const tour = [];
+    let current = start;
+    while (remaining.length) {
+      let best = 0;
+      for (let i = 1; i < remaining.length; i++) {
+        if (travelEstimate(current, remaining[i]) < travelEstimate(current, remaining[best])) best = i;
       }
-  
-      // Move to a position close to the target coordinates using the existing travel function
-      const targetPosition = { x: x-1, y: y - 1, z: z }; // Adjust y so it can place on the ground level
-      await travelToCoordinates(targetPosition.x, targetPosition.y, targetPosition.z);
-  
-      // Check if there's a block in the target position and mine it if necessary
-      const targetBlock = bot.blockAt(new Vec3(x, y, z));
-      if (targetBlock && targetBlock.name !== 'air') {
-        bot.chat(`Clearing space by mining existing ${targetBlock.name} at (${x}, ${y}, ${z}).`);
-        logger.info(`Clearing space by mining existing ${targetBlock.name} at (${x}, ${y}, ${z}).`);
-        await bot.dig(targetBlock);
-      }
-  
-      // Equip the block in hand
-      await bot.equip(blockItem, 'hand');
-  
-      // Reference block to place against (the block at the specified position's y-1 level)
-      const referenceBlock = bot.blockAt(new Vec3(x, y - 1, z));
-      
-      if (!referenceBlock) {
-        bot.chat(`No block to place ${blockName} against at (${x}, ${y - 1}, ${z}).`);
-        logger.info(`No block found at (${x}, ${y - 1}, ${z}) to place ${blockName} against.`);
-        return;
+      current = remaining.splice(best, 1)[0];
+      tour.push(current);
+    }
+
+    let improved = true;
+    while (improved) {
+      improved = false;
+      for (let i = 0; i < tour.length - 1; i++) {
+        const before = i === 0 ? start : tour[i - 1];
+        for (let j = i + 1; j < tour.length; j++) {
+          const after = tour[j + 1];
+          const kept = travelEstimate(before, tour[i]) + (after ? travelEstimate(tour[j], after) : 0);
+          const reversed = travelEstimate(before, tour[j]) + (after ? travelEstimate(tour[i], after) : 0);
+          if (reversed < kept - 1e-9) {
+            tour.splice(i, j - i + 1, ...tour.slice(i, j + 1).reverse());
+            improved = true;
+          }
+        }
       }
-  
-      // Place the block against the reference block
-      await bot.placeBlock(referenceBlock, new Vec3(0, 1, 0)); // Adjust face vector as needed for placement direction
-      bot.chat(`Successfully placed ${blockName} at (${x}, ${y}, ${z}).`);
-      logger.info(`Placed ${blockName} at (${x}, ${y}, ${z}).`);
-    } catch (err) {
-      bot.chat(`Failed to place ${blockName}: ${err.message}`);
-      logger.error(`Failed to place ${blockName} at (${x}, ${y}, ${z}): ${err.message}`);
     }
+    return tour;
   }
-  
-// -------------------- Express API Endpoints -------------------- //
 
-// Test endpoint
-app.get('/', (req, res) => {
-  res.send('Minecraft Bot API is running');
-});
+  // Mines the block at `position` if it is still `blockId`, walking only when it is out of reach
+  async function mineTourBlock(position, blockId, next = null) {
+    const { x, y, z } = position;
+    if (bot.blockAt(position)?.type !== blockId) {
+      throw new Error(`Block at (${x}, ${y}, ${z}) is no longer there`);
+    }
+    const travel = await reachBlock(position);
+    const block = bot.blockAt(position);
+    if (!bot.canDigBlock(block)) {
+      throw new Error(`Cannot dig block at (${x}, ${y}, ${z})`);
+    }
+    await digWithLookahead(block, next, travel);
+  }
 
-// Health/Status endpoints for monitoring
-app.get('/status', (req, res) => {
-  try {
-    const ready = Boolean(bot && bot.username && mcData);
-    res.json({ status: ready ? 'ready' : 'not_ready', bot: bot?.username || null });
-  } catch (e) {
-    res.json({ status: 'not_ready' });
+  // Mines `tour` in order, adding blocks that can't be mined to `skipped`; cancelling the job stops it
+  async function mineTour(tour, block, skipped) {
+    let mined = 0;
+    let travelled = 0;
+    logger.info(`Mining tour of ${tour.length} "${block.name}" (estimated ${tour.reduce((sum, p, i) => sum + travelEstimate(i ? tour[i - 1] : bot.entity.position, p), 0).toFixed(0)} blocks of travel)`);
+    for (const [i, position] of tour.entries()) {
+      if (activeJob?.status === 'cancelling') {
+        throw new Error('Mining tour cancelled');
+      }
+      const from = bot.entity.position.clone();
+      try {
+        await mineTourBlock(position, block.id, tour[i + 1] || null);
+        mined++;
+      } catch (err) {
+        if (activeJob?.status === 'cancelling') throw err;
+        logger.warn(`Skipping "${block.name}" at ${position}: ${err.message}`);
+        skipped.add(position.toString());
+      }
+      travelled += from.distanceTo(bot.entity.position);
+    }
+    return { mined, travelled };
   }
-});
 
-app.get('/health', (req, res) => {
-  try {
-    const ready = Boolean(bot && bot.username && mcData);
-    res.json({ status: ready ? 'ready' : 'not_ready', bot: bot?.username || null });
-  } catch (e) {
-    res.json({ status: 'not_ready' });
+  function tourReport(blockName, started, { travelled, ...counts }) {
+    const seconds = (Date.now() - started) / 1000;
+    const report = {
+      blockName,
+      ...counts,
+      seconds: Number(seconds.toFixed(1)),
+      blocksTravelled: Math.round(travelled),
+      blocksPerMinute: seconds > 0 ? Number((counts.mined / seconds * 60).toFixed(1)) : null,
+    };
+    logger.info(`Mining tour finished: ${JSON.stringify(report)}`);
+    return report;
   }
-});
 
-// New endpoint to get state data
-app.get('/state_data', (req, res) => {
-  const stateData = {
-    botName: bot.username,
-    position: {
-      x: Math.round(bot.entity.position.x), // Rounding the x position
-      y: Math.round(bot.entity.position.y), // Rounding the y position
-      z: Math.round(bot.entity.position.z)  // Rounding the z position
-    },
-    health: bot.health,
-    inventory: bot.inventory.items().map(item => ({
-      name: item.name,
-      count: item.count,
-      slot: item.slot
-    })),
-    // Add more state data as needed
-  };
-  res.json(stateData);
-});
+  /**
+   * Mines `count` blocks of a type in one go: picks the candidates (nearest, or cheapest by
+   * path with rank 'path'), orders them with planTour and mines them back to back, so there
+   * is one request and one block search instead of one per block, and blocks already within
+   * reach of the last one need no pathing at all. Blocks that can't be mined are skipped and
+   * replaced from a fresh search, up to TOUR_ROUNDS times.
+   * @returns {Promise<Object>} - Mined count, skipped count, duration and blocks per minute.
+   */
+  async function mineResourceTour(blockName, count, maxDistance = 64, rank = 'euclidean') {
+    const block = mcData.blocksByName[blockName];
+    if (!block) {
+      bot.chat(`Block "${blockName}" does not exist.`);
+      throw new Error(`Block "${blockName}" does not exist`);
+    }
+    const started = Date.now();
+    const skipped = new Set();
+    let mined = 0;
+    let travelled = 0;
+
+    for (let round = 0; round < TOUR_ROUNDS && mined < count; round++) {
+      const wanted = count - mined;
+      const positions = (await findBlocks(block.id, { count: Math.min(wanted + skipped.size, MAX_TOUR_BLOCKS), maxDistance, rank }))
+        .map((candidate) => candidate.position)
+        .filter((position) => !skipped.has(position.toString()))
+        .slice(0, wanted);
+      if (positions.length === 0) break;
+
+      const result = await mineTour(planTour(bot.entity.position, positions), block, skipped);
+      mined += result.mined;
+      travelled += result.travelled;
+    }
 
-// Travel to coordinates
-app.post('/travel', async (req, res) => {
-  const { x, y, z } = req.body;
-  if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
-    return res.status(400).json({ error: 'x, y, and z must be numbers' });
+    const report = tourReport(blockName, started, { requested: count, mined, skipped: skipped.size, travelled });
+    bot.chat(`Mined ${mined}/${count} "${blockName}" in ${report.seconds}s (${report.blocksPerMinute} blocks/min).`);
+    if (mined < count) {
+      const err = new Error(`Mined only ${mined} of ${count} "${blockName}" within ${maxDistance} blocks`);
+      err.report = report;
+      throw err;
+    }
+    return report;
   }
 
-  try {
-    await travelToCoordinates(x, y, z);
-    res.json({ message: `Traveling to (${x}, ${y}, ${z})` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  // -------------------- Vein Mining -------------------- //
+
+  const MAX_VEIN_BLOCKS = 64;
+
+  /**
+   * The cluster of `blockId` blocks connected to `start`, breadth first and capped at `limit`.
+   * Neighbours are 26-connected: ore veins often touch only at an edge or a corner.
+   * @returns {Vec3[]} - Positions in the cluster, `start` first.
+   */
+  function floodFillVein(start, blockId, limit = MAX_VEIN_BLOCKS) {
+    const vein = [start];
+    const seen = new Set([start.toString()]);
+    for (let i = 0; i < vein.length && vein.length < limit; i++) {
+      for (let dx = -1; dx <= 1; dx++) {
+        for (let dy = -1; dy <= 1; dy++) {
+          for (let dz = -1; dz <= 1; dz++) {
+            const position = vein[i].offset(dx, dy, dz);
+            const key = position.toString();
+            if (seen.has(key) || vein.length >= limit) continue;
+            seen.add(key);
+            if (bot.blockAt(position)?.type === blockId) vein.push(position);
+          }
+        }
+      }
+    }
+    return vein;
   }
-});
 
-// Mine block at coordinates
-app.post('/mine', async (req, res) => {
-  const { x, y, z } = req.body;
-  if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
-    return res.status(400).json({ error: 'x, y, and z must be numbers' });
+  /**
+   * Mines the whole vein around the nearest (or, with rank 'path', cheapest to reach) block
+   * of a type: one block search, a flood fill from that block, and the cluster mined as one
+   * tour. Most of a vein is within reach of one or two standing spots, so it takes little
+   * walking. Unminable blocks are skipped.
+   * @returns {Promise<Object>} - Vein size, whether the cap cut it short, mined and skipped
+   *   counts, duration and blocks per minute.
+   */
+  async function mineVein(blockName, maxDistance = 64, rank = 'euclidean') {
+    const block = mcData.blocksByName[blockName];
+    if (!block) {
+      bot.chat(`Block "${blockName}" does not exist.`);
+      throw new Error(`Block "${blockName}" does not exist`);
+    }
+    const [first] = await findBlocks(block.id, { maxDistance, rank });
+    if (!first) {
+      bot.chat(`No ${rank === 'path' ? 'reachable ' : ''}"${blockName}" within ${maxDistance} blocks.`);
+      throw new Error(`"${blockName}" not found within ${maxDistance} blocks`);
+    }
+
+    const started = Date.now();
+    const vein = floodFillVein(first.position, block.id);
+    const skipped = new Set();
+    const { mined, travelled } = await mineTour(planTour(bot.entity.position, vein), block, skipped);
+    const report = tourReport(blockName, started, {
+      veinSize: vein.length,
+      capped: vein.length >= MAX_VEIN_BLOCKS,
+      mined,
+      skipped: skipped.size,
+      travelled,
+    });
+    bot.chat(`Mined ${mined}/${vein.length} "${blockName}" from the vein at (${first.position.x}, ${first.position.y}, ${first.position.z}) in ${report.seconds}s.`);
+    if (mined === 0) {
+      const err = new Error(`Could not mine any "${blockName}" from the vein at ${first.position}`);
+      err.report = report;
+      throw err;
+    }
+    return report;
   }
 
-  try {
-    await mineBlockAt(x, y, z);
-    res.json({ message: `Mined block at (${x}, ${y}, ${z})` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  /**
+   * Fights the nearest entity of a type until the fight ends (see combat.js).
+   * @returns {Promise<Object>} - The fight report; a fight that ends without a kill throws
+   *   with the report as `err.report`.
+   */
+  async function killEntity(entityType) {
+    const targetEntity = bot.nearestEntity(entity => (entity.mobType === entityType || entity.name === entityType));
+
+    if (!targetEntity) {
+      bot.chat(`No ${entityType} found nearby.`);
+      logger.info(`No ${entityType} found nearby.`);
+      throw new Error(`No ${entityType} found nearby`);
+    }
+
+    bot.chat(`Starting to attack the nearest ${entityType}.`);
+    logger.info(`Starting to attack the nearest ${entityType} at position (${targetEntity.position.x}, ${targetEntity.position.y}, ${targetEntity.position.z})`);
+
+    const report = await tracer.span('fight', { bot: name, target: entityType }, async (attrs) => {
+      const outcome = await combat.engage(targetEntity);
+      Object.assign(attrs, { outcome: outcome.outcome, attacks: outcome.attacks });
+      return outcome;
+    });
+    logger.info(`Fight with ${entityType} finished: ${JSON.stringify(report)}`);
+    if (report.outcome !== 'killed') {
+      bot.chat(`Failed to kill the ${entityType}: ${report.outcome}.`);
+      const err = new Error(`Fight with ${entityType} ended: ${report.outcome}`);
+      err.report = report;
+      throw err;
+    }
+    bot.chat(`Successfully killed the ${entityType} in ${report.seconds}s (${report.attacks} attacks).`);
+    return report;
   }
-});
 
-// Use block at coordinates
-app.post('/use', async (req, res) => {
-  const { x, y, z } = req.body;
-  if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
-    return res.status(400).json({ error: 'x, y, and z must be numbers' });
+  async function placeBlock(blockName, x, y, z) {
+      try {
+        // Check if the bot has the specified block in its inventory
+        const blockItem = bot.inventory.items().find(item => item.name === blockName);
+
+        if (!blockItem) {
+          bot.chat(`I don't have any ${blockName}.`);
+          logger.info(`Attempted to place ${blockName}, but it was not found in inventory.`);
+          throw new Error(`No "${blockName}" in inventory`);
+        }
+
+        // Check if there's a block in the target position and mine it if necessary
+        const targetPosition = new Vec3(x, y, z);
+        const targetBlock = bot.blockAt(targetPosition);
+        if (targetBlock && targetBlock.name !== 'air') {
+          bot.chat(`Clearing space by mining existing ${targetBlock.name} at (${x}, ${y}, ${z}).`);
+          logger.info(`Clearing space by mining existing ${targetBlock.name} at (${x}, ${y}, ${z}).`);
+          await reachBlock(targetPosition);
+          await bot.dig(bot.blockAt(targetPosition));
+        }
+
+        // Reference block to place against (the block at the specified position's y-1 level)
+        const referenceBlock = bot.blockAt(new Vec3(x, y - 1, z));
+
+        if (!referenceBlock) {
+          bot.chat(`No block to place ${blockName} against at (${x}, ${y - 1}, ${z}).`);
+          logger.info(`No block found at (${x}, ${y - 1}, ${z}) to place ${blockName} against.`);
+          throw new Error(`No block to place against at (${x}, ${y - 1}, ${z})`);
+        }
+
+        // Only walk if the spot can't be placed on from here
+        await reachPlacement(targetPosition, referenceBlock);
+
+        // Equip the block in hand
+        await bot.equip(blockItem, 'hand');
+
+        // Place the block against the reference block
+        await bot.placeBlock(referenceBlock, new Vec3(0, 1, 0)); // Adjust face vector as needed for placement direction
+        bot.chat(`Successfully placed ${blockName} at (${x}, ${y}, ${z}).`);
+        logger.info(`Placed ${blockName} at (${x}, ${y}, ${z}).`);
+      } catch (err) {
+        bot.chat(`Failed to place ${blockName}: ${err.message}`);
+        logger.error(`Failed to place ${blockName} at (${x}, ${y}, ${z}): ${err.message}`);
+        throw err;
+      }
+    }
+
+  // -------------------- State Versioning -------------------- //
+
+  // Every field and inventory slot remembers the version it last changed in, so /state_data can
+  // answer "what changed since version N" without keeping old snapshots around. Versions start
+  // from the boot time in ms, so they keep increasing across API restarts.
+  const stateTracker = {
+    version: Date.now(),
+    fields: {},       // field name -> { value, version }
+    slots: new Map(), // inventory slot -> { item: { name, count, slot } | null, version }
+    waiters: new Set(),
+  };
+  const MAX_STATE_WAIT_MS = 60000;
+  const CRAFTING_TABLE_RANGE = 32;
+  const CRAFTING_TABLE_BUCKET = 8; // blocks the bot moves (per axis) before the table is looked up again
+
+  function currentStateFields() {
+    return {
+      botName: bot.username,
+      position: {
+        x: Math.round(bot.entity.position.x), // Rounding the x position
+        y: Math.round(bot.entity.position.y), // Rounding the y position
+        z: Math.round(bot.entity.position.z)  // Rounding the z position
+      },
+      health: bot.health,
+      // So plans can use a table that is already there instead of crafting and placing one
+      craftingTable: nearbyCraftingTable(),
+      // Add more state data as needed
+    };
   }
 
-  try {
-    await useBlockAt(x, y, z);
-    res.json({ message: `Used block at (${x}, ${y}, ${z})` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  // refreshState runs on every move, so the lookup is kept until a crafting table is placed
+  // or broken, a chunk loads, or the bot moves to another position bucket
+  const craftingTableLookup = { bucket: null, position: null };
+
+  function forgetCraftingTable() {
+    craftingTableLookup.bucket = null;
   }
-});
 
-// Drop item by name
-app.post('/drop', async (req, res) => {
-  const { itemName } = req.body;
-  if (!itemName) {
-    return res.status(400).json({ error: 'itemName is required' });
+  bot.on('blockUpdate', (oldBlock, newBlock) => {
+    if (oldBlock?.name === 'crafting_table' || newBlock?.name === 'crafting_table') forgetCraftingTable();
+  });
+  bot.on('chunkColumnLoad', forgetCraftingTable);
+
+  // Nearest crafting table within CRAFTING_TABLE_RANGE, from the block index (null before it is built)
+  function nearbyCraftingTable() {
+    if (!blockIndex || !mcData) return null;
+    const { x, y, z } = bot.entity.position;
+    const bucket = [x, y, z].map((v) => Math.floor(v / CRAFTING_TABLE_BUCKET)).join(',');
+    if (craftingTableLookup.bucket !== bucket) {
+      const position = findNearestBlock(mcData.blocksByName.crafting_table.id, CRAFTING_TABLE_RANGE);
+      craftingTableLookup.position = position ? { x: position.x, y: position.y, z: position.z } : null;
+      craftingTableLookup.bucket = bucket;
+    }
+    return craftingTableLookup.position;
+  }
+
+  // Compares the live bot state with the tracked one and bumps the version if anything changed
+  function refreshState() {
+    if (!bot.entity) {
+      return stateTracker.version;
+    }
+    const next = stateTracker.version + 1;
+    let changed = false;
+
+    for (const [name, value] of Object.entries(currentStateFields())) {
+      const previous = stateTracker.fields[name];
+      if (!previous || JSON.stringify(previous.value) !== JSON.stringify(value)) {
+        stateTracker.fields[name] = { value, version: next };
+        changed = true;
+      }
+    }
+
+    const occupied = new Set();
+    for (const item of bot.inventory.items()) {
+      occupied.add(item.slot);
+      const previous = stateTracker.slots.get(item.slot)?.item;
+      if (!previous || previous.name !== item.name || previous.count !== item.count) {
+        stateTracker.slots.set(item.slot, { item: { name: item.name, count: item.count, slot: item.slot }, version: next });
+        changed = true;
+      }
+    }
+    for (const [slot, entry] of stateTracker.slots) {
+      if (entry.item && !occupied.has(slot)) {
+        stateTracker.slots.set(slot, { item: null, version: next });
+        changed = true;
+      }
+    }
+
+    if (changed) {
+      const previousVersion = stateTracker.version;
+      stateTracker.version = next;
+      if (eventSubscribers.size > 0) {
+        publishEvent('state', stateDelta(previousVersion));
+      }
+      for (const wake of stateTracker.waiters) {
+        wake();
+      }
+      stateTracker.waiters.clear();
+    }
+    return stateTracker.version;
   }
 
-  try {
-    await dropItemByName(itemName);
-    res.json({ message: `Dropped item: ${itemName}` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  function fullState() {
+    const state = { version: stateTracker.version };
+    for (const [name, field] of Object.entries(stateTracker.fields)) {
+      state[name] = field.value;
+    }
+    state.inventory = [...stateTracker.slots.values()]
+      .filter((entry) => entry.item)
+      .map((entry) => entry.item)
+      .sort((a, b) => a.slot - b.slot);
+    return state;
   }
-});
 
-// Place block at coordinates
-app.post('/place', async (req, res) => {
-  const { blockName, x, y, z } = req.body;
-  if (!blockName || typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
-    return res.status(400).json({ error: 'blockName, x, y, and z are required' });
+  // Fields and inventory slots changed after `since`; slots emptied since then come back with count 0
+  function stateDelta(since) {
+    const delta = { version: stateTracker.version, since };
+    for (const [name, field] of Object.entries(stateTracker.fields)) {
+      if (field.version > since) {
+        delta[name] = field.value;
+      }
+    }
+    delta.inventory = [];
+    for (const [slot, entry] of stateTracker.slots) {
+      if (entry.version > since) {
+        delta.inventory.push(entry.item || { name: null, count: 0, slot });
+      }
+    }
+    return delta;
   }
 
-  try {
-    await placeBlockAt(blockName, x, y, z);
-    res.json({ message: `Placed ${blockName} at (${x}, ${y}, ${z})` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  // Resolves with the current version once it changes, or after `timeoutMs`
+  function waitForStateChange(timeoutMs) {
+    return new Promise((resolve) => {
+      const wake = () => {
+        clearTimeout(timer);
+        stateTracker.waiters.delete(wake);
+        resolve(stateTracker.version);
+      };
+      const timer = setTimeout(wake, timeoutMs);
+      stateTracker.waiters.add(wake);
+    });
   }
-});
 
-// Craft item
-app.post('/craft', async (req, res) => {
-  const { itemName } = req.body;
-  if (!itemName) {
-    return res.status(400).json({ error: 'itemName is required' });
+  // Keep the version current between requests so long-polls wake up as soon as the bot changes
+  bot.on('move', refreshState);
+  bot.on('health', refreshState);
+
+  // -------------------- Event Stream -------------------- //
+
+  // Server-Sent Events pushed to every GET /events subscriber. A subscriber first gets a
+  // `snapshot` of the full state, then `state` deltas (same shape as /state_data?since=)
+  // and compact action events as they happen.
+  const eventSubscribers = new Set();
+  let eventId = 0;
+  const EVENT_HEARTBEAT_MS = 15000;
+
+  function writeEvent(res, type, data) {
+    res.write(`id: ${++eventId}\nevent: ${type}\ndata: ${JSON.stringify(data)}\n\n`);
+  }
+
+  function publishEvent(type, data) {
+    for (const res of eventSubscribers) {
+      writeEvent(res, type, data);
+    }
   }
 
-  try {
-    await craftItem(itemName);
-    res.json({ message: `Crafted item: ${itemName}` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  function blockPosition(block) {
+    return block?.position ? { x: block.position.x, y: block.position.y, z: block.position.z } : null;
   }
-});
 
-// -------------------- mineResource Endpoint -------------------- //
+  bot.on('goal_reached', (goal) => {
+    publishEvent('goal_reached', { x: goal?.x, y: goal?.y, z: goal?.z });
+  });
+  bot.on('path_update', (r) => {
+    publishEvent('path_update', { status: r.status, length: r.path?.length ?? 0 });
+  });
+  bot.on('diggingCompleted', (block) => {
+    publishEvent('dig', { status: 'completed', block: block?.name, position: blockPosition(block) });
+  });
+  bot.on('diggingAborted', (block) => {
+    publishEvent('dig', { status: 'aborted', block: block?.name, position: blockPosition(block) });
+  });
+  bot.on('entityGone', (entity) => {
+    publishEvent('entity_gone', { id: entity.id, name: entity.name });
+  });
+  bot.on('death', () => {
+    publishEvent('death', {});
+  });
+
+  // Every JSON reply carries the state version it reflects, so a client reading state from
+  // /events can wait until its mirror has caught up with the action it just ran
+  router.use((req, res, next) => {
+    const json = res.json.bind(res);
+    res.json = (body) => {
+      res.set('X-State-Version', String(refreshState()));
+      return json(body);
+    };
+    next();
+  });
+
+  // -------------------- Jobs -------------------- //
+
+  // Long-running actions sent with `"async": true` run as jobs: the request returns a job id
+  // at once, GET /jobs/:id reports progress and DELETE /jobs/:id cancels. The bot has one
+  // pathfinder, so only one job can run at a time.
+  const jobs = new Map();
+  let nextJobId = 1;
+  let activeJob = null;
+  const JOB_RETENTION_MS = 10 * 60 * 1000;
+  const MAX_JOB_WAIT_MS = 60000;
+
+  function jobSummary(job) {
+    const progress = { ...job.progress, elapsedMs: (job.finishedAt || Date.now()) - job.startedAt };
+    if (job === activeJob && job.target) {
+      progress.distanceRemaining = Number(bot.entity.position.distanceTo(job.target).toFixed(1));
+    }
+    return {
+      id: job.id,
+      type: job.type,
+      params: job.params,
+      status: job.status,
+      error: job.error,
+      result: job.result,
+      progress,
+    };
+  }
 
-// Express endpoint to mine a resource by block name
-app.post('/mine_resource', async (req, res) => {
-  const { blockName, maxDistance } = req.body;
-  if (!blockName) {
-    return res.status(400).json({ error: 'blockName is required' });
+  function startJob(type, params, action) {
+    const job = {
+      id: String(nextJobId++),
+      type,
+      params,
+      status: 'running',
+      error: null,
+      startedAt: Date.now(),
+      finishedAt: null,
+      result: undefined,
+      progress: { pathRemaining: null, blocksDug: 0 },
+      target: typeof params.x === 'number' ? new Vec3(params.x, params.y, params.z) : null,
+    };
+    jobs.set(job.id, job);
+    activeJob = job;
+    logger.info(`Job ${job.id} started: ${type} ${JSON.stringify(params)}`);
+
+    job.finished = action().then(
+      (result) => {
+        job.status = 'succeeded';
+        job.result = result;
+      },
+      (err) => {
+        job.status = job.status === 'cancelling' ? 'cancelled' : 'failed';
+        job.error = err.message;
+        if (job.status === 'failed') failures.inc({ bot: name, kind: `job_${type}` });
+        job.result = err.report;
+      }
+    ).then(() => {
+      job.finishedAt = Date.now();
+      if (activeJob === job) {
+        activeJob = null;
+      }
+      logger.info(`Job ${job.id} ${job.status}${job.error ? `: ${job.error}` : ''}`);
+      publishEvent('job', jobSummary(job));
+      setTimeout(() => jobs.delete(job.id), JOB_RETENTION_MS).unref();
+    });
+    return job;
   }
 
-  // Validate maxDistance if provided
-  let distance = 64; // Default maxDistance
-  if (maxDistance !== undefined) {
-    if (typeof maxDistance !== 'number' || maxDistance <= 0) {
-      return res.status(400).json({ error: 'maxDistance must be a positive number' });
+  // Clears the pathfinder goal (rejecting travelToCoordinates) and aborts any dig in progress
+  function cancelJob(job) {
+    if (job.status !== 'running') {
+      return;
+    }
+    job.status = 'cancelling';
+    if (job === activeJob) {
+      combat.stop();
+      bot.pathfinder.setGoal(null);
+      if (bot.targetDigBlock) {
+        bot.stopDigging();
+      }
     }
-    distance = maxDistance;
   }
 
-  try {
-    await mineResource(blockName.toLowerCase(), distance);
-    res.json({ message: `Attempted to mine "${blockName}" within ${distance} blocks` });
-  } catch (err) {
-    res.status(500).json({ error: err.message });
+  // Starts `action` as a job and answers 202 with its id, or 409 if another job is running
+  function respondWithJob(res, type, params, action) {
+    if (activeJob) {
+      return res.status(409).json({ error: `Job ${activeJob.id} (${activeJob.type}) is still running`, job: jobSummary(activeJob) });
+    }
+    const job = startJob(type, params, action);
+    res.status(202).set('Location', `/jobs/${job.id}`).json(jobSummary(job));
   }
-});
 
-// API endpoint to kill an entity by type
-app.post('/kill', async (req, res) => {
-    const { entityType } = req.body;
-    if (!entityType) {
-      return res.status(400).json({ error: 'entityType is required' });
+  bot.on('path_update', (r) => {
+    if (activeJob) {
+      activeJob.progress.pathRemaining = r.path?.length ?? 0;
+    }
+  });
+  bot.on('diggingCompleted', () => {
+    if (activeJob) {
+      activeJob.progress.blocksDug++;
+    }
+  });
+
+  // -------------------- Express API Endpoints -------------------- //
+
+  // Test endpoint
+  router.get('/', (req, res) => {
+    res.send('Minecraft Bot API is running');
+  });
+
+  // Health/Status endpoints for monitoring
+  router.get('/status', (req, res) => {
+    try {
+      const ready = Boolean(bot && bot.username && mcData);
+      res.json({ status: ready ? 'ready' : 'not_ready', bot: bot?.username || null });
+    } catch (e) {
+      res.json({ status: 'not_ready' });
+    }
+  });
+
+  router.get('/health', (req, res) => {
+    try {
+      const ready = Boolean(bot && bot.username && mcData);
+      res.json({ status: ready ? 'ready' : 'not_ready', bot: bot?.username || null });
+    } catch (e) {
+      res.json({ status: 'not_ready' });
+    }
+  });
+
+  // Everything below needs the bot in the world
+  router.use((req, res, next) => {
+    if (!bot.entity || !mcData) {
+      return res.status(503).json({ error: `Bot "${name}" has not spawned yet` });
+    }
+    next();
+  });
+
+  // New endpoint to get state data
+  // Plain GET returns the full state. `?since=<version>` returns only what changed after that
+  // version, and `?wait=<seconds>` long-polls until something does. The ETag carries the
+  // version, so `If-None-Match` (or a `since` that is already current) gets a 304.
+  router.get('/state_data', async (req, res) => {
+    let version = refreshState();
+    const since = req.query.since !== undefined ? Number(req.query.since) : null;
+    const match = /"state-(\d+)"/.exec(req.get('If-None-Match') || '');
+    const known = Number.isFinite(since) ? since : match ? Number(match[1]) : null;
+    const waitMs = Math.min(Number(req.query.wait) * 1000 || 0, MAX_STATE_WAIT_MS);
+
+    if (known === version && waitMs > 0) {
+      version = await waitForStateChange(waitMs);
+    }
+    res.set('ETag', `"state-${version}"`);
+    if (known === version) {
+      return res.status(304).end();
+    }
+    // A `since` from before a restart is still older than every current version
+    if (Number.isFinite(since) && since < version) {
+      return res.json(stateDelta(since));
+    }
+    res.json(fullState());
+  });
+
+  // Push channel for state changes and action progress (Server-Sent Events)
+  router.get('/events', (req, res) => {
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+    });
+    refreshState();
+    writeEvent(res, 'snapshot', fullState());
+    eventSubscribers.add(res);
+    logger.info(`Event subscriber connected (${eventSubscribers.size} total)`);
+
+    // Comment lines keep proxies and idle timeouts from closing a quiet stream
+    const heartbeat = setInterval(() => res.write(': ping\n\n'), EVENT_HEARTBEAT_MS);
+    res.on('close', () => {
+      clearInterval(heartbeat);
+      eventSubscribers.delete(res);
+      logger.info(`Event subscriber disconnected (${eventSubscribers.size} total)`);
+    });
+  });
+
+  // Travel to coordinates
+  router.post('/travel', async (req, res) => {
+    const { x, y, z } = req.body;
+    if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
+      return res.status(400).json({ error: 'x, y, and z must be numbers' });
+    }
+
+    if (req.body.async) {
+      return respondWithJob(res, 'travel', { x, y, z }, () => travelToCoordinates(x, y, z));
+    }
+
+    try {
+      await travelToCoordinates(x, y, z);
+      res.json({ message: `Traveling to (${x}, ${y}, ${z})` });
+    } catch (err) {
+      res.status(500).json({ error: err.message });
+    }
+  });
+
+  // Mine block at coordinates
+  router.post('/mine', async (req, res) => {
+    const { x, y, z } = req.body;
+    if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
+      return res.status(400).json({ error: 'x, y, and z must be numbers' });
+    }
+
+    if (req.body.async) {
+      return respondWithJob(res, 'mine', { x, y, z }, () => mineBlockAt(x, y, z));
+    }
+
+    try {
+      await mineBlockAt(x, y, z);
+      res.json({ message: `Mined block at (${x}, ${y}, ${z})` });
+    } catch (err) {
+      res.status(500).json({ error: err.message });
+    }
+  });
+
+  // Use block at coordinates
+  router.post('/use', async (req, res) => {
+    const { x, y, z } = req.body;
+    if (typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
+      return res.status(400).json({ error: 'x, y, and z must be numbers' });
+    }
+
+    try {
+      await useBlockAt(x, y, z);
+      res.json({ message: `Used block at (${x}, ${y}, ${z})` });
+    } catch (err) {
+      res.status(500).json({ error: err.message });
+    }
+  });
+
+  // Drop item by name
+  router.post('/drop', async (req, res) => {
+    const { itemName } = req.body;
+    if (!itemName) {
+      return res.status(400).json({ error: 'itemName is required' });
     }
-  
+
     try {
-      await killEntity(entityType.toLowerCase());
-      res.json({ message: `Attempted to kill the nearest "${entityType}"` });
+      await dropItemByName(itemName);
+      res.json({ message: `Dropped item: ${itemName}` });
     } catch (err) {
       res.status(500).json({ error: err.message });
     }
   });
 
-  app.post('/place_block', async (req, res) => {
+  // Place block at coordinates
+  router.post('/place', async (req, res) => {
     const { blockName, x, y, z } = req.body;
     if (!blockName || typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
       return res.status(400).json({ error: 'blockName, x, y, and z are required' });
     }
-  
+
+    try {
+      await placeBlockAt(blockName, x, y, z);
+      res.json({ message: `Placed ${blockName} at (${x}, ${y}, ${z})` });
+    } catch (err) {
+      res.status(500).json({ error: err.message });
+    }
+  });
+
+  // Craft item
+  // Body: {itemName, count} for one item or {items: [{itemName, count}, ...]} for several,
+  // crafted in order in one visit to the crafting table
+  router.post('/craft', async (req, res) => {
+    const { itemName, count = 1, items } = req.body;
+    const targets = items ?? (itemName ? [{ itemName, count }] : null);
+    if (!Array.isArray(targets) || targets.length === 0) {
+      return res.status(400).json({ error: 'itemName or a non-empty items array is required' });
+    }
+    for (const target of targets) {
+      if (typeof target?.itemName !== 'string' || !target.itemName) {
+        return res.status(400).json({ error: 'every item needs an itemName' });
+      }
+      if (target.count !== undefined && (!Number.isInteger(target.count) || target.count < 1)) {
+        return res.status(400).json({ error: 'count must be a positive integer' });
+      }
+    }
+
+    try {
+      const report = await craftItems(targets.map((t) => ({ itemName: t.itemName.toLowerCase(), count: t.count ?? 1 })));
+      res.json({ message: `Crafted ${report.crafted.map((c) => `${c.count} ${c.itemName}`).join(', ')}`, ...report });
+    } catch (err) {
+      res.status(500).json({ error: err.message, ...err.report });
+    }
+  });
+
+  // -------------------- mineResource Endpoint -------------------- //
+
+  const BLOCK_RANKS = ['euclidean', 'path'];
+  const MINE_MODES = ['blocks', 'vein'];
+
+  // Express endpoint to mine a resource by block name
+  router.post('/mine_resource', async (req, res) => {
+    const { blockName, maxDistance, rank = 'euclidean', count = 1, mode = 'blocks' } = req.body;
+    if (!blockName) {
+      return res.status(400).json({ error: 'blockName is required' });
+    }
+    if (!BLOCK_RANKS.includes(rank)) {
+      return res.status(400).json({ error: `rank must be one of ${BLOCK_RANKS.join(', ')}` });
+    }
+    if (!MINE_MODES.includes(mode)) {
+      return res.status(400).json({ error: `mode must be one of ${MINE_MODES.join(', ')}` });
+    }
+    if (!Number.isInteger(count) || count < 1 || count > MAX_TOUR_BLOCKS) {
+      return res.status(400).json({ error: `count must be an integer from 1 to ${MAX_TOUR_BLOCKS}` });
+    }
+
+    // Validate maxDistance if provided
+    let distance = 64; // Default maxDistance
+    if (maxDistance !== undefined) {
+      if (typeof maxDistance !== 'number' || maxDistance <= 0) {
+        return res.status(400).json({ error: 'maxDistance must be a positive number' });
+      }
+      distance = maxDistance;
+    }
+
+    if (req.body.async) {
+      return respondWithJob(res, 'mine_resource', { blockName, maxDistance: distance, rank, count, mode },
+        () => mineResource(blockName.toLowerCase(), distance, rank, count, mode));
+    }
+
+    try {
+      const report = await mineResource(blockName.toLowerCase(), distance, rank, count, mode);
+      res.json({ message: `Attempted to mine "${blockName}" within ${distance} blocks`, ...report });
+    } catch (err) {
+      res.status(500).json({ error: err.message, ...err.report });
+    }
+  });
+
+  // API endpoint to kill an entity by type
+  router.post('/kill', async (req, res) => {
+      const { entityType } = req.body;
+      if (!entityType) {
+        return res.status(400).json({ error: 'entityType is required' });
+      }
+
+      if (req.body.async) {
+        return respondWithJob(res, 'kill', { entityType }, () => killEntity(entityType.toLowerCase()));
+      }
+
+      try {
+        const report = await killEntity(entityType.toLowerCase());
+        res.json({ message: `Killed the nearest "${entityType}"`, ...report });
+      } catch (err) {
+        res.status(500).json({ error: err.message, ...err.report });
+      }
+    });
+
+  // Fights, kills, attacks and hits so far, and the entity being fought now
+  router.get('/combat', (req, res) => {
+    res.json(combat.stats());
+  });
+
+    router.post('/place_block', async (req, res) => {
+      const { blockName, x, y, z } = req.body;
+      if (!blockName || typeof x !== 'number' || typeof y !== 'number' || typeof z !== 'number') {
+        return res.status(400).json({ error: 'blockName, x, y, and z are required' });
+      }
+
+      if (req.body.async) {
+        return respondWithJob(res, 'place_block', { blockName, x, y, z },
+          () => placeBlock(blockName.toLowerCase(), x, y, z));
+      }
+
+      try {
+        await placeBlock(blockName.toLowerCase(), x, y, z);
+        res.json({ message: `Attempted to place "${blockName}" at (${x}, ${y}, ${z})` });
+      } catch (err) {
+        res.status(500).json({ error: err.message });
+      }
+    });
+
+  // Nearest block of a type, without the chat messages getBlockCoordinates sends; lets
+  // clients (e.g. the fleet scheduler) estimate how far each bot is from a task's target
+  router.get('/find_block', (req, res) => {
+    const { blockName } = req.query;
+    const maxDistance = Number(req.query.maxDistance) || 64;
+    const blockId = mcData.blocksByName[blockName]?.id;
+    if (blockId === undefined) {
+      return res.status(400).json({ error: `Block "${blockName}" does not exist` });
+    }
+
+    const position = findNearestBlock(blockId, maxDistance);
+    if (!position) {
+      return res.status(404).json({ error: `"${blockName}" not found within ${maxDistance} blocks` });
+    }
+    const { x, y, z } = position;
+    res.json({ blockName, position: { x, y, z }, distance: Number(bot.entity.position.distanceTo(position).toFixed(1)) });
+  });
+
+  // The `count` best blocks of a type with an estimated travel cost, so planners can pick
+  // one that is actually reachable instead of the nearest one behind a wall
+  router.post('/find_blocks', async (req, res) => {
+    const { blockName, count = 5, maxDistance = 64, rank = 'euclidean' } = req.body;
+    const blockId = mcData.blocksByName[String(blockName).toLowerCase()]?.id;
+    if (blockId === undefined) {
+      return res.status(400).json({ error: `Block "${blockName}" does not exist` });
+    }
+    if (!Number.isInteger(count) || count < 1 || count > 64) {
+      return res.status(400).json({ error: 'count must be an integer from 1 to 64' });
+    }
+    if (typeof maxDistance !== 'number' || maxDistance <= 0) {
+      return res.status(400).json({ error: 'maxDistance must be a positive number' });
+    }
+    if (!BLOCK_RANKS.includes(rank)) {
+      return res.status(400).json({ error: `rank must be one of ${BLOCK_RANKS.join(', ')}` });
+    }
+
     try {
-      await placeBlock(blockName.toLowerCase(), x, y, z);
-      res.json({ message: `Attempted to place "${blockName}" at (${x}, ${y}, ${z})` });
+      const candidates = (await findBlocks(blockId, { count, maxDistance, rank })).map(({ position, ...rest }) => ({
+        position: { x: position.x, y: position.y, z: position.z },
+        ...rest,
+      }));
+      res.json({ blockName, rank, candidates });
     } catch (err) {
       res.status(500).json({ error: err.message });
     }
   });
 
-// -------------------- End of Express API Endpoints -------------------- //
+  // Path cache size, hit/miss counters and the pathfinding time it saved
+  router.get('/path_cache', (req, res) => {
+    res.json(pathCache.stats());
+  });
+
+  // Blocks mined, time spent digging, walking and idle between digs (waiting for paths,
+  // requests), and how many next-dig paths were computed during a dig
+  router.get('/mining_stats', (req, res) => {
+    res.json(miningReport());
+  });
+
+  // Block index size and query latency. `?benchmark=<blockName>` times the same nearest-block
+  // lookup through the index and through bot.findBlock's sphere scan for comparison.
+  router.get('/block_index', (req, res) => {
+    const { benchmark } = req.query;
+    let comparison;
+    if (benchmark) {
+      const blockId = mcData.blocksByName[benchmark]?.id;
+      if (blockId === undefined) {
+        return res.status(400).json({ error: `Block "${benchmark}" does not exist` });
+      }
+      const maxDistance = Number(req.query.maxDistance) || 64;
+      const timed = (lookup) => {
+        const started = process.hrtime.bigint();
+        const position = lookup();
+        return { ms: Number(process.hrtime.bigint() - started) / 1e6, position: position || null };
+      };
+      const scan = timed(() => bot.findBlock({ matching: blockId, maxDistance })?.position);
+      const indexed = timed(() => blockIndex.nearest(blockId, bot.entity.position, { maxDistance })[0]);
+      comparison = {
+        blockName: benchmark,
+        findBlockMs: Number(scan.ms.toFixed(3)),
+        indexMs: Number(indexed.ms.toFixed(3)),
+        speedup: indexed.ms > 0 ? Number((scan.ms / indexed.ms).toFixed(1)) : null,
+        // Ties may resolve to different blocks; both must be equally near
+        sameDistance: scan.position && indexed.position
+          ? scan.position.distanceTo(bot.entity.position) === indexed.position.distanceTo(bot.entity.position)
+          : scan.position === indexed.position,
+      };
+    }
+    res.json({ ...blockIndex.stats(), benchmark: comparison });
+  });
+
+  // -------------------- Job Endpoints -------------------- //
+
+  router.get('/jobs', (req, res) => {
+    res.json([...jobs.values()].map(jobSummary));
+  });
+
+  // `?wait=<seconds>` holds the request until the job finishes (or the wait runs out)
+  router.get('/jobs/:id', async (req, res) => {
+    const job = jobs.get(req.params.id);
+    if (!job) {
+      return res.status(404).json({ error: `No job ${req.params.id}` });
+    }
+    const waitMs = Math.min(Number(req.query.wait) * 1000 || 0, MAX_JOB_WAIT_MS);
+    if (waitMs > 0 && !job.finishedAt) {
+      let timer;
+      await Promise.race([job.finished, new Promise((resolve) => { timer = setTimeout(resolve, waitMs); })]);
+      clearTimeout(timer);
+    }
+    res.json(jobSummary(job));
+  });
+
+  router.delete('/jobs/:id', (req, res) => {
+    const job = jobs.get(req.params.id);
+    if (!job) {
+      return res.status(404).json({ error: `No job ${req.params.id}` });
+    }
+    cancelJob(job);
+    res.status(job.finishedAt ? 200 : 202).json(jobSummary(job));
+  });
 
+  // -------------------- Batch Endpoint -------------------- //
+
+  // Compiled instruction method (as emitted by the LLM compiler) -> action
+  const instructionHandlers = {
+    travel_to: (p) => travelToCoordinates(p.x, p.y, p.z),
+    mine_block: (p, next) => mineBlockAt(p.x, p.y, p.z, next?.method === 'mine_block' && next.parameters ? new Vec3(next.parameters.x, next.parameters.y, next.parameters.z) : null),
+    craft_item: (p) => craftItem(p.item_name, p.count ?? 1),
+    use_block: (p) => useBlockAt(p.x, p.y, p.z),
+    drop_item: (p) => dropItemByName(p.item_name),
+    place_block: (p) => placeBlock(p.block_name.toLowerCase(), p.x, p.y, p.z),
+    place_block_at: (p) => placeBlockAt(p.block_name, p.x, p.y, p.z),
+    mine_resource: (p) => mineResource(p.block_name.toLowerCase(), p.max_distance ?? 64, p.rank ?? 'euclidean', Math.min(p.count ?? 1, MAX_TOUR_BLOCKS), p.mode ?? 'blocks'),
+    kill_entity: (p) => killEntity(p.entity_type.toLowerCase()),
+  };
 
-// -------------------- Chat Listener -------------------- //
+  const EMPTY_BLOCKS = new Set(['air', 'cave_air', 'void_air']);
+
+  // Compiled instruction method -> a check of what the step must have changed in the world.
+  // Called with the parameters before the handler runs, it returns a function that gets the
+  // handler's result and returns why the step failed, or null, so a handler that resolves
+  // without doing its job still fails its batch step.
+  const instructionOutcomes = {
+    mine_block: (p) => {
+      const position = new Vec3(p.x, p.y, p.z);
+      const before = bot.blockAt(position)?.type;
+      return () => (bot.blockAt(position)?.type === before ? `Block at (${p.x}, ${p.y}, ${p.z}) is still there` : null);
+    },
+    drop_item: (p) => {
+      const carried = inventoryCounts()[p.item_name] || 0;
+      return () => ((inventoryCounts()[p.item_name] || 0) >= carried ? `"${p.item_name}" was not dropped` : null);
+    },
+    place_block: (p) => placedAt(p),
+    place_block_at: (p) => placedAt(p),
+    craft_item: (p) => (result) => {
+      const gained = result?.inventoryDelta?.[p.item_name] ?? 0;
+      return gained < (p.count ?? 1) ? `Crafted ${gained} of ${p.count ?? 1} "${p.item_name}"` : null;
+    },
+    mine_resource: () => (result) => (result && result.mined < (result.requested ?? 1) ? `Mined only ${result.mined} of ${result.requested} "${result.blockName}"` : null),
+    kill_entity: () => (result) => (result?.outcome !== 'killed' ? `Fight ended: ${result?.outcome ?? 'no report'}` : null),
+  };
 
-bot.on('chat', async (username, message) => {
-  // Ignore messages from the bot itself
-  if (username === bot.username) return;
+  function placedAt(p) {
+    return () => (EMPTY_BLOCKS.has(bot.blockAt(new Vec3(p.x, p.y, p.z))?.name ?? 'air') ? `Nothing was placed at (${p.x}, ${p.y}, ${p.z})` : null);
+  }
 
-  // Check if the user is authorized to send commands
-  if (!authorizedUsers.includes(username)) {
-    logger.warn(`Unauthorized user "${username}" attempted to send a command.`);
-    return;
+  /**
+   * Runs a single compiled instruction and checks its outcome (see instructionOutcomes).
+   * @param {{method: string, parameters: object}} instruction
+   * @param {{method: string, parameters: object}} [next] - The instruction after it, which
+   *   mine_block looks ahead to so it can path to the next dig while this one runs.
+   * @throws {Error} - When the handler fails or its outcome check does.
+   */
+  async function executeInstruction(instruction, next) {
+    const handler = instructionHandlers[instruction?.method];
+    if (!handler) {
+      throw new Error(`Unknown method: ${instruction?.method}`);
+    }
+    const parameters = instruction.parameters || {};
+    const outcome = instructionOutcomes[instruction.method];
+    const check = outcome ? outcome(parameters) : null;
+    const result = await handler(parameters, next);
+    const failure = check ? check(result) : null;
+    if (failure) {
+      const err = new Error(failure);
+      err.report = result;
+      throw err;
+    }
+    return result;
   }
 
-  // Parse commands starting with '!'
-  if (message.startsWith('!')) {
-    const args = message.slice(1).trim().split(' ');
-    const command = args.shift().toLowerCase();
+  // Runs a whole instruction list in order and streams one NDJSON line per step,
+  // followed by a summary line, so a compiled task costs a single request.
+  router.post('/batch', async (req, res) => {
+    const { instructions, stopOnError = true } = req.body;
+    if (!Array.isArray(instructions)) {
+      return res.status(400).json({ error: 'instructions must be an array' });
+    }
+
+    let clientGone = false;
+    res.on('close', () => { clientGone = true; });
+
+    res.status(200);
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.flushHeaders();
+
+    let completed = 0;
+    let failed = 0;
+    let halted = false;
+    for (let index = 0; index < instructions.length; index++) {
+      const method = instructions[index]?.method;
+      if (halted || clientGone) {
+        res.write(JSON.stringify({ index, method, status: 'skipped' }) + '\n');
+        continue;
+      }
 
-    switch (command) {
-      case 'craft':
-        const itemName = args.join('_').toLowerCase();
-        if (itemName) {
-          try {
-            await craftItem(itemName);
-            bot.chat(`Crafting "${itemName}"...`);
-          } catch (err) {
-            bot.chat(`Failed to craft "${itemName}": ${err.message}`);
-          }
-        } else {
-          bot.chat('Please specify an item to craft. Usage: !craft <item_name>');
-        }
-        break;
+      const startedAt = Date.now();
+      let step;
+      try {
+        const result = await tracer.span('step', { bot: name, index, method },
+          () => executeInstruction(instructions[index], instructions[index + 1]));
+        completed++;
+        step = { index, method, status: 'ok', elapsedMs: Date.now() - startedAt };
+        if (result !== undefined) step.result = result; // crafting's inventory delta, a tour's report
+      } catch (err) {
+        failed++;
+        logger.error(`Batch step ${index} (${method}) failed: ${err.message}`);
+        step = { index, method, status: 'error', error: err.message, elapsedMs: Date.now() - startedAt };
+        halted = stopOnError;
+        failures.inc({ bot: name, kind: `batch_${method}` });
+      }
+      res.write(JSON.stringify(step) + '\n');
+      publishEvent('step', step);
+    }
+
+    const stateVersion = refreshState();
+    res.end(JSON.stringify({ done: true, total: instructions.length, completed, failed, stateVersion }) + '\n');
+  });
+
+  // -------------------- End of Express API Endpoints -------------------- //
+
+
+  // -------------------- Chat Listener -------------------- //
+
+  bot.on('chat', async (username, message) => {
+    // Ignore messages from the bot itself
+    if (username === bot.username) return;
+
+    // Check if the user is authorized to send commands
+    if (!authorizedUsers.includes(username)) {
+      logger.warn(`Unauthorized user "${username}" attempted to send a command.`);
+      return;
+    }
+
+    // Parse commands starting with '!'
+    if (message.startsWith('!')) {
+      const args = message.slice(1).trim().split(' ');
+      let command = args.shift().toLowerCase();
+
+      // "!<bot name> <command>" goes to that bot; a bare "!<command>" to the default bot only
+      const addressed = [...fleet.keys()].find((botName) => botName.toLowerCase() === command);
+      if (addressed) {
+        if (addressed !== name) return;
+        command = (args.shift() || '').toLowerCase();
+      } else if (name !== defaultBotName()) {
+        return;
+      }
 
-      case 'travel':
-        if (args.length === 3) {
-          const [x, y, z] = args.map(coord => parseInt(coord, 10));
-          if (!isNaN(x) && !isNaN(y) && !isNaN(z)) {
+      switch (command) {
+        case 'craft':
+          const craftCount = /^\d+$/.test(args[args.length - 1] || '') ? parseInt(args.pop(), 10) : 1;
+          const itemName = args.join('_').toLowerCase();
+          if (itemName) {
             try {
-              await travelToCoordinates(x, y, z);
-              bot.chat(`Traveling to (${x}, ${y}, ${z})`);
-              logger.info(`Traveling to (${x}, ${y}, ${z})`);
+              await craftItem(itemName, craftCount);
             } catch (err) {
-              bot.chat(`Failed to travel to (${x}, ${y}, ${z}): ${err.message}`);
-              logger.error(`Failed to travel to (${x}, ${y}, ${z}): ${err.message}`);
+              // craftItems reports failures in chat itself
             }
           } else {
-            bot.chat('Invalid coordinates. Usage: !travel <x> <y> <z>');
+            bot.chat('Please specify an item to craft. Usage: !craft <item_name> [count]');
           }
-        } else {
-          bot.chat('Please provide x, y, and z coordinates. Usage: !travel <x> <y> <z>');
-        }
-        break;
+          break;
+
+        case 'travel':
+          if (args.length === 3) {
+            const [x, y, z] = args.map(coord => parseInt(coord, 10));
+            if (!isNaN(x) && !isNaN(y) && !isNaN(z)) {
+              try {
+                await travelToCoordinates(x, y, z);
+                bot.chat(`Traveling to (${x}, ${y}, ${z})`);
+                logger.info(`Traveling to (${x}, ${y}, ${z})`);
+              } catch (err) {
+                bot.chat(`Failed to travel to (${x}, ${y}, ${z}): ${err.message}`);
+                logger.error(`Failed to travel to (${x}, ${y}, ${z}): ${err.message}`);
+              }
+            } else {
+              bot.chat('Invalid coordinates. Usage: !travel <x> <y> <z>');
+            }
+          } else {
+            bot.chat('Please provide x, y, and z coordinates. Usage: !travel <x> <y> <z>');
+          }
+          break;
+
+        case 'mine':
+          if (args.length === 3) {
+            const [mx, my, mz] = args.map(coord => parseInt(coord, 10));
+            if (!isNaN(mx) && !isNaN(my) && !isNaN(mz)) {
+              try {
+                await mineBlockAt(mx, my, mz);
+                bot.chat(`Successfully mined block at (${mx}, ${my}, ${mz})`);
+                logger.info(`Successfully mined block at (${mx}, ${my}, ${mz})`);
+              } catch (err) {
+                bot.chat(`Failed to mine block at (${mx}, ${my}, ${mz}): ${err.message}`);
+                logger.error(`Failed to mine block at (${mx}, ${my}, ${mz}): ${err.message}`);
+              }
+            } else {
+              bot.chat('Invalid coordinates. Usage: !mine <x> <y> <z>');
+            }
+          } else {
+            bot.chat('Please provide x, y, and z coordinates. Usage: !mine <x> <y> <z>');
+          }
+          break;
 
-      case 'mine':
-        if (args.length === 3) {
-          const [mx, my, mz] = args.map(coord => parseInt(coord, 10));
-          if (!isNaN(mx) && !isNaN(my) && !isNaN(mz)) {
+        case 'drop':
+          if (args.length === 1) {
+            const dropItemName = args[0].toLowerCase();
             try {
-              await mineBlockAt(mx, my, mz);
-              bot.chat(`Successfully mined block at (${mx}, ${my}, ${mz})`);
-              logger.info(`Successfully mined block at (${mx}, ${my}, ${mz})`);
+              await dropItemByName(dropItemName);
+              bot.chat(`Dropped item: ${dropItemName}`);
+              logger.info(`Dropped item: ${dropItemName}`);
             } catch (err) {
-              bot.chat(`Failed to mine block at (${mx}, ${my}, ${mz}): ${err.message}`);
-              logger.error(`Failed to mine block at (${mx}, ${my}, ${mz}): ${err.message}`);
+              bot.chat(`Failed to drop item "${dropItemName}": ${err.message}`);
+              logger.error(`Failed to drop item "${dropItemName}": ${err.message}`);
             }
           } else {
-            bot.chat('Invalid coordinates. Usage: !mine <x> <y> <z>');
-          }
-        } else {
-          bot.chat('Please provide x, y, and z coordinates. Usage: !mine <x> <y> <z>');
-        }
-        break;
-
-      case 'drop':
-        if (args.length === 1) {
-          const dropItemName = args[0].toLowerCase();
-          try {
-            await dropItemByName(dropItemName);
-            bot.chat(`Dropped item: ${dropItemName}`);
-            logger.info(`Dropped item: ${dropItemName}`);
-          } catch (err) {
-            bot.chat(`Failed to drop item "${dropItemName}": ${err.message}`);
-            logger.error(`Failed to drop item "${dropItemName}": ${err.message}`);
+            bot.chat('Please specify an item to drop. Usage: !drop <item_name>');
           }
-        } else {
-          bot.chat('Please specify an item to drop. Usage: !drop <item_name>');
-        }
-        break;
-
-        case 'place':
-            if (args.length === 4) {
-              const blockName = args[0].toLowerCase();
-              const x = parseInt(args[1]);
-              const y = parseInt(args[2]);
-              const z = parseInt(args[3]);
-      
-              if (isNaN(x) || isNaN(y) || isNaN(z)) {
-                bot.chat('Usage: place <block_name> <x> <y> <z>');
+          break;
+
+          case 'place':
+              if (args.length === 4) {
+                const blockName = args[0].toLowerCase();
+                const x = parseInt(args[1]);
+                const y = parseInt(args[2]);
+                const z = parseInt(args[3]);
+
+                if (isNaN(x) || isNaN(y) || isNaN(z)) {
+                  bot.chat('Usage: place <block_name> <x> <y> <z>');
+                } else {
+                  // placeBlock reports failures in chat itself
+                  await placeBlock(blockName, x, y, z).catch(() => {});
+                }
               } else {
-                await placeBlock(blockName, x, y, z);
+                bot.chat('Usage: place <block_name> <x> <y> <z>');
               }
+              break;
+
+        case 'come_to_me':
+          // Implement the followUser function
+          await followUser(username);
+          break;
+
+        case 'get_block_coords':
+          if (args.length === 1) {
+            const blockName = args[0].toLowerCase();
+            const blockPosition = getBlockCoordinates(blockName);
+
+            if (blockPosition) {
+              const { x, y, z } = blockPosition;
+              bot.chat(`Nearest "${blockName}" is at (X: ${x}, Y: ${y}, Z: ${z}).`);
+              logger.info(`Nearest "${blockName}" is at (X: ${x}, Y: ${y}, Z: ${z}).`);
             } else {
-              bot.chat('Usage: place <block_name> <x> <y> <z>');
+              bot.chat(`"${blockName}" not found within 64 blocks.`);
+              logger.info(`"${blockName}" not found within 64 blocks.`);
             }
-            break;
-
-      case 'come_to_me':
-        // Implement the followUser function
-        await followUser(username);
-        break;
-
-      case 'get_block_coords':
-        if (args.length === 1) {
-          const blockName = args[0].toLowerCase();
-          const blockPosition = getBlockCoordinates(blockName);
-
-          if (blockPosition) {
-            const { x, y, z } = blockPosition;
-            bot.chat(`Nearest "${blockName}" is at (X: ${x}, Y: ${y}, Z: ${z}).`);
-            logger.info(`Nearest "${blockName}" is at (X: ${x}, Y: ${y}, Z: ${z}).`);
           } else {
-            bot.chat(`"${blockName}" not found within 64 blocks.`);
-            logger.info(`"${blockName}" not found within 64 blocks.`);
+            bot.chat('Usage: !get_block_coords <block_name>');
           }
-        } else {
-          bot.chat('Usage: !get_block_coords <block_name>');
-        }
-        break;
-
-      case 'mine_resource':
-        if (args.length >= 1) {
-          const resourceName = args[0].toLowerCase();
-          let maxDistance = 64; // Default maxDistance
-          if (args.length >= 2) {
-            const distance = parseInt(args[1], 10);
-            if (!isNaN(distance) && distance > 0) {
-              maxDistance = distance;
-            } else {
-              bot.chat('Invalid maxDistance. Using default of 64 blocks.');
+          break;
+
+        case 'mine_resource':
+          if (args.length >= 1) {
+            const resourceName = args[0].toLowerCase();
+            let maxDistance = 64; // Default maxDistance
+            if (args.length >= 2) {
+              const distance = parseInt(args[1], 10);
+              if (!isNaN(distance) && distance > 0) {
+                maxDistance = distance;
+              } else {
+                bot.chat('Invalid maxDistance. Using default of 64 blocks.');
+              }
+            }
+            let count = 1;
+            if (args.length >= 3) {
+              const requested = parseInt(args[2], 10);
+              if (!isNaN(requested) && requested > 0) {
+                count = Math.min(requested, MAX_TOUR_BLOCKS);
+              } else {
+                bot.chat('Invalid count. Mining one block.');
+              }
             }
+            // mineResource reports failures in chat itself
+            await mineResource(resourceName, maxDistance, 'euclidean', count).catch(() => {});
+          } else {
+            bot.chat('Usage: !mine_resource <block_name> [maxDistance] [count]');
           }
-          await mineResource(resourceName, maxDistance);
-        } else {
-          bot.chat('Usage: !mine_resource <block_name> [maxDistance]');
-        }
-        break;
+          break;
 
-        case 'kill':
-            if (args.length === 1) {
-              const entityType = args[0].toLowerCase();
-              await killEntity(entityType);
-            } else {
-              bot.chat(args.length);
-              bot.chat('Usage: !kill <entity_type>');
-            }
-            break;
+        case 'mine_vein':
+          if (args.length >= 1) {
+            const maxDistance = parseInt(args[1], 10);
+            // mineVein reports failures in chat itself
+            await mineVein(args[0].toLowerCase(), maxDistance > 0 ? maxDistance : 64).catch(() => {});
+          } else {
+            bot.chat('Usage: !mine_vein <block_name> [maxDistance]');
+          }
+          break;
+
+          case 'kill':
+              if (args.length === 1) {
+                const entityType = args[0].toLowerCase();
+                // killEntity reports the outcome in chat itself
+                await killEntity(entityType).catch(() => {});
+              } else {
+                bot.chat(args.length);
+                bot.chat('Usage: !kill <entity_type>');
+              }
+              break;
 
-      case 'help':
-        bot.chat('Available commands:\n!craft <item_name>\n!travel <x> <y> <z>\n!mine <x> <y> <z>\n!drop <item_name>\n!place <block_name> <x> <y> <z>\n!come_to_me\n!get_block_coords <block_name>\n!mine_resource <block_name> [maxDistance]\n!stop_mine');
-        break;
+        case 'help':
+          bot.chat('Available commands:\n!craft <item_name> [count]\n!travel <x> <y> <z>\n!mine <x> <y> <z>\n!drop <item_name>\n!place <block_name> <x> <y> <z>\n!come_to_me\n!get_block_coords <block_name>\n!mine_resource <block_name> [maxDistance] [count]\n!mine_vein <block_name> [maxDistance]\n!stop_mine');
+          break;
 
-      case 'stop_mine':
-        bot.pathfinder.setGoal(null); // Clears the current mining goal
-        bot.chat('Stopped mining operation.');
-        logger.info('Mining operation stopped.');
-        break;
+        case 'stop_mine':
+          bot.pathfinder.setGoal(null); // Clears the current mining goal
+          bot.chat('Stopped mining operation.');
+          logger.info('Mining operation stopped.');
+          break;
 
-      default:
-        bot.chat(`Unknown command: ${command}`);
-        break;
+        default:
+          bot.chat(`Unknown command: ${command}`);
+          break;
+      }
     }
+  });
+
+  // -------------------- End of Chat Listener -------------------- //
+
+  return {
+    name,
+    router,
+    get bot() { return bot; },
+    summary() {
+      return {
+        name,
+        status: bot.entity && mcData ? 'ready' : 'not_ready',
+        position: bot.entity ? {
+          x: Math.round(bot.entity.position.x),
+          y: Math.round(bot.entity.position.y),
+          z: Math.round(bot.entity.position.z),
+        } : null,
+        health: bot.health ?? null,
+        activeJob: activeJob ? activeJob.id : null,
+      };
+    },
+  };
+}
+
+// -------------------- Fleet -------------------- //
+
+// name -> bot instance; the first one also answers the un-prefixed routes (/travel, /state_data, ...)
+const fleet = new Map();
+
+function defaultBotName() {
+  return fleet.keys().next().value;
+}
+
+function addBot(name) {
+  const instance = createBotInstance(name);
+  fleet.set(name, instance);
+  logger.info(`Bot "${name}" added to the fleet (${fleet.size} total)`);
+  return instance;
+}
+
+app.get('/metrics', (req, res) => {
+  res.type('text/plain; version=0.0.4').send(metrics.render());
+});
+
+app.get('/bots', (req, res) => {
+  res.json([...fleet.values()].map((instance) => instance.summary()));
+});
+
+app.post('/bots', (req, res) => {
+  const { name } = req.body;
+  if (typeof name !== 'string' || !/^\w{3,16}$/.test(name)) {
+    return res.status(400).json({ error: 'name must be a valid Minecraft username (3-16 letters, digits or _)' });
+  }
+  if (fleet.has(name)) {
+    return res.status(409).json({ error: `Bot "${name}" already exists` });
+  }
+  res.status(201).json(addBot(name).summary());
+});
+
+app.delete('/bots/:name', (req, res) => {
+  const instance = fleet.get(req.params.name);
+  if (!instance) {
+    return res.status(404).json({ error: `No bot named "${req.params.name}"` });
+  }
+  fleet.delete(req.params.name);
+  instance.bot.quit();
+  logger.info(`Bot "${req.params.name}" removed from the fleet (${fleet.size} total)`);
+  res.json({ message: `Removed bot "${req.params.name}"` });
+});
+
+app.use('/bots/:name', (req, res, next) => {
+  const instance = fleet.get(req.params.name);
+  if (!instance) {
+    return res.status(404).json({ error: `No bot named "${req.params.name}"` });
+  }
+  req.botName = instance.name;
+  instance.router(req, res, next);
+});
+
+app.use((req, res, next) => {
+  const instance = fleet.get(defaultBotName());
+  if (!instance) {
+    return res.status(503).json({ error: 'No bots in the fleet' });
   }
+  req.botName = instance.name;
+  instance.router(req, res, next);
 });
 
-// -------------------- End of Chat Listener -------------------- //
\ No newline at end of file
+for (const name of BOT_NAMES) {
+  addBot(name);
+}
+
+const PORT = process.env.PORT || 5001; // Use port from .env or default to 5001
+app.listen(PORT, () => {
+  logger.info(`Express server is running on port ${PORT} with ${fleet.size} bot(s)`);
+});
@@ -0,0 +1,292 @@
+import asyncio
+import copy
+import json
+import os
+import httpx
+
+import tracing
+from bot.bot import INSTRUCTION_METHODS, JOB_FINISHED, JOB_WAIT_SECONDS, instruction_arguments
+from bot.state_mirror import StateMirror, apply_state_delta
+
+# Deadlines (seconds) for a whole call, including time spent waiting for the bot.
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_ACTION_TIMEOUT = 120.0
+
+
+class AsyncMineflayerBotWrapper:
+    """asyncio counterpart of MineflayerBotWrapper with the same method surface.
+
+    Calls go through one pooled httpx.AsyncClient, so keep-alive connections are
+    reused instead of opening a new socket per call. Several wrappers (one per bot)
+    can share a client by passing it in; the wrapper only closes clients it created.
+    Every method takes an optional ``timeout`` that bounds the whole call.
+    ``bot_name`` selects a bot of the server's fleet, as in MineflayerBotWrapper.
+    """
+
+    def __init__(self, api_url: str | None = None, api_key: str | None = None,
+                 client: httpx.AsyncClient | None = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 action_timeout: float = DEFAULT_ACTION_TIMEOUT,
+                 bot_name: str | None = None):
+        base_url = api_url or os.getenv('MINECRAFT_API_URL', 'http://localhost:5001')
+        self.bot_name = bot_name or os.getenv('MINECRAFT_BOT_NAME')
+        self.api_url = base_url.rstrip('/') + (f"/bots/{self.bot_name}" if self.bot_name else '')
+        api_key = api_key or os.getenv('API_KEY')
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        if api_key:
+            headers['x-api-key'] = api_key
+        self.headers = headers
+        self.timeout = timeout
+        self.action_timeout = action_timeout
+        self._owns_client = client is None
+        self._client = client or create_client()
+        self._state = None  # last full state, kept current from /state_data deltas
+        self.mirror = None
+        self._seen_state_version = 0  # newest X-State-Version seen, see MineflayerBotWrapper
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self._client.aclose()
+
+    def _note_state_version(self, response):
+        version = response.headers.get('X-State-Version')
+        if version:
+            self._seen_state_version = max(self._seen_state_version, int(version))
+
+    def subscribe(self):
+        """Mirrors the bot's state from ``/events`` on a background thread; get_state_data then reads it locally."""
+        if self.mirror is None:
+            self.mirror = StateMirror(self.api_url, self.headers).start()
+        return self.mirror
+
+    async def _request(self, verb, path, description, payload=None, timeout=None, params=None):
+        try:
+            with tracing.http_span(verb, f"{self.api_url}{path}", self.headers) as (http_span, headers):
+                response = await asyncio.wait_for(
+                    self._client.request(verb, f"{self.api_url}{path}", json=payload, params=params, headers=headers),
+                    timeout,
+                )
+                http_span.set(status_code=response.status_code)
+            self._note_state_version(response)
+            response.raise_for_status()
+            return response.json()
+        except asyncio.TimeoutError:
+            print(f"{description} timed out after {timeout}s")
+            return None
+        except httpx.HTTPError as e:
+            print(f"{description} failed: {e}")
+            return None
+
+    async def _action(self, path, description, payload, timeout, job=False):
+        if job:
+            # The server answers at once with a job summary; see get_job
+            return await self._request('POST', path, description, dict(payload, **{'async': True}),
+                                       self.timeout if timeout is None else timeout)
+        return await self._request('POST', path, description, payload,
+                                   self.action_timeout if timeout is None else timeout)
+
+    async def health_check(self, timeout=None):
+        return await self._request('GET', '/health', 'Health check',
+                                   timeout=self.timeout if timeout is None else timeout)
+
+    async def get_state_data(self, wait=None, timeout=None):
+        """Current bot state, fetched as a delta against the last one this wrapper saw.
+
+        With ``wait`` (seconds), long-polls until the state changes; the deadline is extended by it.
+        After ``subscribe`` the mirrored state is returned instead, unless it lags behind.
+        """
+        if self.mirror is not None and not wait:
+            state = await asyncio.to_thread(self.mirror.get_state_data, self._seen_state_version)
+            if state is not None:
+                return state
+        params, headers = {}, self.headers
+        if self._state is not None:
+            params['since'] = self._state['version']
+            headers = dict(headers, **{'If-None-Match': f'"state-{self._state["version"]}"'})
+        if wait:
+            params['wait'] = wait
+        timeout = (self.timeout if timeout is None else timeout) + (wait or 0)
+        try:
+            with tracing.http_span('GET', f"{self.api_url}/state_data", headers) as (http_span, headers):
+                response = await asyncio.wait_for(
+                    self._client.get(f"{self.api_url}/state_data", params=params, headers=headers), timeout)
+                http_span.set(status_code=response.status_code)
+            self._note_state_version(response)
+            if response.status_code == 304:
+                return copy.deepcopy(self._state)
+            response.raise_for_status()
+            state = response.json()
+            if 'since' in state:
+                state = apply_state_delta(self._state, state)
+            self._state = state
+            return copy.deepcopy(state)
+        except asyncio.TimeoutError:
+            print(f"Get state data command timed out after {timeout}s")
+            return None
+        except httpx.HTTPError as e:
+            print(f"Get state data command failed: {e}")
+            return None
+
+    async def wait_for_state_change(self, timeout=30):
+        """Long-polls until the bot's position, health or inventory changes; returns the new state."""
+        return await self.get_state_data(wait=timeout)
+
+    async def travel_to(self, x, y, z, timeout=None, job=False):
+        return await self._action('/travel', 'Travel command', {'x': x, 'y': y, 'z': z}, timeout, job)
+
+    async def mine_block(self, x, y, z, timeout=None, job=False):
+        return await self._action('/mine', 'Mine command', {'x': x, 'y': y, 'z': z}, timeout, job)
+
+    async def craft_item(self, item_name, count=1, timeout=None):
+        return await self.craft_items([(item_name, count)], timeout)
+
+    async def craft_items(self, targets, timeout=None):
+        """Crafts each (item name, count) in ``targets``, in order, in one visit to the crafting table."""
+        payload = {'items': [{'itemName': item_name, 'count': count} for item_name, count in targets]}
+        return await self._action('/craft', 'Craft command', payload, timeout)
+
+    async def use_block(self, x, y, z, timeout=None):
+        return await self._action('/use', 'Use block command', {'x': x, 'y': y, 'z': z}, timeout)
+
+    async def drop_item(self, item_name, timeout=None):
+        return await self._action('/drop', 'Drop item command', {'itemName': item_name}, timeout)
+
+    async def place_block(self, block_name, x, y, z, timeout=None, job=False):
+        payload = {'blockName': block_name, 'x': x, 'y': y, 'z': z}
+        return await self._action('/place_block', 'Place block command', payload, timeout, job)
+
+    async def place_block_at(self, block_name, x, y, z, timeout=None):
+        payload = {'blockName': block_name, 'x': x, 'y': y, 'z': z}
+        return await self._action('/place', 'Place block at command', payload, timeout)
+
+    async def mine_resource(self, block_name, max_distance=64, rank='euclidean', count=1, mode='blocks',
+                            timeout=None, job=False):
+        payload = {'blockName': block_name, 'maxDistance': max_distance, 'rank': rank, 'count': count, 'mode': mode}
+        return await self._action('/mine_resource', 'Mine resource command', payload, timeout, job)
+
+    async def kill_entity(self, entity_type, timeout=None, job=False):
+        return await self._action('/kill', 'Kill entity command', {'entityType': entity_type}, timeout, job)
+
+    async def find_block(self, block_name, max_distance=64, timeout=None):
+        """Nearest ``block_name`` as ``{position, distance}``, or None if none is within ``max_distance``."""
+        params = {'blockName': block_name, 'maxDistance': max_distance}
+        return await self._request('GET', '/find_block', 'Find block command',
+                                   timeout=self.timeout if timeout is None else timeout, params=params)
+
+    async def find_blocks(self, block_name, count=5, max_distance=64, rank='path', timeout=None):
+        """Up to ``count`` ``block_name`` blocks as ``{position, distance, cost, costSource}``, cheapest first."""
+        payload = {'blockName': block_name, 'count': count, 'maxDistance': max_distance, 'rank': rank}
+        reply = await self._request('POST', '/find_blocks', 'Find blocks command', payload,
+                                    self.timeout if timeout is None else timeout)
+        return reply['candidates'] if reply is not None else None
+
+    async def get_job(self, job_id, wait=None, timeout=None):
+        """Status and progress of a job started with ``job=True``; ``wait`` blocks until it finishes."""
+        return await self._request('GET', f"/jobs/{job_id}", 'Get job command',
+                                   timeout=(self.timeout if timeout is None else timeout) + (wait or 0),
+                                   params={'wait': wait} if wait else None)
+
+    async def cancel_job(self, job_id, timeout=None):
+        return await self._request('DELETE', f"/jobs/{job_id}", 'Cancel job command',
+                                   timeout=self.timeout if timeout is None else timeout)
+
+    async def wait_for_job(self, job_id, timeout=None):
+        """Long-polls a job until it has finished or ``timeout`` seconds pass; returns its last status."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            remaining = JOB_WAIT_SECONDS if deadline is None else min(JOB_WAIT_SECONDS, deadline - loop.time())
+            job = await self.get_job(job_id, wait=max(remaining, 0.1))
+            if job is None or job['status'] in JOB_FINISHED or (deadline and loop.time() >= deadline):
+                return job
+
+    async def execute_instruction(self, instruction, timeout=None):
+        method = instruction['method']
+        if method not in INSTRUCTION_METHODS:
+            print(f"Unknown method: {method}")
+            return None
+        return await getattr(self, method)(*instruction_arguments(instruction), timeout=timeout)
+
+    async def execute_instructions(self, instructions, stop_on_error=True, on_step=None, timeout=None):
+        """Runs a compiled instruction list through ``/batch``; returns the per-step statuses.
+
+        ``timeout`` bounds the whole batch; steps that arrived before it expired are kept.
+        """
+        steps = []
+
+        async def consume():
+            payload = {'instructions': instructions, 'stopOnError': stop_on_error}
+            with tracing.http_span('POST', f"{self.api_url}/batch", self.headers) as (http_span, headers):
+                http_span.set(steps=len(instructions))
+                async with self._client.stream('POST', f"{self.api_url}/batch", json=payload,
+                                               headers=headers) as response:
+                    http_span.set(status_code=response.status_code)
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        step = json.loads(line)
+                        if step.get('done'):
+                            self._seen_state_version = max(self._seen_state_version, step.get('stateVersion', 0))
+                            print(f"Batch finished: {step['completed']}/{step['total']} completed, {step['failed']} failed.")
+                            break
+                        steps.append(step)
+                        if on_step:
+                            on_step(step)
+
+        if timeout is None:
+            timeout = self.action_timeout * max(len(instructions), 1)
+        try:
+            await asyncio.wait_for(consume(), timeout)
+        except asyncio.TimeoutError:
+            print(f"Batch command timed out after {timeout}s")
+        except httpx.HTTPError as e:
+            print(f"Batch command failed: {e}")
+        return steps
+
+
+def create_client(max_connections: int = 100, max_keepalive_connections: int = 20) -> httpx.AsyncClient:
+    """Pooled client that can be shared by every wrapper in the event loop."""
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_keepalive_connections)
+    # Deadlines are enforced per call by the wrapper, not per socket operation.
+    return httpx.AsyncClient(limits=limits, timeout=None)
+
+
+async def run_instructions(bot, instructions, timeout=None):
+    """Runs a compiled instruction list in order on one bot, returning each result."""
+    results = []
+    for instruction in instructions:
+        results.append(await bot.execute_instruction(instruction, timeout=timeout))
+    return results
+
+
+async def run_concurrently(assignments, timeout=None):
+    """Drives several bots at once from a single event loop.
+
+    ``assignments`` is an iterable of (wrapper, instructions) pairs. Each bot runs
+    its own list sequentially; the bots run concurrently. Results come back in the
+    same order as the assignments.
+    """
+    return await asyncio.gather(*(run_instructions(bot, instructions, timeout)
+                                  for bot, instructions in assignments))
+
+
+async def connect_fleet(client, api_url=None, api_key=None, timeout=DEFAULT_TIMEOUT):
+    """One wrapper per bot hosted by the API server, all sharing ``client``; {} if the listing fails."""
+    base_url = (api_url or os.getenv('MINECRAFT_API_URL', 'http://localhost:5001')).rstrip('/')
+    listing = AsyncMineflayerBotWrapper(base_url, api_key, client=client, timeout=timeout)
+    bots = await listing._request('GET', '/bots', 'List bots command', timeout=timeout)
+    return {
+        bot['name']: AsyncMineflayerBotWrapper(base_url, api_key, client=client, timeout=timeout, bot_name=bot['name'])
+        for bot in bots or []
+    }
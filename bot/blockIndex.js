@@ -0,0 +1,220 @@
+const Vec3 = require('vec3');
+
+// Chunk sections are 16x16x16; a block inside one is packed as (y << 8) | (z << 4) | x
+function sectionKey(sx, sy, sz) {
+  return `${sx},${sy},${sz}`;
+}
+
+function columnKey(cx, cz) {
+  return `${cx},${cz}`;
+}
+
+// State ids a section can contain, or null when it uses the global palette (any id)
+function sectionPalette(section) {
+  if (section.palette) return section.palette;
+  if (section.data && section.data.value !== undefined) return [section.data.value]; // single-value section
+  return null;
+}
+
+// Distance from a point to the nearest corner, edge or face of a section's 16^3 box
+function distanceToSection(point, section) {
+  const dx = Math.max(section.x - point.x, 0, point.x - (section.x + 15));
+  const dy = Math.max(section.y - point.y, 0, point.y - (section.y + 15));
+  const dz = Math.max(section.z - point.z, 0, point.z - (section.z + 15));
+  return Math.sqrt(dx * dx + dy * dy + dz * dz);
+}
+
+/**
+ * Incremental index of where each block type lives in the bot's loaded chunks.
+ *
+ * chunkColumnLoad reads each section's palette (a few state ids, no block scan) to map
+ * block id -> sections that may contain it; chunkColumnUnload drops the column. The
+ * positions of a type within a section are listed the first time a query needs them and
+ * are kept current from blockUpdate afterwards, so repeated lookups of the same type touch
+ * no blocks at all. A nearest-k query visits candidate sections closest first and stops as
+ * soon as the next section is farther than the k-th block found.
+ */
+class BlockIndex {
+  constructor(bot, mcData) {
+    this.bot = bot;
+    this.mcData = mcData;
+    this.sections = new Map();   // section key -> { x, y, z, types: Set|null, positions: Map<block id, Set> }
+    this.columns = new Map();    // column key -> section keys
+    this.byType = new Map();     // block id -> section keys whose palette has it
+    this.unpaletted = new Set(); // section keys on the global palette (candidates for every type)
+    this.counters = { queries: 0, queryMs: 0, maxQueryMs: 0, sectionsVisited: 0, sectionsScanned: 0 };
+
+    this.onColumnLoad = (corner) => this.addColumn(Math.floor(corner.x / 16), Math.floor(corner.z / 16));
+    this.onColumnUnload = (corner) => this.removeColumn(Math.floor(corner.x / 16), Math.floor(corner.z / 16));
+    this.onBlockUpdate = (oldBlock, newBlock) => this.updateBlock(newBlock);
+  }
+
+  /** Indexes the columns already loaded and follows chunk and block events from then on. */
+  attach() {
+    for (const { chunkX, chunkZ } of this.bot.world.getColumns()) {
+      this.addColumn(Number(chunkX), Number(chunkZ));
+    }
+    this.bot.on('chunkColumnLoad', this.onColumnLoad);
+    this.bot.on('chunkColumnUnload', this.onColumnUnload);
+    this.bot.on('blockUpdate', this.onBlockUpdate);
+    return this;
+  }
+
+  detach() {
+    this.bot.removeListener('chunkColumnLoad', this.onColumnLoad);
+    this.bot.removeListener('chunkColumnUnload', this.onColumnUnload);
+    this.bot.removeListener('blockUpdate', this.onBlockUpdate);
+  }
+
+  addColumn(cx, cz) {
+    const column = this.bot.world.getColumn(cx, cz);
+    if (!column) return;
+    // A column can be resent (e.g. after a respawn); its old sections are stale
+    this.removeColumn(cx, cz);
+    this.columns.set(columnKey(cx, cz), []);
+
+    const minSectionY = (column.minY || 0) >> 4;
+    column.sections.forEach((chunkSection, i) => {
+      if (!chunkSection) return; // all air
+      const section = this.ensureSection(cx, minSectionY + i, cz);
+      const palette = sectionPalette(chunkSection);
+      if (palette === null) {
+        section.types = null;
+        this.unpaletted.add(section.key);
+        return;
+      }
+      for (const stateId of palette) {
+        const block = this.mcData.blocksByStateId[stateId];
+        if (block) this.addType(section, block.id);
+      }
+    });
+  }
+
+  removeColumn(cx, cz) {
+    const keys = this.columns.get(columnKey(cx, cz));
+    if (!keys) return;
+    for (const key of keys) {
+      const section = this.sections.get(key);
+      for (const type of section.types || []) {
+        const holders = this.byType.get(type);
+        holders.delete(key);
+        if (holders.size === 0) this.byType.delete(type);
+      }
+      this.unpaletted.delete(key);
+      this.sections.delete(key);
+    }
+    this.columns.delete(columnKey(cx, cz));
+  }
+
+  ensureSection(sx, sy, sz) {
+    const key = sectionKey(sx, sy, sz);
+    let section = this.sections.get(key);
+    if (!section) {
+      section = { key, x: sx * 16, y: sy * 16, z: sz * 16, types: new Set(), positions: new Map() };
+      this.sections.set(key, section);
+      this.columns.get(columnKey(sx, sz)).push(key);
+    }
+    return section;
+  }
+
+  addType(section, blockId) {
+    if (section.types === null || section.types.has(blockId)) return;
+    section.types.add(blockId);
+    if (!this.byType.has(blockId)) this.byType.set(blockId, new Set());
+    this.byType.get(blockId).add(section.key);
+  }
+
+  updateBlock(newBlock) {
+    if (!newBlock || !newBlock.position) return;
+    const { x, y, z } = newBlock.position;
+    if (!this.columns.has(columnKey(x >> 4, z >> 4))) return;
+    const section = this.ensureSection(x >> 4, y >> 4, z >> 4);
+    const index = ((y & 15) << 8) | ((z & 15) << 4) | (x & 15);
+    for (const positions of section.positions.values()) {
+      positions.delete(index);
+    }
+    // Types are only ever added: a section whose last block of a type is gone stays a
+    // candidate for it and costs one (already listed, now empty) lookup
+    section.positions.get(newBlock.type)?.add(index);
+    this.addType(section, newBlock.type);
+  }
+
+  // Packed positions of blockId in a section, scanning the chunk data the first time
+  positionsIn(section, blockId) {
+    let positions = section.positions.get(blockId);
+    if (positions) return positions;
+
+    positions = new Set();
+    const column = this.bot.world.getColumn(section.x >> 4, section.z >> 4);
+    const cursor = new Vec3(0, 0, 0);
+    for (let index = 0; index < 4096; index++) {
+      cursor.x = index & 15;
+      cursor.y = section.y + (index >> 8);
+      cursor.z = (index >> 4) & 15;
+      if (this.mcData.blocksByStateId[column.getBlockStateId(cursor)]?.id === blockId) {
+        positions.add(index);
+      }
+    }
+    section.positions.set(blockId, positions);
+    this.counters.sectionsScanned++;
+    return positions;
+  }
+
+  /**
+   * Nearest blocks of a type, like bot.findBlocks but served from the index.
+   * @param {number} blockId - Block id to look for (mcData.blocksByName[name].id).
+   * @param {Vec3} point - Where distances are measured from (usually the bot's position).
+   * @param {Object} [options]
+   * @param {number} [options.maxDistance=64] - Search radius in blocks.
+   * @param {number} [options.count=1] - How many positions to return at most.
+   * @returns {Vec3[]} - Block positions, nearest first.
+   */
+  nearest(blockId, point, { maxDistance = 64, count = 1 } = {}) {
+    const started = process.hrtime.bigint();
+    const candidates = [];
+    for (const keys of [this.byType.get(blockId) || [], this.unpaletted]) {
+      for (const key of keys) {
+        const section = this.sections.get(key);
+        const distance = distanceToSection(point, section);
+        if (distance <= maxDistance) candidates.push({ section, distance });
+      }
+    }
+    candidates.sort((a, b) => a.distance - b.distance);
+
+    let found = [];
+    for (const candidate of candidates) {
+      if (found.length >= count && candidate.distance > found[count - 1].distance) break;
+      this.counters.sectionsVisited++;
+      const { section } = candidate;
+      for (const index of this.positionsIn(section, blockId)) {
+        const position = new Vec3(section.x + (index & 15), section.y + (index >> 8), section.z + ((index >> 4) & 15));
+        const distance = position.distanceTo(point);
+        if (distance <= maxDistance) found.push({ position, distance });
+      }
+      found.sort((a, b) => a.distance - b.distance);
+      found = found.slice(0, count);
+    }
+
+    const elapsedMs = Number(process.hrtime.bigint() - started) / 1e6;
+    this.counters.queries++;
+    this.counters.queryMs += elapsedMs;
+    this.counters.maxQueryMs = Math.max(this.counters.maxQueryMs, elapsedMs);
+    return found.map((entry) => entry.position);
+  }
+
+  stats() {
+    const { queries, queryMs, maxQueryMs, sectionsVisited, sectionsScanned } = this.counters;
+    return {
+      columns: this.columns.size,
+      sections: this.sections.size,
+      blockTypes: this.byType.size,
+      queries,
+      avgQueryMs: queries ? Number((queryMs / queries).toFixed(3)) : 0,
+      maxQueryMs: Number(maxQueryMs.toFixed(3)),
+      sectionsVisited,
+      sectionsScanned,
+    };
+  }
+}
+
+module.exports = { BlockIndex };
@@ -1,33 +1,142 @@
+import copy
+import json
 import os
+import time
+from urllib.parse import urlsplit
 import requests
 
+import tracing
+from bot.state_mirror import StateMirror, apply_state_delta
+
+# Instruction method -> parameter names, in the order the wrapper method takes them.
+INSTRUCTION_METHODS = {
+    'travel_to': ('x', 'y', 'z'),
+    'mine_block': ('x', 'y', 'z'),
+    'craft_item': ('item_name', 'count'),
+    'use_block': ('x', 'y', 'z'),
+    'drop_item': ('item_name',),
+    'place_block': ('block_name', 'x', 'y', 'z'),
+    'place_block_at': ('block_name', 'x', 'y', 'z'),
+    'mine_resource': ('block_name', 'max_distance', 'rank', 'count', 'mode'),
+    'kill_entity': ('entity_type',),
+}
+
+# Parameters the compiler may leave out, and the value used in their place.
+OPTIONAL_PARAMETERS = {'max_distance': 64, 'rank': 'euclidean', 'count': 1, 'mode': 'blocks'}
+
+# Parameters that take one of a fixed set of words rather than a Minecraft name.
+PARAMETER_CHOICES = {'rank': ('euclidean', 'path'), 'mode': ('blocks', 'vein')}
+
+# Final job statuses reported by /jobs/:id, and the longest single long-poll for one.
+JOB_FINISHED = ('succeeded', 'failed', 'cancelled')
+JOB_WAIT_SECONDS = 30
+
+# Expected type of every instruction parameter, by name.
+PARAMETER_TYPES = {
+    'x': int,
+    'y': int,
+    'z': int,
+    'max_distance': int,
+    'count': int,
+    'item_name': str,
+    'block_name': str,
+    'entity_type': str,
+    'rank': str,
+    'mode': str,
+}
+
+
+def instruction_arguments(instruction):
+    """Positional arguments for the wrapper method named by a compiled instruction."""
+    params = instruction.get('parameters', {})
+    return [
+        params.get(name, OPTIONAL_PARAMETERS[name]) if name in OPTIONAL_PARAMETERS else params[name]
+        for name in INSTRUCTION_METHODS[instruction['method']]
+    ]
+
+
+def _headers(api_key):
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }
+    if api_key:
+        headers['x-api-key'] = api_key
+    return headers
+
+
+def list_bots(api_url: str | None = None, api_key: str | None = None):
+    """The fleet hosted by the API server: one ``{name, status, position, ...}`` dict per bot."""
+    base_url = (api_url or os.getenv('MINECRAFT_API_URL', 'http://localhost:5001')).rstrip('/')
+    try:
+        response = requests.get(f"{base_url}/bots", headers=_headers(api_key or os.getenv('API_KEY')))
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        print(f"List bots command failed: {e}")
+        return None
+
+
+class TracedSession(requests.Session):
+    """Session that times each call as a span and passes the trace on to the server.
+
+    Streamed replies outlive the call, so they are left to the caller to time.
+    """
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('stream'):
+            return super().request(method, url, **kwargs)
+        with tracing.http_span(method, url, kwargs.pop('headers', None) or {}) as (http_span, headers):
+            response = super().request(method, url, headers=headers, **kwargs)
+            http_span.set(status_code=response.status_code)
+            return response
+
+
 class MineflayerBotWrapper:
-    def __init__(self, api_url: str | None = None, api_key: str | None = None):
+    """Calls the API for one bot of the fleet: ``bot_name`` (or ``MINECRAFT_BOT_NAME``) picks
+    ``/bots/<name>/...``; without one, the server's default bot is used."""
+
+    def __init__(self, api_url: str | None = None, api_key: str | None = None, bot_name: str | None = None):
         base_url = api_url or os.getenv('MINECRAFT_API_URL', 'http://localhost:5001')
-        self.api_url = base_url.rstrip('/')
+        self.bot_name = bot_name or os.getenv('MINECRAFT_BOT_NAME')
+        self.api_url = base_url.rstrip('/') + (f"/bots/{self.bot_name}" if self.bot_name else '')
         api_key = api_key or os.getenv('API_KEY')
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
-        if api_key:
-            headers['x-api-key'] = api_key
-        self.headers = headers
+        self.headers = _headers(api_key)
+        self._state = None  # last full state, kept current from /state_data deltas
+        self.mirror = None
+        # Newest state version any reply has reflected (X-State-Version), so a mirrored read
+        # never returns state from before an action this wrapper already saw finish
+        self._seen_state_version = 0
+        self.session = TracedSession()
+        self.session.hooks['response'].append(self._note_state_version)
+
+    def _note_state_version(self, response, *args, **kwargs):
+        version = response.headers.get('X-State-Version')
+        if version:
+            self._seen_state_version = max(self._seen_state_version, int(version))
+
+    def subscribe(self):
+        """Mirrors the bot's state from ``/events``; get_state_data then reads it locally."""
+        if self.mirror is None:
+            self.mirror = StateMirror(self.api_url, self.headers).start()
+        return self.mirror
 
     def health_check(self):
         try:
-            response = requests.get(f"{self.api_url}/health", headers=self.headers)
+            response = self.session.get(f"{self.api_url}/health", headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"Health check failed: {e}")
             return None
 
-    def travel_to(self, x, y, z):
+    def travel_to(self, x, y, z, job=False):
         payload = {'x': x, 'y': y, 'z': z}
+        if job:
+            payload['async'] = True  # returns a job summary at once; see get_job
         try:
             print('payload:', payload)
-            response = requests.post(f"{self.api_url}/travel", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/travel", json=payload, headers=self.headers)
             print("Travel command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -35,11 +144,13 @@ class MineflayerBotWrapper:
             print(f"Travel command failed: {e}")
             return None
 
-    def mine_block(self, x, y, z):
+    def mine_block(self, x, y, z, job=False):
         payload = {'x': x, 'y': y, 'z': z}
+        if job:
+            payload['async'] = True  # returns a job summary at once; see get_job
         try:
             print('mine payload:', payload)
-            response = requests.post(f"{self.api_url}/mine", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/mine", json=payload, headers=self.headers)
             print("Mine command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -47,10 +158,15 @@ class MineflayerBotWrapper:
             print(f"Mine command failed: {e}")
             return None
 
-    def craft_item(self, item_name):
-        payload = {'itemName': item_name}
+    def craft_item(self, item_name, count=1):
+        """Crafts ``count`` of ``item_name``; the reply includes the ``inventoryDelta``."""
+        return self.craft_items([(item_name, count)])
+
+    def craft_items(self, targets):
+        """Crafts each (item name, count) in ``targets``, in order, in one visit to the crafting table."""
+        payload = {'items': [{'itemName': item_name, 'count': count} for item_name, count in targets]}
         try:
-            response = requests.post(f"{self.api_url}/craft", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/craft", json=payload, headers=self.headers)
             print("Craft command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -61,7 +177,7 @@ class MineflayerBotWrapper:
     def use_block(self, x, y, z):
         payload = {'x': x, 'y': y, 'z': z}
         try:
-            response = requests.post(f"{self.api_url}/use", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/use", json=payload, headers=self.headers)
             print("Use block command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -72,7 +188,7 @@ class MineflayerBotWrapper:
     def drop_item(self, item_name):
         payload = {'itemName': item_name}
         try:
-            response = requests.post(f"{self.api_url}/drop", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/drop", json=payload, headers=self.headers)
             print("Drop item command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -80,10 +196,12 @@ class MineflayerBotWrapper:
             print(f"Drop item command failed: {e}")
             return None
 
-    def place_block(self, block_name, x, y, z):
+    def place_block(self, block_name, x, y, z, job=False):
         payload = {'blockName': block_name, 'x': x, 'y': y, 'z': z}
+        if job:
+            payload['async'] = True  # returns a job summary at once; see get_job
         try:
-            response = requests.post(f"{self.api_url}/place_block", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/place_block", json=payload, headers=self.headers)
             print("Place block command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -94,7 +212,7 @@ class MineflayerBotWrapper:
     def place_block_at(self, block_name, x, y, z):
         payload = {'blockName': block_name, 'x': x, 'y': y, 'z': z}
         try:
-            response = requests.post(f"{self.api_url}/place", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/place", json=payload, headers=self.headers)
             print("Place block at command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -102,10 +220,16 @@ class MineflayerBotWrapper:
             print(f"Place block at command failed: {e}")
             return None
 
-    def mine_resource(self, block_name, max_distance=64):
-        payload = {'blockName': block_name, 'maxDistance': max_distance}
+    def mine_resource(self, block_name, max_distance=64, rank='euclidean', count=1, mode='blocks', job=False):
+        """Mines ``count`` blocks of ``block_name``; more than one are mined as a single planned tour.
+
+        With ``mode='vein'`` the whole connected cluster around the chosen block is mined instead.
+        """
+        payload = {'blockName': block_name, 'maxDistance': max_distance, 'rank': rank, 'count': count, 'mode': mode}
+        if job:
+            payload['async'] = True  # returns a job summary at once; see get_job
         try:
-            response = requests.post(f"{self.api_url}/mine_resource", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/mine_resource", json=payload, headers=self.headers)
             print("Mine resource command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -113,10 +237,13 @@ class MineflayerBotWrapper:
             print(f"Mine resource command failed: {e}")
             return None
 
-    def kill_entity(self, entity_type):
+    def kill_entity(self, entity_type, job=False):
+        """Fights the nearest ``entity_type`` to the end; the reply reports the outcome and attacks made."""
         payload = {'entityType': entity_type}
+        if job:
+            payload['async'] = True  # returns a job summary at once; see get_job
         try:
-            response = requests.post(f"{self.api_url}/kill", json=payload, headers=self.headers)
+            response = self.session.post(f"{self.api_url}/kill", json=payload, headers=self.headers)
             print("Kill entity command sent successfully.")
             response.raise_for_status()
             return response.json()
@@ -124,36 +251,137 @@ class MineflayerBotWrapper:
             print(f"Kill entity command failed: {e}")
             return None
 
-    def get_state_data(self):
+    def find_block(self, block_name, max_distance=64):
+        """Nearest ``block_name`` as ``{position, distance}``, or None if none is within ``max_distance``."""
+        params = {'blockName': block_name, 'maxDistance': max_distance}
+        try:
+            response = self.session.get(f"{self.api_url}/find_block", params=params, headers=self.headers)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Find block command failed: {e}")
+            return None
+
+    def find_blocks(self, block_name, count=5, max_distance=64, rank='path'):
+        """Up to ``count`` ``block_name`` blocks as ``{position, distance, cost, costSource}``, cheapest first.
+
+        ``rank='path'`` costs each candidate with a bounded pathfinder search, so blocks
+        behind walls or far below rank after ones that are easy to walk to.
+        """
+        payload = {'blockName': block_name, 'count': count, 'maxDistance': max_distance, 'rank': rank}
+        try:
+            response = self.session.post(f"{self.api_url}/find_blocks", json=payload, headers=self.headers)
+            response.raise_for_status()
+            return response.json()['candidates']
+        except requests.RequestException as e:
+            print(f"Find blocks command failed: {e}")
+            return None
+
+    def get_job(self, job_id, wait=None):
+        """Status and progress of a job started with ``job=True``; ``wait`` blocks until it finishes."""
         try:
-            response = requests.get(f"{self.api_url}/state_data", headers=self.headers)
+            response = self.session.get(f"{self.api_url}/jobs/{job_id}", params={'wait': wait} if wait else None,
+                                        headers=self.headers)
             response.raise_for_status()
             return response.json()
+        except requests.RequestException as e:
+            print(f"Get job command failed: {e}")
+            return None
+
+    def cancel_job(self, job_id):
+        try:
+            response = self.session.delete(f"{self.api_url}/jobs/{job_id}", headers=self.headers)
+            print("Cancel job command sent successfully.")
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Cancel job command failed: {e}")
+            return None
+
+    def wait_for_job(self, job_id, timeout=None):
+        """Long-polls a job until it has finished or ``timeout`` seconds pass; returns its last status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = JOB_WAIT_SECONDS if deadline is None else min(JOB_WAIT_SECONDS, deadline - time.monotonic())
+            job = self.get_job(job_id, wait=max(remaining, 0.1))
+            if job is None or job['status'] in JOB_FINISHED or (deadline and time.monotonic() >= deadline):
+                return job
+
+    def get_state_data(self, wait=None):
+        """Current bot state; after the first call only the fields changed since then are fetched.
+
+        With ``wait`` (seconds), blocks until the state changes or the wait runs out. After
+        ``subscribe`` the mirrored state is returned instead, unless it lags behind.
+        """
+        if self.mirror is not None and not wait:
+            state = self.mirror.get_state_data(self._seen_state_version)
+            if state is not None:
+                return state
+        params, headers = {}, self.headers
+        if self._state is not None:
+            params['since'] = self._state['version']
+            headers = dict(headers, **{'If-None-Match': f'"state-{self._state["version"]}"'})
+        if wait:
+            params['wait'] = wait
+        try:
+            response = self.session.get(f"{self.api_url}/state_data", params=params, headers=headers,
+                                    timeout=wait + 10 if wait else None)
+            if response.status_code == 304:
+                return copy.deepcopy(self._state)
+            response.raise_for_status()
+            state = response.json()
+            if 'since' in state:
+                state = apply_state_delta(self._state, state)
+            self._state = state
+            return copy.deepcopy(state)
         except requests.RequestException as e:
             print(f"Get state data command failed: {e}")
             return None
-        
+
+    def wait_for_state_change(self, timeout=30):
+        """Long-polls until the bot's position, health or inventory changes; returns the new state."""
+        return self.get_state_data(wait=timeout)
+
     def execute_instruction(self, instruction):
         method = instruction['method']
-        params = instruction['parameters']
-        
-        if method == 'travel_to':
-            self.travel_to(params['x'], params['y'], params['z'])
-        elif method == 'mine_block':
-            self.mine_block(params['x'], params['y'], params['z'])
-        elif method == 'craft_item':
-            self.craft_item(params['item_name']) 
-        elif method == 'use_block':
-            self.use_block(params['x'], params['y'], params['z'])
-        elif method == 'drop_item':
-            self.drop_item(params['item_name'])
-        elif method == 'place_block':
-            self.place_block(params['block_name'], params['x'], params['y'], params['z'])
-        elif method == 'place_block_at':
-            self.place_block_at(params['block_name'], params['x'], params['y'], params['z'])
-        elif method == 'mine_resource':
-            self.mine_resource(params['block_name'], params.get('max_distance', 64))
-        elif method == 'kill_entity':
-            self.kill_entity(params['entity_type']) 
-        else:
+        if method not in INSTRUCTION_METHODS:
             print(f"Unknown method: {method}")
+            return None
+        return getattr(self, method)(*instruction_arguments(instruction))
+
+    def iter_instructions(self, instructions, stop_on_error=True):
+        """Sends a whole instruction list to ``/batch`` and yields each step's status as it finishes.
+
+        The final item is the summary line (``{'done': True, ...}``).
+        """
+        payload = {'instructions': instructions, 'stopOnError': stop_on_error}
+        # Not made current: the caller runs between steps
+        batch_span = tracing.start_span(f"http POST {urlsplit(self.api_url).path}/batch", steps=len(instructions))
+        headers = dict(self.headers, **tracing.trace_headers(batch_span))
+        try:
+            with self.session.post(f"{self.api_url}/batch", json=payload, headers=headers, stream=True) as response:
+                batch_span.set(status_code=response.status_code)
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.RequestException as e:
+            batch_span.fail(e)
+            print(f"Batch command failed: {e}")
+        finally:
+            batch_span.end()
+
+    def execute_instructions(self, instructions, stop_on_error=True, on_step=None):
+        """Runs a compiled instruction list in one request; returns the per-step statuses."""
+        steps = []
+        for step in self.iter_instructions(instructions, stop_on_error):
+            if step.get('done'):
+                self._seen_state_version = max(self._seen_state_version, step.get('stateVersion', 0))
+                print(f"Batch finished: {step['completed']}/{step['total']} completed, {step['failed']} failed.")
+                break
+            steps.append(step)
+            if on_step:
+                on_step(step)
+        return steps
@@ -0,0 +1,157 @@
+const { goals } = require('mineflayer-pathfinder');
+const Vec3 = require('vec3');
+
+const ATTACK_REACH = 3;          // survival reach for hitting an entity, eyes to hitbox
+const EYE_HEIGHT = 1.62;
+const SPRINT_PER_TICK = 0.28;    // blocks the bot covers per tick when chasing
+const MAX_LEAD_TICKS = 10;       // never lead a target by more than half a second
+const RETARGET_DISTANCE = 1.5;   // predicted position drift before the pursuit goal is moved
+
+// Attacks per second by held item (1.9+ attack speed); anything else swings like a bare hand
+const HAND_ATTACK_SPEED = 4;
+const ATTACK_SPEEDS = [['_sword', 1.6], ['_pickaxe', 1.2], ['_axe', 1.0], ['_shovel', 1.0], ['_hoe', 1.0], ['trident', 1.1]];
+
+// Ticks until a full-strength hit is possible again; attacking sooner does a fraction of the damage
+function attackCooldownTicks(item) {
+  const speed = item ? ATTACK_SPEEDS.find(([suffix]) => item.name.endsWith(suffix))?.[1] ?? HAND_ATTACK_SPEED : HAND_ATTACK_SPEED;
+  return Math.ceil(20 / speed);
+}
+
+// Distance from a point to the nearest point of an entity's hitbox
+function distanceToHitbox(point, entity) {
+  const half = (entity.width || 0.6) / 2;
+  const { x, y, z } = entity.position;
+  const dx = Math.max(x - half - point.x, 0, point.x - (x + half));
+  const dy = Math.max(y - point.y, 0, point.y - (y + (entity.height || 1.8)));
+  const dz = Math.max(z - half - point.z, 0, point.z - (z + half));
+  return Math.sqrt(dx * dx + dy * dy + dz * dz);
+}
+
+/**
+ * Fights one entity at a time, driven by physicsTick instead of timers.
+ *
+ * Every tick the controller checks whether the fight is over, leads a moving target (its
+ * velocity, estimated from position changes, times the ticks needed to close the gap) with a
+ * pathfinder goal that only moves when the prediction drifts, and attacks once the target is
+ * within reach and the held item's attack cooldown has recharged. Listeners exist only for
+ * the length of a fight; finish() removes all of them and resolves engage() with the outcome.
+ */
+class CombatController {
+  constructor(bot, { timeoutMs = 60000, maxDistance = 32 } = {}) {
+    this.bot = bot;
+    this.timeoutMs = timeoutMs;
+    this.maxDistance = maxDistance;
+    this.fight = null;
+    this.counters = { fights: 0, kills: 0, attacks: 0, hits: 0 };
+  }
+
+  /**
+   * Fights `target` until it dies or the fight ends otherwise; a running fight is superseded.
+   * @param {Entity} target - The entity to kill.
+   * @returns {Promise<Object>} - Outcome ('killed', 'gone', 'escaped', 'timeout', 'died',
+   *   'cancelled' or 'superseded'), attacks, hits registered, duration and attacks per second.
+   */
+  engage(target) {
+    if (this.fight) this.finish('superseded');
+    return new Promise((resolve) => {
+      const fight = {
+        target,
+        resolve,
+        startedAt: Date.now(),
+        tick: 0,
+        lastAttackTick: -Infinity,
+        attacks: 0,
+        hits: 0,
+        lastPosition: target.position.clone(),
+        velocity: new Vec3(0, 0, 0), // blocks per tick, smoothed over recent ticks
+        goal: null,
+        goalTarget: null,
+        listeners: {
+          physicsTick: () => this.tick(fight),
+          entityDead: (entity) => { if (entity === target) this.finish('killed'); },
+          entityGone: (entity) => { if (entity === target) this.finish('gone'); },
+          entityHurt: (entity) => { if (entity === target) fight.hits++; },
+          death: () => this.finish('died'),
+        },
+      };
+      this.fight = fight;
+      this.counters.fights++;
+      for (const [event, listener] of Object.entries(fight.listeners)) {
+        this.bot.on(event, listener);
+      }
+    });
+  }
+
+  tick(fight) {
+    if (fight !== this.fight) return;
+    const { bot } = this;
+    const { target } = fight;
+    fight.tick++;
+    if (!target.isValid) return this.finish('gone');
+    if (Date.now() - fight.startedAt > this.timeoutMs) return this.finish('timeout');
+    const distance = bot.entity.position.distanceTo(target.position);
+    if (distance > this.maxDistance) return this.finish('escaped');
+
+    fight.velocity = fight.velocity.scaled(0.5).plus(target.position.minus(fight.lastPosition).scaled(0.5));
+    fight.lastPosition = target.position.clone();
+
+    const eyes = bot.entity.position.offset(0, EYE_HEIGHT, 0);
+    if (distanceToHitbox(eyes, target) > ATTACK_REACH) {
+      this.pursue(fight, distance);
+      return;
+    }
+    if (fight.tick - fight.lastAttackTick < attackCooldownTicks(bot.heldItem)) return;
+    bot.lookAt(target.position.offset(0, (target.height || 1.8) * 0.8, 0), true).catch(() => {});
+    // Counted first: a killing blow can end the fight before attack() returns
+    fight.lastAttackTick = fight.tick;
+    fight.attacks++;
+    bot.attack(target);
+  }
+
+  // Heads for where the target will be by the time the bot covers the gap
+  pursue(fight, distance) {
+    const leadTicks = Math.min(MAX_LEAD_TICKS, distance / SPRINT_PER_TICK);
+    const predicted = fight.target.position.plus(fight.velocity.scaled(leadTicks));
+    if (fight.goalTarget && fight.goalTarget.distanceTo(predicted) <= RETARGET_DISTANCE) return;
+    fight.goalTarget = predicted;
+    fight.goal = new goals.GoalNear(predicted.x, predicted.y, predicted.z, 1);
+    this.bot.pathfinder.setGoal(fight.goal);
+  }
+
+  finish(outcome) {
+    const fight = this.fight;
+    if (!fight) return;
+    this.fight = null;
+    for (const [event, listener] of Object.entries(fight.listeners)) {
+      this.bot.removeListener(event, listener);
+    }
+    if (fight.goal && this.bot.pathfinder.goal === fight.goal) {
+      this.bot.pathfinder.setGoal(null);
+    }
+
+    const seconds = (Date.now() - fight.startedAt) / 1000;
+    this.counters.attacks += fight.attacks;
+    this.counters.hits += fight.hits;
+    if (outcome === 'killed') this.counters.kills++;
+    fight.resolve({
+      target: fight.target.name,
+      entityId: fight.target.id,
+      outcome,
+      attacks: fight.attacks,
+      hits: fight.hits,
+      seconds: Number(seconds.toFixed(1)),
+      attacksPerSecond: seconds > 0 ? Number((fight.attacks / seconds).toFixed(2)) : null,
+    });
+  }
+
+  // Ends the current fight, e.g. when its job is cancelled
+  stop() {
+    this.finish('cancelled');
+  }
+
+  stats() {
+    return { ...this.counters, fighting: this.fight ? this.fight.target.name : null };
+  }
+}
+
+module.exports = { CombatController };
@@ -0,0 +1,166 @@
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+// Seconds; spans a cached path (sub-ms) to a long fight or tour (a minute)
+const DURATION_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60];
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function formatLabels(labels) {
+  const pairs = Object.entries(labels).map(([name, value]) => `${name}="${escapeLabel(value)}"`);
+  return pairs.length ? `{${pairs.join(',')}}` : '';
+}
+
+class Metric {
+  constructor(name, help, type) {
+    this.name = name;
+    this.help = help;
+    this.type = type;
+    this.series = new Map(); // label values (JSON) -> { labels, ... }
+  }
+
+  seriesFor(labels, create) {
+    const key = JSON.stringify(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = create();
+      series.labels = labels;
+      this.series.set(key, series);
+    }
+    return series;
+  }
+
+  header() {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+  }
+}
+
+class Counter extends Metric {
+  constructor(name, help) {
+    super(name, help, 'counter');
+  }
+
+  inc(labels = {}, value = 1) {
+    this.seriesFor(labels, () => ({ value: 0 })).value += value;
+  }
+
+  render() {
+    return [...this.series.values()].map((s) => `${this.name}${formatLabels(s.labels)} ${s.value}`);
+  }
+}
+
+class Gauge extends Metric {
+  constructor(name, help) {
+    super(name, help, 'gauge');
+  }
+
+  set(labels, value) {
+    this.seriesFor(labels, () => ({ value: 0 })).value = value;
+  }
+
+  render() {
+    return [...this.series.values()].map((s) => `${this.name}${formatLabels(s.labels)} ${s.value}`);
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, buckets = DURATION_BUCKETS) {
+    super(name, help, 'histogram');
+    this.buckets = buckets;
+  }
+
+  observe(labels, value) {
+    const series = this.seriesFor(labels, () => ({ counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 }));
+    const index = this.buckets.findIndex((bound) => value <= bound);
+    if (index !== -1) series.counts[index]++;
+    series.sum += value;
+    series.count++;
+  }
+
+  // Observes the seconds elapsed since `started` (a process.hrtime.bigint() reading)
+  observeSince(labels, started) {
+    this.observe(labels, Number(process.hrtime.bigint() - started) / 1e9);
+  }
+
+  render() {
+    const lines = [];
+    for (const s of this.series.values()) {
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += s.counts[i];
+        lines.push(`${this.name}_bucket${formatLabels({ ...s.labels, le: bound })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...s.labels, le: '+Inf' })} ${s.count}`);
+      lines.push(`${this.name}_sum${formatLabels(s.labels)} ${s.sum}`);
+      lines.push(`${this.name}_count${formatLabels(s.labels)} ${s.count}`);
+    }
+    return lines;
+  }
+}
+
+/**
+ * Metrics in the Prometheus text exposition format, without a client library: counters,
+ * gauges and histograms keyed by label values. Collectors run before each render to
+ * refresh gauges that are read rather than pushed (heap size, event-loop delay).
+ */
+class Registry {
+  constructor() {
+    this.metrics = new Map();
+    this.collectors = [];
+  }
+
+  register(metric) {
+    if (!this.metrics.has(metric.name)) this.metrics.set(metric.name, metric);
+    return this.metrics.get(metric.name);
+  }
+
+  counter(name, help) {
+    return this.register(new Counter(name, help));
+  }
+
+  gauge(name, help) {
+    return this.register(new Gauge(name, help));
+  }
+
+  histogram(name, help, buckets) {
+    return this.register(new Histogram(name, help, buckets));
+  }
+
+  collect(collector) {
+    this.collectors.push(collector);
+  }
+
+  render() {
+    for (const collector of this.collectors) collector();
+    const lines = [];
+    for (const metric of this.metrics.values()) {
+      if (metric.series.size === 0) continue;
+      lines.push(...metric.header(), ...metric.render());
+    }
+    return lines.join('\n') + '\n';
+  }
+}
+
+/**
+ * Event-loop delay (sampled every 10 ms, reset at each scrape) and heap usage of this process.
+ */
+function registerProcessMetrics(registry) {
+  const delay = monitorEventLoopDelay({ resolution: 10 });
+  delay.enable();
+  const lag = registry.gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the last scrape');
+  const heap = registry.gauge('nodejs_heap_bytes', 'V8 heap size');
+  const rss = registry.gauge('process_resident_memory_bytes', 'Resident set size');
+  registry.collect(() => {
+    lag.set({ stat: 'mean' }, Number.isNaN(delay.mean) ? 0 : delay.mean / 1e9);
+    lag.set({ stat: 'p99' }, delay.percentile(99) / 1e9);
+    lag.set({ stat: 'max' }, delay.max / 1e9);
+    delay.reset();
+    const memory = process.memoryUsage();
+    heap.set({ type: 'used' }, memory.heapUsed);
+    heap.set({ type: 'total' }, memory.heapTotal);
+    rss.set({}, memory.rss);
+  });
+}
+
+module.exports = { Registry, registerProcessMetrics, DURATION_BUCKETS };
@@ -0,0 +1,293 @@
+// Goals with a fixed target; dynamic or composite goals (GoalFollow, GoalCompositeAny, ...)
+// are always computed fresh
+const CACHEABLE_GOALS = new Set([
+  'GoalBlock', 'GoalNear', 'GoalXZ', 'GoalNearXZ', 'GoalY', 'GoalGetToBlock', 'GoalLookAtBlock',
+]);
+
+// A cached path asked for again from the same spot this soon did not get the bot anywhere
+// (the pathfinder re-plans when stuck), so it is dropped and recomputed
+const REPLAN_WINDOW_MS = 5000;
+
+function goalKey(goal) {
+  const type = goal?.constructor?.name;
+  if (!CACHEABLE_GOALS.has(type)) return null;
+  const fields = [];
+  for (const [name, value] of Object.entries(goal)) {
+    if (typeof value === 'number' || typeof value === 'string') {
+      fields.push(`${name}=${value}`);
+    } else if (value && typeof value.x === 'number' && typeof value.y === 'number' && typeof value.z === 'number') {
+      fields.push(`${name}=${value.x},${value.y},${value.z}`);
+    }
+  }
+  return `${type}(${fields.join(';')})`;
+}
+
+// The pathfinder consumes a path as it walks it (splicing it, shifting toBreak/toPlace)
+function cloneMove(node) {
+  return Object.assign(Object.create(Object.getPrototypeOf(node)), node, {
+    toBreak: node.toBreak ? node.toBreak.slice() : [],
+    toPlace: node.toPlace ? node.toPlace.slice() : [],
+  });
+}
+
+// Blocks whose change makes the path suspect: the ones the pathfinder itself checks in
+// isPositionNearPath (within 1 horizontally and 2 vertically of any point on the path,
+// including the straight segments between optimized nodes) plus those it breaks or places
+function blocksAlongPath(start, path) {
+  const blocks = new Set();
+  const addAround = (x, y, z) => {
+    for (let dx = -1; dx <= 1; dx++) {
+      for (let dz = -1; dz <= 1; dz++) {
+        for (let dy = -2; dy <= 1; dy++) {
+          blocks.add(`${Math.floor(x) + dx},${Math.floor(y) + dy},${Math.floor(z) + dz}`);
+        }
+      }
+    }
+  };
+  let previous = start;
+  for (const node of path) {
+    const steps = Math.max(1, Math.ceil(Math.max(
+      Math.abs(node.x - previous.x), Math.abs(node.y - previous.y), Math.abs(node.z - previous.z))));
+    for (let i = 1; i <= steps; i++) {
+      const t = i / steps;
+      addAround(previous.x + (node.x - previous.x) * t, previous.y + (node.y - previous.y) * t, previous.z + (node.z - previous.z) * t);
+    }
+    for (const p of [...(node.toBreak || []), ...(node.toPlace || [])]) {
+      blocks.add(`${p.x},${p.y},${p.z}`);
+    }
+    previous = node;
+  }
+  return blocks;
+}
+
+/**
+ * LRU cache of pathfinder results, keyed on the bot's block position, the movements in use
+ * and the goal.
+ *
+ * attach() wraps bot.pathfinder.getPathTo, which the pathfinder calls whenever it needs a new
+ * path, so a bot shuttling between the same places reuses the A* result instead of
+ * recomputing it. Every entry records the blocks along its path; a blockUpdate that changes
+ * one of them drops the entries through it. Only complete ('success') paths are stored.
+ *
+ * A search that needs more than one A* slice comes back 'partial', and the pathfinder
+ * finishes it in its own A* context, out of the wrapper's sight. The cache then runs the
+ * same search from the same start in the background, one slice per event-loop turn, and
+ * stores its result, unless a block along it changed while it ran.
+ */
+class PathCache {
+  constructor(bot, { maxEntries = 256 } = {}) {
+    this.bot = bot;
+    this.maxEntries = maxEntries;
+    this.entries = new Map();  // key -> { path, cost, computeMs, blocks, servedAt (last hit) }, least recently used first
+    this.byBlock = new Map();  // "x,y,z" -> keys of entries whose path runs by that block
+    this.movementIds = new WeakMap();
+    this.nextMovementsId = 1;
+    this.completing = new Set(); // keys of partial results being searched to the end
+    this.watchers = new Set();   // per running search: the blocks changed since it started
+    this.counters = {
+      hits: 0, misses: 0, uncacheable: 0, replanned: 0, invalidated: 0, evicted: 0, primed: 0,
+      primedHits: 0, primeStale: 0, partial: 0, partialCached: 0, partialUncached: 0, computeMs: 0, savedMs: 0,
+    };
+    this.onBlockUpdate = (oldBlock, newBlock) => {
+      if (!oldBlock || !newBlock || oldBlock.type === newBlock.type) return;
+      const { x, y, z } = newBlock.position;
+      for (const changed of this.watchers) changed.add(`${x},${y},${z}`);
+      this.invalidate(newBlock.position);
+    };
+  }
+
+  attach() {
+    const compute = this.bot.pathfinder.getPathTo;
+    this.bot.pathfinder.getPathTo = (movements, goal, timeout) => this.getPathTo(compute, movements, goal, timeout);
+    this.bot.on('blockUpdate', this.onBlockUpdate);
+    return this;
+  }
+
+  movementsId(movements) {
+    if (!movements) return 0;
+    if (!this.movementIds.has(movements)) this.movementIds.set(movements, this.nextMovementsId++);
+    return this.movementIds.get(movements);
+  }
+
+  key(start, movements, goal) {
+    const target = goalKey(goal);
+    if (target === null) return null;
+    const { x, y, z } = start.floored();
+    return `${x},${y},${z}|${this.movementsId(movements)}|${target}`;
+  }
+
+  getPathTo(compute, movements, goal, timeout) {
+    const key = this.key(this.bot.entity.position, movements, goal);
+    if (key === null) {
+      this.counters.uncacheable++;
+      return compute(movements, goal, timeout);
+    }
+
+    const entry = this.entries.get(key);
+    if (entry && Date.now() - entry.servedAt > REPLAN_WINDOW_MS) {
+      this.entries.delete(key);
+      this.entries.set(key, entry); // most recently used
+      entry.servedAt = Date.now();
+      this.counters.hits++;
+      this.counters.savedMs += entry.computeMs;
+      if (entry.primed) {
+        this.counters.primedHits++;
+        entry.primed = false;
+      }
+      return { status: 'success', cost: entry.cost, time: 0, visitedNodes: 0, generatedNodes: 0, path: entry.path.map(cloneMove) };
+    }
+    if (entry) {
+      this.counters.replanned++;
+      this.remove(key);
+    }
+
+    const started = performance.now();
+    const result = compute(movements, goal, timeout);
+    const computeMs = performance.now() - started;
+    this.counters.misses++;
+    this.counters.computeMs += computeMs;
+    if (result.status === 'success' && result.path.length > 0) {
+      this.store(key, {
+        path: result.path.map(cloneMove),
+        cost: result.cost,
+        computeMs,
+        blocks: blocksAlongPath(this.bot.entity.position, result.path),
+        servedAt: 0,
+      });
+    } else if (result.status === 'partial') {
+      this.counters.partial++;
+      this.complete(key, this.bot.entity.position.clone(), movements, goal, timeout).catch(() => {
+        this.counters.partialUncached++;
+      });
+    }
+    return result;
+  }
+
+  /**
+   * Searches from `start` to `goal` to the end in the background and stores a complete path
+   * under `key`, for a search the pathfinder returned 'partial' and finishes on its own.
+   */
+  async complete(key, start, movements, goal, timeout) {
+    if (this.completing.has(key)) return;
+    this.completing.add(key);
+    const changed = this.watch();
+    const started = performance.now();
+    let result = null;
+    try {
+      for (const step of this.bot.pathfinder.getPathFromTo(movements, start, goal, { timeout })) {
+        result = step.result;
+        if (result.status !== 'partial') break;
+        await new Promise((resolve) => setImmediate(resolve));
+      }
+    } finally {
+      this.completing.delete(key);
+      this.unwatch(changed);
+    }
+    if (!result || result.status !== 'success' || result.path.length === 0) {
+      this.counters.partialUncached++;
+      return;
+    }
+    const blocks = blocksAlongPath(start, result.path);
+    if ([...changed].some((block) => blocks.has(block))) {
+      this.counters.partialUncached++;
+      return;
+    }
+    const computeMs = performance.now() - started;
+    this.counters.computeMs += computeMs;
+    this.remove(key);
+    this.store(key, { path: result.path.map(cloneMove), cost: result.cost, computeMs, blocks, servedAt: 0 });
+    this.counters.partialCached++;
+  }
+
+  // A set that collects the "x,y,z" of every block changed until it is passed to unwatch()
+  watch() {
+    const changed = new Set();
+    this.watchers.add(changed);
+    return changed;
+  }
+
+  unwatch(changed) {
+    this.watchers.delete(changed);
+  }
+
+  /**
+   * Stores a path computed ahead of time (e.g. while the bot digs) from `start`, so the
+   * pathfinder gets it from the cache when the bot sets that goal from there.
+   * @param {Object} [options]
+   * @param {Set<string>} [options.changed] - Blocks changed while the search ran (see watch());
+   *   a path by any of them was planned against the old world and is not stored.
+   * @param {Vec3} [options.removing] - A block being dug while the search ran. Its change is
+   *   expected, so it is left out of the entry's invalidation set; a path that stands on it
+   *   or breaks it is not stored.
+   * @returns {boolean} - Whether the result was stored (only complete, current paths are).
+   */
+  prime(start, movements, goal, result, computeMs, { changed = null, removing = null } = {}) {
+    const key = this.key(start, movements, goal);
+    if (key === null || result.status !== 'success' || result.path.length === 0) return false;
+    const blocks = blocksAlongPath(start, result.path);
+    if (removing) {
+      const { x, y, z } = removing;
+      const dependsOnIt = result.path.some((node) =>
+        (Math.floor(node.x) === x && Math.floor(node.y) - 1 === y && Math.floor(node.z) === z) ||
+        (node.toBreak || []).some((p) => p.x === x && p.y === y && p.z === z));
+      if (dependsOnIt) return false;
+      blocks.delete(`${x},${y},${z}`);
+    }
+    if (changed && [...changed].some((block) => blocks.has(block))) {
+      this.counters.primeStale++;
+      return false;
+    }
+    this.remove(key);
+    this.store(key, { path: result.path.map(cloneMove), cost: result.cost, computeMs, blocks, servedAt: 0, primed: true });
+    this.counters.primed++;
+    return true;
+  }
+
+  store(key, entry) {
+    this.entries.set(key, entry);
+    for (const block of entry.blocks) {
+      if (!this.byBlock.has(block)) this.byBlock.set(block, new Set());
+      this.byBlock.get(block).add(key);
+    }
+    while (this.entries.size > this.maxEntries) {
+      this.remove(this.entries.keys().next().value);
+      this.counters.evicted++;
+    }
+  }
+
+  remove(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+    this.entries.delete(key);
+    for (const block of entry.blocks) {
+      const keys = this.byBlock.get(block);
+      keys.delete(key);
+      if (keys.size === 0) this.byBlock.delete(block);
+    }
+  }
+
+  invalidate(position) {
+    const keys = this.byBlock.get(`${position.x},${position.y},${position.z}`);
+    if (!keys) return;
+    for (const key of [...keys]) {
+      this.remove(key);
+      this.counters.invalidated++;
+    }
+  }
+
+  stats() {
+    const { hits, misses, computeMs, savedMs, ...rest } = this.counters;
+    return {
+      entries: this.entries.size,
+      maxEntries: this.maxEntries,
+      hits,
+      misses,
+      hitRate: hits + misses ? Number((hits / (hits + misses)).toFixed(3)) : 0,
+      ...rest,
+      computeMs: Number(computeMs.toFixed(1)),
+      savedMs: Number(savedMs.toFixed(1)),
+    };
+  }
+}
+
+module.exports = { PathCache };
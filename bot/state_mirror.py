@@ -0,0 +1,116 @@
+import copy
+import json
+import threading
+import requests
+
+
+def apply_state_delta(state, delta):
+    """New state dict with a ``/state_data?since=`` delta applied; emptied slots have count 0."""
+    state = copy.deepcopy(state)
+    for key, value in delta.items():
+        if key not in ('since', 'inventory'):
+            state[key] = value
+    inventory = {item['slot']: item for item in state.get('inventory', [])}
+    for item in delta.get('inventory', []):
+        if item['count'] > 0:
+            inventory[item['slot']] = item
+        else:
+            inventory.pop(item['slot'], None)
+    state['inventory'] = [inventory[slot] for slot in sorted(inventory)]
+    return state
+
+
+def iter_events(lines):
+    """Parses Server-Sent Events from decoded lines; yields (event type, data dict)."""
+    event_type, data = 'message', []
+    for line in lines:
+        if not line:
+            if data:
+                yield event_type, json.loads('\n'.join(data))
+            event_type, data = 'message', []
+        elif line.startswith(':'):
+            continue  # heartbeat comment
+        else:
+            field, _, value = line.partition(':')
+            value = value[1:] if value.startswith(' ') else value
+            if field == 'event':
+                event_type = value
+            elif field == 'data':
+                data.append(value)
+
+
+class StateMirror:
+    """Live local copy of the bot's state, kept current from the API's ``/events`` stream.
+
+    A background thread holds the stream open (reconnecting after drops) and applies each
+    ``state`` delta as it arrives, so reading the state costs no HTTP round trip.
+    Callbacks registered with ``on`` receive the other events (``goal_reached``,
+    ``path_update``, ``dig``, ``entity_gone``, ``step``, ``death``) as dicts.
+    """
+
+    def __init__(self, api_url, headers=None, reconnect_delay=2.0):
+        self.api_url = api_url.rstrip('/')
+        self.headers = dict(headers or {}, Accept='text/event-stream')
+        self.reconnect_delay = reconnect_delay
+        self.listeners = {}
+        self._state = None
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._response = None
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._state['version'] if self._state else None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='state-mirror', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._response is not None:
+            self._response.close()
+
+    def on(self, event_type, callback):
+        self.listeners.setdefault(event_type, []).append(callback)
+
+    def get_state_data(self, min_version=None, timeout=1.0):
+        """Mirrored state once it reflects at least ``min_version``; None if it doesn't within ``timeout``."""
+        with self._changed:
+            ready = self._changed.wait_for(
+                lambda: self._state is not None and (min_version is None or self._state['version'] >= min_version),
+                timeout)
+            return copy.deepcopy(self._state) if ready else None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                with requests.get(f"{self.api_url}/events", headers=self.headers, stream=True,
+                                  timeout=(5, 60)) as response:
+                    response.raise_for_status()
+                    self._response = response
+                    for event_type, data in iter_events(response.iter_lines(chunk_size=None, decode_unicode=True)):
+                        if not self._handle(event_type, data):
+                            break  # missed a delta; reconnect for a fresh snapshot
+            except (requests.RequestException, ValueError) as e:
+                if not self._stopped.is_set():
+                    print(f"State event stream dropped: {e}")
+            with self._changed:
+                self._state = None
+            self._stopped.wait(self.reconnect_delay)
+
+    def _handle(self, event_type, data):
+        with self._changed:
+            if event_type == 'snapshot':
+                self._state = data
+            elif event_type == 'state':
+                if self._state is None or data['since'] != self._state['version']:
+                    return False
+                self._state = apply_state_delta(self._state, data)
+            self._changed.notify_all()
+        for callback in self.listeners.get(event_type, []):
+            callback(data)
+        return True
@@ -0,0 +1,82 @@
+const fs = require('fs');
+const crypto = require('crypto');
+const { AsyncLocalStorage } = require('async_hooks');
+
+/**
+ * Spans for requests that arrive with an `X-Trace-Id` header, written as JSON lines in the
+ * same format as the Python side's tracing.py, so one timeline shows both.
+ *
+ * middleware() opens a request span under the caller's `X-Parent-Span-Id` and keeps it in
+ * AsyncLocalStorage for everything the request starts, including jobs that outlive it.
+ * span() nests an action (travel, dig, craft, fight, batch step) under whatever span is
+ * current, and only runs the function when the request is not traced.
+ */
+class Tracer {
+  constructor(path) {
+    this.out = path ? fs.createWriteStream(path, { flags: 'a' }) : null;
+    this.storage = new AsyncLocalStorage();
+  }
+
+  middleware() {
+    return (req, res, next) => {
+      const traceId = req.get('x-trace-id');
+      if (!this.out || !traceId) return next();
+      const span = this.start('request', { traceId, spanId: req.get('x-parent-span-id') || null }, { method: req.method, path: req.path });
+      res.on('finish', () => {
+        span.attrs.bot = req.botName;
+        span.attrs.route = req.route ? req.route.path : undefined;
+        span.attrs.status_code = res.statusCode;
+        this.end(span, res.statusCode >= 400 ? 'error' : 'ok');
+      });
+      this.storage.run(span, next);
+    };
+  }
+
+  start(name, parent, attrs) {
+    return {
+      traceId: parent.traceId,
+      spanId: crypto.randomBytes(4).toString('hex'),
+      parentId: parent.spanId,
+      name,
+      attrs,
+      start: Date.now() / 1000,
+      started: process.hrtime.bigint(),
+    };
+  }
+
+  end(span, status) {
+    this.out.write(JSON.stringify({
+      trace_id: span.traceId,
+      span_id: span.spanId,
+      parent_id: span.parentId,
+      name: span.name,
+      service: 'node',
+      start: span.start,
+      duration_ms: Number(process.hrtime.bigint() - span.started) / 1e6,
+      status,
+      attrs: span.attrs,
+    }) + '\n');
+  }
+
+  /**
+   * Runs `fn(attrs)` as a child span of the current one; `fn` may add attributes (e.g. the
+   * outcome) to the object it is given before it settles.
+   * @returns {Promise<*>} - Whatever `fn` returns.
+   */
+  async span(name, attrs, fn) {
+    const parent = this.storage.getStore();
+    if (!parent) return fn(attrs);
+    const span = this.start(name, parent, attrs);
+    try {
+      const result = await this.storage.run(span, () => fn(span.attrs));
+      this.end(span, 'ok');
+      return result;
+    } catch (err) {
+      span.attrs.error = err.message;
+      this.end(span, 'error');
+      throw err;
+    }
+  }
+}
+
+module.exports = { Tracer };
@@ -0,0 +1,160 @@
+"""Block and item names for the LLM prompts, pruned to what each command needs.
+
+Both prompts get the names the command, the inventory and CORE_NAMES point to, found
+through exact, prefix and trigram lookups, instead of all ~1,200 names for the
+``MINECRAFT_VERSION`` in use; each call logs the prompt tokens saved.
+"""
+import re
+from collections import defaultdict
+from llm import minecraft_data
+from llm.prompts import BLOCK_NAMES_PLACEHOLDER
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('cl100k_base')
+except ImportError:
+    _encoding = None
+
+# Names worth offering on every call: the basics most plans touch even when the command doesn't say so.
+CORE_NAMES = (
+    'crafting_table', 'furnace', 'chest', 'torch', 'stick',
+    'oak_log', 'oak_planks', 'cobblestone', 'stone', 'dirt', 'sand', 'gravel',
+    'coal_ore', 'iron_ore', 'coal', 'raw_iron', 'iron_ingot',
+    'wooden_pickaxe', 'stone_pickaxe', 'iron_pickaxe',
+)
+
+# Command words that never name a block but would otherwise prefix-match one ("and" -> andesite).
+STOP_WORDS = {
+    'a', 'an', 'and', 'the', 'to', 'of', 'at', 'in', 'on', 'for', 'with', 'from', 'into', 'then',
+    'it', 'me', 'my', 'some', 'all', 'any', 'near', 'nearest', 'bot',
+    'mine', 'craft', 'make', 'place', 'put', 'get', 'collect', 'gather', 'go', 'move', 'use', 'drop', 'kill',
+}
+
+
+def estimate_tokens(text):
+    """Token count of a prompt fragment (tiktoken when installed, ~4 chars/token otherwise)."""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def normalize_name(name):
+    return re.sub(r'[\s\-]+', '_', name.strip().lower())
+
+
+def _trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def singularize(word):
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'xes', 'sses')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+class BlockCatalog:
+    """Local index over Minecraft block/item names with exact, prefix and trigram lookups.
+
+    Used to put only the names relevant to a command into the LLM prompts instead of the
+    full ~1,200-name list.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self._name_set = set(self.names)
+        self._by_word = defaultdict(set)
+        self._by_trigram = defaultdict(set)
+        for name in self.names:
+            for word in name.split('_'):
+                self._by_word[word].add(name)
+            for gram in _trigrams(name):
+                self._by_trigram[gram].add(name)
+        self.full_listing_tokens = estimate_tokens('\n'.join(self.names))
+        self.calls = 0
+        self.tokens_saved = 0
+
+    @classmethod
+    def from_minecraft_data(cls, version=None):
+        return cls(minecraft_data.block_names(version) + minecraft_data.item_names(version))
+
+    def exact(self, name):
+        name = normalize_name(name)
+        return name if name in self._name_set else None
+
+    def prefix(self, prefix, limit=None):
+        prefix = normalize_name(prefix)
+        matches = [name for name in self.names if name.startswith(prefix)]
+        return matches[:limit] if limit else matches
+
+    def fuzzy(self, query, limit=5, threshold=0.35):
+        """Names ranked by trigram (Jaccard) similarity to ``query``; tolerant of typos."""
+        query = normalize_name(query)
+        grams = _trigrams(query)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for name in self._by_trigram.get(gram, ()):
+                overlap[name] += 1
+        scored = []
+        for name, shared in overlap.items():
+            score = shared / (len(grams) + len(_trigrams(name)) - shared)
+            if score >= threshold:
+                scored.append((score, name))
+        scored.sort(key=lambda pair: (-pair[0], len(pair[1]), pair[1]))
+        return [name for _, name in scored[:limit]]
+
+    def nearest(self, name):
+        """The exact name if it exists, otherwise the closest fuzzy match (or None)."""
+        return self.exact(name) or next(iter(self.fuzzy(name, limit=1)), None)
+
+    def relevant(self, command, state_data=None, limit=80):
+        """Names relevant to a command and the bot's state, most specific first."""
+        words = [singularize(w) for w in re.findall(r'[a-z]+', command.lower())]
+        keywords = [w for w in words if len(w) >= 3 and w not in STOP_WORDS]
+        picked = []
+
+        def add(names):
+            for name in names:
+                if name not in picked:
+                    picked.append(name)
+
+        # Multi-word phrases first ("iron ore" -> iron_ore), longest match wins
+        for size in (3, 2, 1):
+            for i in range(len(words) - size + 1):
+                phrase = '_'.join(words[i:i + size])
+                if phrase in self._name_set:
+                    add([phrase])
+        for word in keywords:
+            add(sorted(self._by_word.get(word, ()), key=len)[:12])
+            add(self.prefix(word, limit=6))
+            add(self.fuzzy(word, limit=3, threshold=0.5))
+        for item in (state_data or {}).get('inventory', []):
+            add([item['name']])
+        add(name for name in CORE_NAMES if name in self._name_set)
+        return picked[:limit]
+
+    def render(self, prompt, command, state_data=None, placeholder=BLOCK_NAMES_PLACEHOLDER):
+        """Fills a prompt's block-name placeholder with the names relevant to this call."""
+        names = self.relevant(command, state_data)
+        listing = '\n'.join(names)
+        saved = self.full_listing_tokens - estimate_tokens(listing)
+        self.calls += 1
+        self.tokens_saved += saved
+        print(f"Block catalog: {len(names)} of {len(self.names)} names in prompt, ~{saved} tokens saved "
+              f"(~{self.tokens_saved} over {self.calls} calls)")
+        return prompt.replace(placeholder, listing)
+
+
+_default_catalog = None
+
+
+def default_catalog():
+    """Process-wide catalog built lazily from minecraft-data."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = BlockCatalog.from_minecraft_data()
+    return _default_catalog
@@ -4,32 +4,109 @@ import dotenv
 import os
 from llm.utils import extract_json_from_string
 from llm.prompts import compiler_prompt
+from llm.block_catalog import default_catalog
+from llm.response_cache import cache_key, default_cache
+from llm.instruction_validator import validate_instruction, validate_instructions
+from llm.streaming import IncrementalJSONParser
+import tracing
 
 dotenv.load_dotenv()
 client = OpenAI()
 
-def translate_command_to_instructions(user_command, state_data):
-    # Message
-    messages = [
-        {"role": "system", "content": compiler_prompt+str(state_data)},
+def _messages(user_command, state_data):
+    return [
+        {"role": "system", "content": default_catalog().render(compiler_prompt, user_command, state_data) + str(state_data)},
         {"role": "user", "content": user_command}
     ]
+
+def forget_instructions(user_command, state_data):
+    """Evicts the cached instructions for a sub-task whose run failed, so the next compile asks the model again."""
+    default_cache().invalidate(cache_key('compile', user_command, state_data, os.getenv("OPENAI_MODEL")))
+
+def translate_command_to_instructions(user_command, state_data):
+    model = os.getenv("OPENAI_MODEL")
+    # Reuse the instructions from an earlier call with the same sub-task and a near-identical state
+    key = cache_key('compile', user_command, state_data, model)
+    cached = default_cache().get(key)
+    if cached is not None:
+        print(f"Instructions served from cache (hit rate {default_cache().hit_rate:.0%}).")
+        return cached
+
     # Call the OpenAI API
-    response = client.chat.completions.create(
-        model=os.getenv("OPENAI_MODEL"),
-        messages=messages,
-        max_tokens=400,
-        temperature=0.7,
-        response_format={"type": "json_object"},
-    )
+    with tracing.span('llm.compile', model=model) as llm_span:
+        response = client.chat.completions.create(
+            model=model,
+            messages=_messages(user_command, state_data),
+            max_tokens=400,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+        )
+        tracing.record_usage(llm_span, response.usage)
 
     # Get the assistant's reply
     
-    assistant_reply = json.loads(response.choices[0].message.content)
-    # Attempt to parse the reply as JSON
     try:
-        instructions = (assistant_reply)['instructions']
-        return instructions
+        assistant_reply = json.loads(response.choices[0].message.content)
     except json.JSONDecodeError:
         print("Failed to parse the assistant's reply as JSON.")
-        return None
\ No newline at end of file
+        return None
+
+    # Check the reply against the bot's method table and repair it locally; only what
+    # cannot be repaired costs another LLM call
+    result = validate_instructions(assistant_reply, state_data)
+    if result.repairs:
+        print("Repaired instructions locally: " + "; ".join(result.repairs))
+    if not result.ok:
+        print("Instructions failed validation: " + "; ".join(result.errors))
+        return None
+    default_cache().put(key, result.instructions)
+    return result.instructions
+def stream_instructions(user_command, state_data):
+    """Yields each compiled instruction as soon as the model has finished writing it.
+
+    Instructions are validated and repaired one at a time; one that cannot be repaired
+    raises ValueError, so the caller can stop dispatching and fall back to a full retry.
+    """
+    model = os.getenv("OPENAI_MODEL")
+    key = cache_key('compile', user_command, state_data, model)
+    cached = default_cache().get(key)
+    if cached is not None:
+        print(f"Instructions served from cache (hit rate {default_cache().hit_rate:.0%}).")
+        yield from cached
+        return
+
+    # Not made current: the consumer acts on each element while the reply is still streaming
+    llm_span = tracing.start_span('llm.compile', model=model, streaming=True)
+    try:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=_messages(user_command, state_data),
+            max_tokens=400,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parser = IncrementalJSONParser('instructions')
+        instructions = []
+        for chunk in stream:
+            tracing.record_usage(llm_span, chunk.usage)
+            if not chunk.choices:
+                continue
+            for element in parser.feed(chunk.choices[0].delta.content or ''):
+                instruction, repairs, errors = validate_instruction(element, state_data)
+                if repairs:
+                    print("Repaired instruction locally: " + "; ".join(repairs))
+                if errors:
+                    raise ValueError("Streamed instruction failed validation: " + "; ".join(errors))
+                instructions.append(instruction)
+                yield instruction
+    except Exception as e:
+        llm_span.fail(e)
+        raise
+    finally:
+        llm_span.end()
+
+    if not instructions:
+        raise ValueError("No instructions in the streamed reply.")
+    default_cache().put(key, instructions)
@@ -0,0 +1,295 @@
+"""Instruction templates learned from sub-tasks that compiled and executed cleanly.
+
+"mine 5 iron ore" teaches a template that later compiles "mine 12 coal ore" without an LLM
+call. Templates are kept in ``INSTRUCTION_TEMPLATES_PATH``; what becomes a slot and what is
+never learned is described on InstructionTemplate.
+"""
+import atexit
+import json
+import os
+import re
+import threading
+from collections import Counter
+from bot.bot import PARAMETER_CHOICES
+from llm.block_catalog import default_catalog, singularize
+from llm.response_cache import normalize_command
+
+DEFAULT_PATH = os.getenv('INSTRUCTION_TEMPLATES_PATH', 'instruction_templates.json')
+COORDINATES = ('x', 'y', 'z')
+# Methods whose coordinates name a block the compiler looked up in the world
+LOOKUP_METHODS = ('mine_block', 'use_block')
+_TOKEN = re.compile(r"-?\d+|[a-z_]+|[^\sa-z_\d]")
+
+
+def _item_name(phrase):
+    """Block/item name for a phrase from a task ("iron ores" -> iron_ore), or None."""
+    catalog = default_catalog()
+    words = phrase.split()
+    return catalog.exact('_'.join(words)) or catalog.exact('_'.join(words[:-1] + [singularize(words[-1])]))
+
+
+def _tokenize(task):
+    """Task tokens with block/item names and integers replaced by slots.
+
+    Returns (tokens, slots) where slot tokens look like ``{item0}``/``{num0}`` and
+    ``slots`` maps each slot to the value it had in this task.
+    """
+    raw = _TOKEN.findall(normalize_command(task))
+    tokens, slots = [], {}
+    i = 0
+    while i < len(raw):
+        if re.fullmatch(r'-?\d+', raw[i]):
+            slot = f'num{sum(s.startswith("num") for s in slots)}'
+            slots[slot] = int(raw[i])
+            tokens.append(f'{{{slot}}}')
+            i += 1
+            continue
+        # Longest run of words that names a block or item
+        for size in (4, 3, 2, 1):
+            words = raw[i:i + size]
+            if len(words) == size and all(re.fullmatch(r'[a-z_]+', w) for w in words):
+                name = _item_name(' '.join(words))
+                if name:
+                    slot = f'item{sum(s.startswith("item") for s in slots)}'
+                    slots[slot] = name
+                    tokens.append(f'{{{slot}}}')
+                    i += size
+                    break
+        else:
+            tokens.append(raw[i])
+            i += 1
+    return tokens, slots
+
+
+def _pattern(tokens):
+    parts = []
+    for token in tokens:
+        slot = re.fullmatch(r'\{(\w+)\}', token)
+        if slot and slot.group(1).startswith('num'):
+            parts.append(rf'(?P<{slot.group(1)}>-?\d+)')
+        elif slot:
+            parts.append(rf'(?P<{slot.group(1)}>[a-z_]+(?:\s+[a-z_]+){{0,3}}?)')
+        else:
+            parts.append(re.escape(token))
+    return r'\s*'.join(parts)
+
+
+class InstructionTemplate:
+    """A compiled instruction list with slots for the task's names and numbers.
+
+    Parameter values are stored either literally, as ``{"$slot": name}`` for a value
+    taken from the task, or as ``{"$pos": axis, "offset": n}`` for a coordinate
+    relative to the bot's position when the task was compiled. Consecutive identical
+    steps are stored once with a ``repeat`` count, which may itself be a slot
+    ("drop {num0} {item0}") when the step has no coordinates. Numbers become slots only on
+    steps that name the task's item.
+
+    Blocks found by a world lookup are not learned: their offset from the bot only held
+    where the task was first compiled.
+    """
+
+    def __init__(self, key, pattern, steps, pinned, uses=0):
+        self.key = key
+        self.pattern = pattern
+        self.steps = steps
+        self.pinned = pinned
+        self.uses = uses
+        self._regex = re.compile(pattern)
+
+    @classmethod
+    def learn(cls, task, instructions, state_data):
+        """A template for ``task``, or None when its instructions target looked-up blocks."""
+        tokens, slots = _tokenize(task)
+        position = (state_data or {}).get('position') or {}
+        numbers = [slot for slot in slots if slot.startswith('num')]
+        items = [slot for slot in slots if slot.startswith('item')]
+        used, has_literal_names = set(), False
+
+        def abstract_name(value):
+            nonlocal has_literal_names
+            for slot in items:
+                if value.lower() == slots[slot]:
+                    used.add(slot)
+                    return {'$slot': slot}
+            has_literal_names = True
+            return value
+
+        def abstract_number(value):
+            for slot in numbers:
+                if value == slots[slot]:
+                    used.add(slot)
+                    return {'$slot': slot}
+            return value
+
+        def names_task_item(params):
+            return any(isinstance(value, dict) and value.get('$slot') in items for value in params.values())
+
+        abstract = []
+        for instruction in instructions:
+            params = dict(instruction.get('parameters', {}))
+            coordinates = [params.get(axis) for axis in COORDINATES]
+            triple = None
+            if all(isinstance(c, (int, float)) for c in coordinates):
+                # Coordinates spelled out in the task bind to its numbers; anything else is
+                # relative to where the bot stood.
+                for i in range(len(numbers) - 2):
+                    if [slots[s] for s in numbers[i:i + 3]] == coordinates:
+                        triple = numbers[i:i + 3]
+                        used.update(triple)
+                        break
+                # A block the task names rather than places (mining it, using it, walking
+                # to it) was found in the world, and will be somewhere else next time.
+                method = instruction['method']
+                if not triple and (method in LOOKUP_METHODS or (method == 'travel_to' and items)):
+                    return None
+                for n, axis in enumerate(COORDINATES):
+                    params[axis] = ({'$slot': triple[n]} if triple else
+                                    {'$pos': axis, 'offset': coordinates[n] - int(position.get(axis, 0))})
+            for key, value in params.items():
+                if key not in COORDINATES and key not in PARAMETER_CHOICES and isinstance(value, str):
+                    params[key] = abstract_name(value)
+            # A number follows the task's only on a step about the task's item: "craft 8 sticks"
+            # crafts 8 sticks, but not 8 of the planks before them
+            if names_task_item(params):
+                for key, value in params.items():
+                    if key not in COORDINATES and isinstance(value, (int, float)) and not isinstance(value, bool):
+                        params[key] = abstract_number(value)
+            abstract.append({'method': instruction['method'], 'parameters': params})
+
+        steps = []
+        for step in abstract:
+            if steps and steps[-1]['instruction'] == step:
+                steps[-1]['repeat'] += 1
+            else:
+                steps.append({'instruction': step, 'repeat': 1})
+        for step in steps:
+            # Repeating a step at fixed coordinates acts on the same spot, so only steps
+            # without them scale with a number in the task.
+            params = step['instruction']['parameters']
+            if any(axis in params for axis in COORDINATES) or not names_task_item(params):
+                continue
+            count = step['repeat']
+            slot = next((s for s in numbers if count > 1 and slots[s] == count and s not in used), None)
+            if slot:
+                used.add(slot)
+                step['repeat'] = {'$slot': slot}
+
+        # Slots the instructions don't depend on only match their original value, and so
+        # does every slot of a chain with hard-coded names (a recipe chain), whose
+        # intermediate steps are sized for the original task.
+        pinned = {slot: value for slot, value in slots.items() if slot not in used or has_literal_names}
+        pattern = _pattern(tokens)
+        key = json.dumps([pattern, pinned], sort_keys=True)
+        return cls(key, pattern, steps, pinned)
+
+    def match(self, task):
+        """Slot values for ``task`` if it fits this template, otherwise None."""
+        found = self._regex.fullmatch(normalize_command(task))
+        if not found:
+            return None
+        slots = {}
+        for slot, text in found.groupdict().items():
+            value = int(text) if slot.startswith('num') else _item_name(text)
+            if value is None or self.pinned.get(slot, value) != value:
+                return None
+            slots[slot] = value
+        return slots
+
+    def fill(self, slots, state_data):
+        position = (state_data or {}).get('position') or {}
+
+        def resolve(value):
+            if isinstance(value, dict) and '$slot' in value:
+                return slots[value['$slot']]
+            if isinstance(value, dict) and '$pos' in value:
+                return int(position.get(value['$pos'], 0)) + value['offset']
+            return value
+
+        instructions = []
+        for step in self.steps:
+            instruction = step['instruction']
+            params = {key: resolve(value) for key, value in instruction['parameters'].items()}
+            for _ in range(resolve(step['repeat'])):
+                instructions.append({'method': instruction['method'], 'parameters': dict(params)})
+        return instructions
+
+    def to_json(self):
+        return {'pattern': self.pattern, 'steps': self.steps, 'pinned': self.pinned, 'uses': self.uses}
+
+
+class TemplateLibrary:
+    """Templates learned from sub-tasks that compiled and executed cleanly, persisted as JSON.
+
+    The file is written when a template is learned; use counts bumped by hits in between
+    are written then or by ``save`` (at exit for the default library).
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.templates = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._unsaved = False
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for entry in json.load(f):
+                    template = InstructionTemplate(
+                        json.dumps([entry['pattern'], entry['pinned']], sort_keys=True),
+                        entry['pattern'], entry['steps'], entry['pinned'], entry.get('uses', 0))
+                    self.templates[template.key] = template
+
+    def compile(self, task, state_data):
+        """Instructions for ``task`` filled in from a matching template, or None."""
+        with self._lock:
+            # Most specific first: pinned templates, then the most used
+            candidates = sorted(self.templates.values(), key=lambda t: (-len(t.pinned), -t.uses))
+            for template in candidates:
+                slots = template.match(task)
+                if slots is not None:
+                    template.uses += 1
+                    self.counters['hits'] += 1
+                    self._unsaved = True
+                    return template.fill(slots, state_data)
+            self.counters['misses'] += 1
+            return None
+
+    def learn(self, task, instructions, state_data):
+        with self._lock:
+            try:
+                template = InstructionTemplate.learn(task, instructions, state_data)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Could not learn a template from '{task}': {e}")
+                return None
+            if template is None:
+                self.counters['not_learned'] += 1
+                return None
+            if template.key not in self.templates:
+                self.templates[template.key] = template
+                self.counters['learned'] += 1
+                self._save()
+            return template
+
+    def save(self):
+        """Writes use counts that changed since the last write."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _save(self):
+        self._unsaved = False
+        if not self.path:
+            return
+        with open(self.path, 'w') as f:
+            json.dump([t.to_json() for t in self.templates.values()], f, indent=2)
+
+
+_default_library = None
+
+
+def default_library():
+    """Process-wide template library; set INSTRUCTION_TEMPLATES_PATH to '' to keep it in memory."""
+    global _default_library
+    if _default_library is None:
+        _default_library = TemplateLibrary(DEFAULT_PATH or None)
+        atexit.register(_default_library.save)
+    return _default_library
@@ -0,0 +1,264 @@
+"""Checks LLM replies against the wrapper's method table and repairs common mistakes locally.
+
+Method and key aliases, numeric coercion, a missing ``y`` and misspelled block, item or
+entity names (matched to the nearest minecraft-data name) are fixed in place; only replies
+beyond repair cost another LLM call.
+"""
+import difflib
+import re
+from collections import Counter
+from bot.bot import INSTRUCTION_METHODS, OPTIONAL_PARAMETERS, PARAMETER_CHOICES, PARAMETER_TYPES
+from llm import minecraft_data
+from llm.block_catalog import BlockCatalog
+
+# Method names the model tends to use instead of the real ones.
+METHOD_ALIASES = {
+    'travel': 'travel_to', 'move_to': 'travel_to', 'go_to': 'travel_to', 'goto': 'travel_to', 'walk_to': 'travel_to',
+    'mine': 'mine_block', 'dig': 'mine_block', 'dig_block': 'mine_block', 'break_block': 'mine_block',
+    'craft': 'craft_item',
+    'use': 'use_block', 'activate_block': 'use_block', 'interact': 'use_block',
+    'drop': 'drop_item', 'toss_item': 'drop_item',
+    'place': 'place_block',
+    'collect': 'mine_resource', 'gather': 'mine_resource', 'gather_resource': 'mine_resource',
+    'kill': 'kill_entity', 'attack': 'kill_entity', 'attack_entity': 'kill_entity',
+}
+
+# Parameter names the model tends to use instead of the real ones.
+PARAMETER_ALIASES = {
+    'item': 'item_name', 'itemname': 'item_name', 'name': 'item_name',
+    'block': 'block_name', 'blockname': 'block_name', 'block_type': 'block_name', 'resource': 'block_name',
+    'entity': 'entity_type', 'entitytype': 'entity_type', 'mob': 'entity_type', 'target': 'entity_type',
+    'maxdistance': 'max_distance', 'distance': 'max_distance', 'range': 'max_distance',
+    'amount': 'count', 'quantity': 'count', 'number': 'count',
+}
+# When a method wants one of these but got another, the value is still usable.
+NAME_PARAMETERS = ('item_name', 'block_name', 'entity_type')
+
+stats = Counter()
+
+_catalogs = {}
+
+
+def _catalog(kind):
+    """Separate name indexes for blocks, items and entities so repairs stay within the right namespace."""
+    if kind not in _catalogs:
+        names = {
+            'block_name': minecraft_data.block_names,
+            'item_name': minecraft_data.item_names,
+            'entity_type': minecraft_data.entity_names,
+        }[kind]()
+        _catalogs[kind] = BlockCatalog(names)
+    return _catalogs[kind]
+
+
+def _snake_case(name):
+    return re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', str(name)).replace('-', '_').replace(' ', '_').lower()
+
+
+class ValidationResult:
+    def __init__(self, instructions, repairs, errors):
+        self.instructions = instructions
+        self.repairs = repairs
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def _resolve_method(method):
+    method = _snake_case(method)
+    if method in INSTRUCTION_METHODS:
+        return method
+    if method in METHOD_ALIASES:
+        return METHOD_ALIASES[method]
+    close = difflib.get_close_matches(method, INSTRUCTION_METHODS, n=1, cutoff=0.75)
+    return close[0] if close else None
+
+
+def _coerce_int(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(round(value))
+    try:
+        return int(round(float(str(value).strip())))
+    except ValueError:
+        return None
+
+
+def validate_instruction(instruction, state_data=None):
+    """Checks one instruction against the wrapper's method table and repairs what it can.
+
+    Returns (instruction, repairs, errors); the instruction is None if it is beyond repair.
+    """
+    repairs, errors = [], []
+    if not isinstance(instruction, dict):
+        return None, repairs, [f"instruction is not an object: {instruction!r}"]
+
+    raw_method = instruction.get('method', instruction.get('action', instruction.get('name')))
+    method = _resolve_method(raw_method) if raw_method else None
+    if method is None:
+        return None, repairs, [f"unknown method {raw_method!r}"]
+    if method != raw_method:
+        repairs.append(f"method {raw_method!r} -> {method!r}")
+
+    params = instruction.get('parameters', instruction.get('params', instruction.get('arguments')))
+    if params is None:
+        # Parameters written next to "method" instead of nested under "parameters"
+        params = {k: v for k, v in instruction.items() if k not in ('method', 'action', 'name')}
+        if params:
+            repairs.append('parameters moved under "parameters"')
+    if not isinstance(params, dict):
+        return None, repairs, [f"{method}: parameters are not an object"]
+
+    expected = INSTRUCTION_METHODS[method]
+    fixed = {}
+    for key, value in params.items():
+        name = _snake_case(key)
+        name = PARAMETER_ALIASES.get(name.replace('_', ''), PARAMETER_ALIASES.get(name, name))
+        if name not in expected and name in NAME_PARAMETERS:
+            name = next((p for p in expected if p in NAME_PARAMETERS), name)
+        if name in ('position', 'pos', 'coordinates', 'coords') and 'x' in expected:
+            # {"position": {"x": .., "y": .., "z": ..}} or [x, y, z]
+            values = value if isinstance(value, (list, tuple)) else [value.get(a) for a in 'xyz'] if isinstance(value, dict) else []
+            for axis, axis_value in zip('xyz', values):
+                fixed.setdefault(axis, axis_value)
+            repairs.append(f"{method}: expanded {key!r} into x/y/z")
+            continue
+        if name not in expected:
+            repairs.append(f"{method}: dropped unknown parameter {key!r}")
+            continue
+        if name != key:
+            repairs.append(f"{method}: parameter {key!r} -> {name!r}")
+        fixed[name] = value
+
+    position = (state_data or {}).get('position') or {}
+    for name in expected:
+        if name not in fixed:
+            if name in OPTIONAL_PARAMETERS:
+                continue
+            if name == 'y' and 'x' in fixed and 'z' in fixed and 'y' in position:
+                fixed['y'] = position['y']
+                repairs.append(f"{method}: missing 'y' filled with the bot's current y ({position['y']})")
+                continue
+            errors.append(f"{method}: missing required parameter {name!r}")
+            continue
+
+        value = fixed[name]
+        if PARAMETER_TYPES[name] is int:
+            number = _coerce_int(value)
+            if number is None:
+                errors.append(f"{method}: {name}={value!r} is not a number")
+            elif number != value or not isinstance(value, int):
+                fixed[name] = number
+                repairs.append(f"{method}: {name}={value!r} -> {number}")
+        elif name in PARAMETER_CHOICES:
+            choice = str(value).strip().lower()
+            if choice not in PARAMETER_CHOICES[name]:
+                # An optional switch the model got wrong is not worth a retry
+                choice = OPTIONAL_PARAMETERS[name]
+            if choice != value:
+                fixed[name] = choice
+                repairs.append(f"{method}: {name}={value!r} -> {choice!r}")
+        elif not isinstance(value, str) or not value.strip():
+            errors.append(f"{method}: {name}={value!r} is not a name")
+        else:
+            resolved = _catalog(name).nearest(value)
+            if resolved is None:
+                errors.append(f"{method}: unknown {name.replace('_', ' ')} {value!r}")
+            elif resolved != value:
+                fixed[name] = resolved
+                repairs.append(f"{method}: {name} {value!r} -> {resolved!r}")
+
+    if errors:
+        return None, repairs, errors
+    return {'method': method, 'parameters': fixed}, repairs, errors
+
+
+def validate_instructions(reply, state_data=None):
+    """Validates a compiler reply (``{"instructions": [...]}`` or a bare list) and repairs it locally.
+
+    Only replies with errors that cannot be repaired need another LLM call; every reply
+    that needed repairs and came out clean is counted as an avoided call.
+    """
+    stats['validated'] += 1
+    repairs, errors = [], []
+    instructions = reply
+    if isinstance(reply, dict):
+        instructions = reply.get('instructions')
+        if instructions is None:
+            lists = [value for value in reply.values() if isinstance(value, list)]
+            if len(lists) == 1:
+                instructions = lists[0]
+                repairs.append('instruction list found under a different key')
+            elif 'method' in reply:
+                instructions = [reply]
+                repairs.append('single instruction wrapped in a list')
+    if not isinstance(instructions, list):
+        stats['unrepairable'] += 1
+        return ValidationResult(None, repairs, ['no instruction list in reply'])
+
+    fixed = []
+    for index, instruction in enumerate(instructions):
+        result, step_repairs, step_errors = validate_instruction(instruction, state_data)
+        repairs.extend(f"[{index}] {r}" for r in step_repairs)
+        errors.extend(f"[{index}] {e}" for e in step_errors)
+        fixed.append(result)
+
+    if errors:
+        stats['unrepairable'] += 1
+        return ValidationResult(None, repairs, errors)
+    if repairs:
+        stats['repaired'] += 1
+        stats['llm_calls_avoided'] += 1
+    return ValidationResult(fixed, repairs, errors)
+
+
+def validate_task(task):
+    """Normalizes one plan entry to ``{"task": str}``; returns (task, repairs, errors)."""
+    if isinstance(task, str) and task.strip():
+        return {'task': task.strip()}, ['bare string wrapped as a task'], []
+    if isinstance(task, dict):
+        text = task.get('task') or task.get('description') or task.get('step')
+        if not isinstance(text, str) or not text.strip():
+            return None, [], ['task has no text']
+        repairs = [] if 'task' in task else ['task text taken from another key']
+        return {'task': text.strip()}, repairs, []
+    return None, [], ['task is not an object']
+
+
+def validate_plan(reply):
+    """Validates a planner reply into ``{"tasks": [{"task": str}, ...]}``, repairing common shapes."""
+    stats['validated'] += 1
+    repairs = []
+    tasks = reply
+    if isinstance(reply, dict):
+        tasks = reply.get('tasks')
+        if tasks is None:
+            lists = [value for value in reply.values() if isinstance(value, list)]
+            if len(lists) == 1:
+                tasks = lists[0]
+                repairs.append('task list found under a different key')
+            elif isinstance(reply.get('task'), str):
+                tasks = [reply]
+                repairs.append('single task wrapped in a list')
+    if not isinstance(tasks, list) or not tasks:
+        stats['unrepairable'] += 1
+        return ValidationResult(None, repairs, ['no task list in reply'])
+
+    fixed, errors = [], []
+    for index, task in enumerate(tasks):
+        result, task_repairs, task_errors = validate_task(task)
+        repairs.extend(f"[{index}] {r}" for r in task_repairs)
+        errors.extend(f"[{index}] {e}" for e in task_errors)
+        if result is not None:
+            fixed.append(result)
+
+    if errors:
+        stats['unrepairable'] += 1
+        return ValidationResult(None, repairs, errors)
+    if repairs:
+        stats['repaired'] += 1
+        stats['llm_calls_avoided'] += 1
+    return ValidationResult({'tasks': fixed}, repairs, errors)
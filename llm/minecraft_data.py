@@ -0,0 +1,96 @@
+import json
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+# The minecraft-data package the Node bot already depends on; its JSON is the source of truth
+# for block, item and recipe names on the Python side too.
+DATA_ROOT = os.getenv(
+    'MINECRAFT_DATA_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'bot', 'node_modules', 'minecraft-data', 'minecraft-data', 'data'),
+)
+DEFAULT_VERSION = os.getenv('MINECRAFT_VERSION', '1.19.4')
+
+# A crafting recipe: how many items one craft yields, {ingredient name: count} per craft,
+# and whether it needs a crafting table (anything larger than the 2x2 inventory grid).
+Recipe = namedtuple('Recipe', 'count ingredients needs_table')
+
+
+@lru_cache(maxsize=None)
+def load(kind, version=None):
+    """Loads one minecraft-data file (e.g. 'blocks', 'items', 'recipes') for a PC version."""
+    version = version or DEFAULT_VERSION
+    with open(os.path.join(DATA_ROOT, 'dataPaths.json')) as f:
+        data_paths = json.load(f)
+    try:
+        relative = data_paths['pc'][version][kind]
+    except KeyError:
+        raise ValueError(f"minecraft-data has no '{kind}' data for version {version}")
+    with open(os.path.join(DATA_ROOT, relative, f'{kind}.json')) as f:
+        return json.load(f)
+
+
+def block_names(version=None):
+    return [block['name'] for block in load('blocks', version)]
+
+
+def item_names(version=None):
+    return [item['name'] for item in load('items', version)]
+
+
+def entity_names(version=None):
+    return [entity['name'] for entity in load('entities', version)]
+
+
+@lru_cache(maxsize=None)
+def _names_by_id(kind, version=None):
+    return {entry['id']: entry['name'] for entry in load(kind, version)}
+
+
+def block_drop(block_name, version=None):
+    """Name of the item a block drops when mined (stone -> cobblestone), or the block's own name."""
+    for block in load('blocks', version):
+        if block['name'] == block_name:
+            drops = block.get('drops') or []
+            return _names_by_id('items', version).get(drops[0], block_name) if drops else block_name
+    return block_name
+
+
+def harvest_tools(block_name, version=None):
+    """Items that make ``block_name`` drop anything when mined (stone -> the pickaxes); empty if a hand will do."""
+    names = _names_by_id('items', version)
+    for block in load('blocks', version):
+        if block['name'] == block_name:
+            return [names[int(item_id)] for item_id in block.get('harvestTools') or {}]
+    return []
+
+
+def block_sources(item_name, version=None):
+    """Blocks that drop ``item_name`` when mined, in minecraft-data order (natural blocks first)."""
+    item_id = next((item_id for item_id, name in _names_by_id('items', version).items() if name == item_name), None)
+    return [block['name'] for block in load('blocks', version) if item_id in (block.get('drops') or [])]
+
+
+@lru_cache(maxsize=None)
+def recipes_for(item_name, version=None):
+    """Crafting recipes producing ``item_name``, as Recipe tuples without duplicate ingredient sets."""
+    names = _names_by_id('items', version)
+    item_id = next((item_id for item_id, name in names.items() if name == item_name), None)
+    recipes, seen = [], set()
+    for recipe in load('recipes', version).get(str(item_id), []):
+        shape = recipe.get('inShape')
+        cells = recipe.get('ingredients') or [cell for row in shape for cell in row]
+        ingredients = {}
+        for cell in cells:
+            if cell is not None:
+                ingredients[names[cell]] = ingredients.get(names[cell], 0) + 1
+        if shape:
+            needs_table = len(shape) > 2 or any(len(row) > 2 for row in shape)
+        else:
+            needs_table = len(cells) > 4
+        signature = (recipe['result']['count'], tuple(sorted(ingredients.items())))
+        if signature not in seen:
+            seen.add(signature)
+            recipes.append(Recipe(recipe['result']['count'], ingredients, needs_table))
+    return recipes
@@ -4,31 +4,105 @@ import dotenv
 import os
 from llm.utils import extract_json_from_string
 from llm.prompts import parser_prompt
+from llm.block_catalog import default_catalog
+from llm.response_cache import cache_key, default_cache
+from llm.instruction_validator import validate_plan, validate_task
+from llm.streaming import IncrementalJSONParser
+import tracing
 
 dotenv.load_dotenv()
 client = OpenAI()
 
-def parse_prompt(prompt, state_data):
-    # Message
-    messages = [
-        {"role": "system", "content": parser_prompt + str(state_data)},
+def _messages(prompt, state_data):
+    return [
+        {"role": "system", "content": default_catalog().render(parser_prompt, prompt, state_data) + str(state_data)},
         {"role": "user", "content": prompt}
     ]
+
+def forget_plan(prompt, state_data):
+    """Evicts the cached plan for a command whose run failed, so the next plan asks the model again."""
+    default_cache().invalidate(cache_key('parse', prompt, state_data, os.getenv("OPENAI_MODEL")))
+
+def parse_prompt(prompt, state_data):
+    model = os.getenv("OPENAI_MODEL")
+    # Reuse the plan from an earlier call with the same command and a near-identical state
+    key = cache_key('parse', prompt, state_data, model)
+    cached = default_cache().get(key)
+    if cached is not None:
+        print(f"Plan served from cache (hit rate {default_cache().hit_rate:.0%}).")
+        return cached
+
     # Call the OpenAI API
-    response = client.chat.completions.create(
-        model=os.getenv("OPENAI_MODEL"),
-        messages=messages,
-        max_tokens=400,
-        temperature=0.7,
-        response_format={"type": "json_object"},
-    )
+    with tracing.span('llm.parse', model=model) as llm_span:
+        response = client.chat.completions.create(
+            model=model,
+            messages=_messages(prompt, state_data),
+            max_tokens=400,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+        )
+        tracing.record_usage(llm_span, response.usage)
 
     # Access the content of the message
     assistant_reply_content = (response.choices[0].message.content)
     # Attempt to parse the reply as JSON
     try:
         instructions = json.loads(assistant_reply_content)
-        return instructions
     except json.JSONDecodeError:
         print("Failed to parse the assistant's reply as JSON.")
         return None
+
+    # Repair common shape mistakes locally instead of asking again
+    result = validate_plan(instructions)
+    if result.repairs:
+        print("Repaired plan locally: " + "; ".join(result.repairs))
+    if not result.ok:
+        print("Plan failed validation: " + "; ".join(result.errors))
+        return None
+    default_cache().put(key, result.instructions)
+    return result.instructions
+
+def stream_plan(prompt, state_data):
+    """Yields each sub-task (``{"task": str}``) as soon as the model has finished writing it."""
+    model = os.getenv("OPENAI_MODEL")
+    key = cache_key('parse', prompt, state_data, model)
+    cached = default_cache().get(key)
+    if cached is not None:
+        print(f"Plan served from cache (hit rate {default_cache().hit_rate:.0%}).")
+        yield from cached['tasks']
+        return
+
+    # Not made current: the consumer acts on each element while the reply is still streaming
+    llm_span = tracing.start_span('llm.parse', model=model, streaming=True)
+    try:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=_messages(prompt, state_data),
+            max_tokens=400,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        # The plan's list may come under "tasks" or another key, so take the first array
+        parser = IncrementalJSONParser()
+        tasks = []
+        for chunk in stream:
+            tracing.record_usage(llm_span, chunk.usage)
+            if not chunk.choices:
+                continue
+            for element in parser.feed(chunk.choices[0].delta.content or ''):
+                task, _, errors = validate_task(element)
+                if errors:
+                    raise ValueError("Streamed task failed validation: " + "; ".join(errors))
+                tasks.append(task)
+                yield task
+    except Exception as e:
+        llm_span.fail(e)
+        raise
+    finally:
+        llm_span.end()
+
+    if not tasks:
+        raise ValueError("No tasks in the streamed reply.")
+    default_cache().put(key, {'tasks': tasks})
@@ -1,3 +1,7 @@
+# Both prompts contain BLOCK_NAMES_PLACEHOLDER, which BlockCatalog.render() fills with the
+# names relevant to the current command (see llm/block_catalog.py).
+BLOCK_NAMES_PLACEHOLDER = "{{BLOCK_NAMES}}"
+
 parser_prompt = """
 You are an AI planning assistant for a Minecraft bot. Your goal is to generate an efficient, step-by-step plan for the bot to fulfill the user's request, considering the bot's current state and surroundings.
 
@@ -46,1159 +50,9 @@ Your Task:
       ]
 ---
 
-ALL MINECRAFT BLOCK NAMES:
-Id
-stone
-granite
-polished_granite
-diorite
-polished_diorite
-andesite
-polished_andesite
-deepslate
-cobbled_deepslate
-polished_deepslate
-calcite
-tuff
-dripstone_block
-grass_block
-dirt
-coarse_dirt
-podzol
-rooted_dirt
-mud
-crimson_nylium
-warped_nylium
-cobblestone
-oak_planks
-spruce_planks
-birch_planks
-jungle_planks
-acacia_planks
-dark_oak_planks
-mangrove_planks
-crimson_planks
-warped_planks
-oak_sapling
-spruce_sapling
-birch_sapling
-jungle_sapling
-acacia_sapling
-dark_oak_sapling
-mangrove_propagule
-sand
-red_sand
-gravel
-coal_ore
-deepslate_coal_ore
-iron_ore
-deepslate_iron_ore
-copper_ore
-deepslate_copper_ore
-gold_ore
-deepslate_gold_ore
-redstone_ore
-deepslate_redstone_ore
-emerald_ore
-deepslate_emerald_ore
-lapis_ore
-deepslate_lapis_ore
-diamond_ore
-deepslate_diamond_ore
-nether_gold_ore
-nether_quartz_ore
-ancient_debris
-coal_block
-raw_iron_block
-raw_copper_block
-raw_gold_block
-amethyst_block
-iron_block
-copper_block
-gold_block
-diamond_block
-netherite_block
-exposed_copper
-weathered_copper
-oxidized_copper
-cut_copper
-exposed_cut_copper
-weathered_cut_copper
-oxidized_cut_copper
-cut_copper_stairs
-exposed_cut_copper_stairs
-weathered_cut_copper_stairs
-oxidized_cut_copper_stairs
-cut_copper_slab
-exposed_cut_copper_slab
-weathered_cut_copper_slab
-oxidized_cut_copper_slab
-waxed_copper_block
-waxed_exposed_copper
-waxed_weathered_copper
-waxed_oxidized_copper
-waxed_cut_copper
-waxed_exposed_cut_copper
-waxed_weathered_cut_copper
-waxed_oxidized_cut_copper
-waxed_cut_copper_stairs
-waxed_exposed_cut_copper_stairs
-waxed_weathered_cut_copper_stairs
-waxed_oxidized_cut_copper_stairs
-waxed_cut_copper_slab
-waxed_exposed_cut_copper_slab
-waxed_weathered_cut_copper_slab
-waxed_oxidized_cut_copper_slab
-oak_log
-spruce_log
-birch_log
-jungle_log
-acacia_log
-dark_oak_log
-mangrove_log
-mangrove_roots
-muddy_mangrove_roots
-crimson_stem
-warped_stem
-stripped_oak_log
-stripped_spruce_log
-stripped_birch_log
-stripped_jungle_log
-stripped_acacia_log
-stripped_dark_oak_log
-stripped_mangrove_log
-stripped_crimson_stem
-stripped_warped_stem
-stripped_oak_wood
-stripped_spruce_wood
-stripped_birch_wood
-stripped_jungle_wood
-stripped_acacia_wood
-stripped_dark_oak_wood
-stripped_mangrove_wood
-stripped_crimson_hyphae
-stripped_warped_hyphae
-oak_wood
-spruce_wood
-birch_wood
-jungle_wood
-acacia_wood
-dark_oak_wood
-mangrove_wood
-crimson_hyphae
-warped_hyphae
-oak_leaves
-spruce_leaves
-birch_leaves
-jungle_leaves
-acacia_leaves
-dark_oak_leaves
-mangrove_leaves
-azalea_leaves
-flowering_azalea_leaves
-sponge
-wet_sponge
-glass
-tinted_glass
-lapis_block
-sandstone
-chiseled_sandstone
-cut_sandstone
-cobweb
-grass
-fern
-azalea
-flowering_azalea
-dead_bush
-seagrass
-sea_pickle
-white_wool
-orange_wool
-magenta_wool
-light_blue_wool
-yellow_wool
-lime_wool
-pink_wool
-gray_wool
-light_gray_wool
-cyan_wool
-purple_wool
-blue_wool
-brown_wool
-green_wool
-red_wool
-black_wool
-dandelion
-poppy
-blue_orchid
-allium
-azure_bluet
-red_tulip
-orange_tulip
-white_tulip
-pink_tulip
-oxeye_daisy
-cornflower
-lily_of_the_valley
-wither_rose
-spore_blossom
-brown_mushroom
-red_mushroom
-crimson_fungus
-warped_fungus
-crimson_roots
-warped_roots
-nether_sprouts
-weeping_vines
-twisting_vines
-sugar_cane
-kelp
-moss_carpet
-moss_block
-hanging_roots
-big_dripleaf
-small_dripleaf
-bamboo
-oak_slab
-spruce_slab
-birch_slab
-jungle_slab
-acacia_slab
-dark_oak_slab
-mangrove_slab
-crimson_slab
-warped_slab
-stone_slab
-smooth_stone_slab
-sandstone_slab
-cut_sandstone_slab
-cobblestone_slab
-brick_slab
-stone_brick_slab
-mud_brick_slab
-nether_brick_slab
-quartz_slab
-red_sandstone_slab
-cut_red_sandstone_slab
-purpur_slab
-prismarine_slab
-prismarine_brick_slab
-dark_prismarine_slab
-smooth_quartz
-smooth_red_sandstone
-smooth_sandstone
-smooth_stone
-bricks
-bookshelf
-mossy_cobblestone
-obsidian
-torch
-end_rod
-chorus_flower
-purpur_block
-purpur_pillar
-purpur_stairs
-chest
-crafting_table
-furnace
-ladder
-cobblestone_stairs
-snow
-ice
-snow_block
-cactus
-clay
-jukebox
-oak_fence
-spruce_fence
-birch_fence
-jungle_fence
-acacia_fence
-dark_oak_fence
-mangrove_fence
-crimson_fence
-warped_fence
-pumpkin
-carved_pumpkin
-jack_o_lantern
-netherrack
-soul_sand
-soul_soil
-basalt
-polished_basalt
-smooth_basalt
-soul_torch
-glowstone
-stone_bricks
-mossy_stone_bricks
-cracked_stone_bricks
-chiseled_stone_bricks
-packed_mud
-mud_bricks
-deepslate_bricks
-cracked_deepslate_bricks
-deepslate_tiles
-cracked_deepslate_tiles
-chiseled_deepslate
-brown_mushroom_block
-red_mushroom_block
-mushroom_stem
-iron_bars
-chain
-glass_pane
-melon
-vine
-glow_lichen
-brick_stairs
-stone_brick_stairs
-mud_brick_stairs
-mycelium
-lily_pad
-nether_bricks
-cracked_nether_bricks
-chiseled_nether_bricks
-nether_brick_fence
-nether_brick_stairs
-sculk
-sculk_vein
-sculk_catalyst
-sculk_shrieker
-enchanting_table
-end_stone
-end_stone_bricks
-dragon_egg
-sandstone_stairs
-ender_chest
-emerald_block
-oak_stairs
-spruce_stairs
-birch_stairs
-jungle_stairs
-acacia_stairs
-dark_oak_stairs
-mangrove_stairs
-crimson_stairs
-warped_stairs
-beacon
-cobblestone_wall
-mossy_cobblestone_wall
-brick_wall
-prismarine_wall
-red_sandstone_wall
-mossy_stone_brick_wall
-granite_wall
-stone_brick_wall
-mud_brick_wall
-nether_brick_wall
-andesite_wall
-red_nether_brick_wall
-sandstone_wall
-end_stone_brick_wall
-diorite_wall
-blackstone_wall
-polished_blackstone_wall
-polished_blackstone_brick_wall
-cobbled_deepslate_wall
-polished_deepslate_wall
-deepslate_brick_wall
-deepslate_tile_wall
-anvil
-chipped_anvil
-damaged_anvil
-chiseled_quartz_block
-quartz_block
-quartz_bricks
-quartz_pillar
-quartz_stairs
-white_terracotta
-orange_terracotta
-magenta_terracotta
-light_blue_terracotta
-yellow_terracotta
-lime_terracotta
-pink_terracotta
-gray_terracotta
-light_gray_terracotta
-cyan_terracotta
-purple_terracotta
-blue_terracotta
-brown_terracotta
-green_terracotta
-red_terracotta
-black_terracotta
-hay_block
-white_carpet
-orange_carpet
-magenta_carpet
-light_blue_carpet
-yellow_carpet
-lime_carpet
-pink_carpet
-gray_carpet
-light_gray_carpet
-cyan_carpet
-purple_carpet
-blue_carpet
-brown_carpet
-green_carpet
-red_carpet
-black_carpet
-terracotta
-packed_ice
-sunflower
-lilac
-rose_bush
-peony
-tall_grass
-large_fern
-white_stained_glass
-orange_stained_glass
-magenta_stained_glass
-light_blue_stained_glass
-yellow_stained_glass
-lime_stained_glass
-pink_stained_glass
-gray_stained_glass
-light_gray_stained_glass
-cyan_stained_glass
-purple_stained_glass
-blue_stained_glass
-brown_stained_glass
-green_stained_glass
-red_stained_glass
-black_stained_glass
-white_stained_glass_pane
-orange_stained_glass_pane
-magenta_stained_glass_pane
-light_blue_stained_glass_pane
-yellow_stained_glass_pane
-lime_stained_glass_pane
-pink_stained_glass_pane
-gray_stained_glass_pane
-light_gray_stained_glass_pane
-cyan_stained_glass_pane
-purple_stained_glass_pane
-blue_stained_glass_pane
-brown_stained_glass_pane
-green_stained_glass_pane
-red_stained_glass_pane
-black_stained_glass_pane
-prismarine
-prismarine_bricks
-dark_prismarine
-prismarine_stairs
-prismarine_brick_stairs
-dark_prismarine_stairs
-sea_lantern
-red_sandstone
-chiseled_red_sandstone
-cut_red_sandstone
-red_sandstone_stairs
-magma_block
-nether_wart_block
-warped_wart_block
-red_nether_bricks
-bone_block
-shulker_box
-white_shulker_box
-orange_shulker_box
-magenta_shulker_box
-light_blue_shulker_box
-yellow_shulker_box
-lime_shulker_box
-pink_shulker_box
-gray_shulker_box
-light_gray_shulker_box
-cyan_shulker_box
-purple_shulker_box
-blue_shulker_box
-brown_shulker_box
-green_shulker_box
-red_shulker_box
-black_shulker_box
-white_glazed_terracotta
-orange_glazed_terracotta
-magenta_glazed_terracotta
-light_blue_glazed_terracotta
-yellow_glazed_terracotta
-lime_glazed_terracotta
-pink_glazed_terracotta
-gray_glazed_terracotta
-light_gray_glazed_terracotta
-cyan_glazed_terracotta
-purple_glazed_terracotta
-blue_glazed_terracotta
-brown_glazed_terracotta
-green_glazed_terracotta
-red_glazed_terracotta
-black_glazed_terracotta
-white_concrete
-orange_concrete
-magenta_concrete
-light_blue_concrete
-yellow_concrete
-lime_concrete
-pink_concrete
-gray_concrete
-light_gray_concrete
-cyan_concrete
-purple_concrete
-blue_concrete
-brown_concrete
-green_concrete
-red_concrete
-black_concrete
-white_concrete_powder
-orange_concrete_powder
-magenta_concrete_powder
-light_blue_concrete_powder
-yellow_concrete_powder
-lime_concrete_powder
-pink_concrete_powder
-gray_concrete_powder
-light_gray_concrete_powder
-cyan_concrete_powder
-purple_concrete_powder
-blue_concrete_powder
-brown_concrete_powder
-green_concrete_powder
-red_concrete_powder
-black_concrete_powder
-turtle_egg
-dead_tube_coral_block
-dead_brain_coral_block
-dead_bubble_coral_block
-dead_fire_coral_block
-dead_horn_coral_block
-tube_coral_block
-brain_coral_block
-bubble_coral_block
-fire_coral_block
-horn_coral_block
-tube_coral
-brain_coral
-bubble_coral
-fire_coral
-horn_coral
-dead_brain_coral
-dead_bubble_coral
-dead_fire_coral
-dead_horn_coral
-dead_tube_coral
-tube_coral_fan
-brain_coral_fan
-bubble_coral_fan
-fire_coral_fan
-horn_coral_fan
-dead_tube_coral_fan
-dead_brain_coral_fan
-dead_bubble_coral_fan
-dead_fire_coral_fan
-dead_horn_coral_fan
-blue_ice
-conduit
-polished_granite_stairs
-smooth_red_sandstone_stairs
-mossy_stone_brick_stairs
-polished_diorite_stairs
-mossy_cobblestone_stairs
-end_stone_brick_stairs
-stone_stairs
-smooth_sandstone_stairs
-smooth_quartz_stairs
-granite_stairs
-andesite_stairs
-red_nether_brick_stairs
-polished_andesite_stairs
-diorite_stairs
-cobbled_deepslate_stairs
-polished_deepslate_stairs
-deepslate_brick_stairs
-deepslate_tile_stairs
-polished_granite_slab
-smooth_red_sandstone_slab
-mossy_stone_brick_slab
-polished_diorite_slab
-mossy_cobblestone_slab
-end_stone_brick_slab
-smooth_sandstone_slab
-smooth_quartz_slab
-granite_slab
-andesite_slab
-red_nether_brick_slab
-polished_andesite_slab
-diorite_slab
-cobbled_deepslate_slab
-polished_deepslate_slab
-deepslate_brick_slab
-deepslate_tile_slab
-scaffolding
-redstone
-redstone_torch
-redstone_block
-repeater
-comparator
-piston
-sticky_piston
-slime_block
-honey_block
-observer
-hopper
-dispenser
-dropper
-lectern
-target
-lever
-lightning_rod
-daylight_detector
-sculk_sensor
-tripwire_hook
-trapped_chest
-tnt
-redstone_lamp
-note_block
-stone_button
-polished_blackstone_button
-oak_button
-spruce_button
-birch_button
-jungle_button
-acacia_button
-dark_oak_button
-mangrove_button
-crimson_button
-warped_button
-stone_pressure_plate
-polished_blackstone_pressure_plate
-light_weighted_pressure_plate
-heavy_weighted_pressure_plate
-oak_pressure_plate
-spruce_pressure_plate
-birch_pressure_plate
-jungle_pressure_plate
-acacia_pressure_plate
-dark_oak_pressure_plate
-mangrove_pressure_plate
-crimson_pressure_plate
-warped_pressure_plate
-iron_door
-oak_door
-spruce_door
-birch_door
-jungle_door
-acacia_door
-dark_oak_door
-mangrove_door
-crimson_door
-warped_door
-iron_trapdoor
-oak_trapdoor
-spruce_trapdoor
-birch_trapdoor
-jungle_trapdoor
-acacia_trapdoor
-dark_oak_trapdoor
-mangrove_trapdoor
-crimson_trapdoor
-warped_trapdoor
-oak_fence_gate
-spruce_fence_gate
-birch_fence_gate
-jungle_fence_gate
-acacia_fence_gate
-dark_oak_fence_gate
-mangrove_fence_gate
-crimson_fence_gate
-warped_fence_gate
-powered_rail
-detector_rail
-rail
-activator_rail
-saddle
-minecart
-chest_minecart
-furnace_minecart
-tnt_minecart
-hopper_minecart
-carrot_on_a_stick
-warped_fungus_on_a_stick
-elytra
-oak_boat
-oak_chest_boat
-spruce_boat
-spruce_chest_boat
-birch_boat
-birch_chest_boat
-jungle_boat
-jungle_chest_boat
-acacia_boat
-acacia_chest_boat
-dark_oak_boat
-dark_oak_chest_boat
-mangrove_boat
-mangrove_chest_boat
-turtle_helmet
-scute
-flint_and_steel
-apple
-bow
-arrow
-coal
-charcoal
-diamond
-emerald
-lapis_lazuli
-quartz
-amethyst_shard
-raw_iron
-iron_ingot
-raw_copper
-copper_ingot
-raw_gold
-gold_ingot
-netherite_ingot
-netherite_scrap
-wooden_sword
-wooden_shovel
-wooden_pickaxe
-wooden_axe
-wooden_hoe
-stone_sword
-stone_shovel
-stone_pickaxe
-stone_axe
-stone_hoe
-golden_sword
-golden_shovel
-golden_pickaxe
-golden_axe
-golden_hoe
-iron_sword
-iron_shovel
-iron_pickaxe
-iron_axe
-iron_hoe
-diamond_sword
-diamond_shovel
-diamond_pickaxe
-diamond_axe
-diamond_hoe
-netherite_sword
-netherite_shovel
-netherite_pickaxe
-netherite_axe
-netherite_hoe
-stick
-bowl
-mushroom_stew
-string
-feather
-gunpowder
-wheat_seeds
-wheat
-bread
-leather_helmet
-leather_chestplate
-leather_leggings
-leather_boots
-chainmail_helmet
-chainmail_chestplate
-chainmail_leggings
-chainmail_boots
-iron_helmet
-iron_chestplate
-iron_leggings
-iron_boots
-diamond_helmet
-diamond_chestplate
-diamond_leggings
-diamond_boots
-golden_helmet
-golden_chestplate
-golden_leggings
-golden_boots
-netherite_helmet
-netherite_chestplate
-netherite_leggings
-netherite_boots
-flint
-porkchop
-cooked_porkchop
-painting
-golden_apple
-enchanted_golden_apple
-oak_sign
-spruce_sign
-birch_sign
-jungle_sign
-acacia_sign
-dark_oak_sign
-mangrove_sign
-crimson_sign
-warped_sign
-bucket
-water_bucket
-lava_bucket
-powder_snow_bucket
-snowball
-leather
-milk_bucket
-pufferfish_bucket
-salmon_bucket
-cod_bucket
-tropical_fish_bucket
-axolotl_bucket
-tadpole_bucket
-brick
-clay_ball
-dried_kelp_block
-paper
-book
-slime_ball
-egg
-compass
-recovery_compass
-fishing_rod
-clock
-spyglass
-glowstone_dust
-cod
-salmon
-tropical_fish
-pufferfish
-cooked_cod
-cooked_salmon
-ink_sac
-glow_ink_sac
-cocoa_beans
-white_dye
-orange_dye
-magenta_dye
-light_blue_dye
-yellow_dye
-lime_dye
-pink_dye
-gray_dye
-light_gray_dye
-cyan_dye
-purple_dye
-blue_dye
-brown_dye
-green_dye
-red_dye
-black_dye
-bone_meal
-bone
-sugar
-cake
-white_bed
-orange_bed
-magenta_bed
-light_blue_bed
-yellow_bed
-lime_bed
-pink_bed
-gray_bed
-light_gray_bed
-cyan_bed
-purple_bed
-blue_bed
-brown_bed
-green_bed
-red_bed
-black_bed
-cookie
-filled_map
-shears
-melon_slice
-dried_kelp
-pumpkin_seeds
-melon_seeds
-beef
-cooked_beef
-chicken
-cooked_chicken
-rotten_flesh
-ender_pearl
-blaze_rod
-ghast_tear
-gold_nugget
-nether_wart
-potion
-glass_bottle
-spider_eye
-fermented_spider_eye
-blaze_powder
-magma_cream
-brewing_stand
-cauldron
-ender_eye
-glistering_melon_slice
-experience_bottle
-fire_charge
-writable_book
-written_book
-item_frame
-glow_item_frame
-flower_pot
-carrot
-potato
-baked_potato
-poisonous_potato
-map
-golden_carrot
-skeleton_skull
-wither_skeleton_skull
-zombie_head
-creeper_head
-dragon_head
-nether_star
-pumpkin_pie
-firework_rocket
-firework_star
-enchanted_book
-nether_brick
-prismarine_shard
-prismarine_crystals
-rabbit
-cooked_rabbit
-rabbit_stew
-rabbit_foot
-rabbit_hide
-armor_stand
-iron_horse_armor
-golden_horse_armor
-diamond_horse_armor
-leather_horse_armor
-lead
-name_tag
-mutton
-cooked_mutton
-white_banner
-orange_banner
-magenta_banner
-light_blue_banner
-yellow_banner
-lime_banner
-pink_banner
-gray_banner
-light_gray_banner
-cyan_banner
-purple_banner
-blue_banner
-brown_banner
-green_banner
-red_banner
-black_banner
-end_crystal
-chorus_fruit
-popped_chorus_fruit
-beetroot
-beetroot_seeds
-beetroot_soup
-dragon_breath
-splash_potion
-spectral_arrow
-tipped_arrow
-lingering_potion
-shield
-totem_of_undying
-shulker_shell
-iron_nugget
-music_disc_13
-music_disc_cat
-music_disc_blocks
-music_disc_chirp
-music_disc_far
-music_disc_mall
-music_disc_mellohi
-music_disc_stal
-music_disc_strad
-music_disc_ward
-music_disc_11
-music_disc_wait
-music_disc_otherside
-music_disc_5
-music_disc_pigstep
-disc_fragment_5
-trident
-phantom_membrane
-nautilus_shell
-heart_of_the_sea
-crossbow
-suspicious_stew
-loom
-flower_banner_pattern
-creeper_banner_pattern
-skull_banner_pattern
-mojang_banner_pattern
-globe_banner_pattern
-piglin_banner_pattern
-goat_horn
-composter
-barrel
-smoker
-blast_furnace
-cartography_table
-fletching_table
-grindstone
-smithing_table
-stonecutter
-bell
-lantern
-soul_lantern
-sweet_berries
-glow_berries
-campfire
-soul_campfire
-shroomlight
-honeycomb
-bee_nest
-beehive
-honey_bottle
-honeycomb_block
-lodestone
-crying_obsidian
-blackstone
-blackstone_slab
-blackstone_stairs
-gilded_blackstone
-polished_blackstone
-polished_blackstone_slab
-polished_blackstone_stairs
-chiseled_polished_blackstone
-polished_blackstone_bricks
-polished_blackstone_brick_slab
-polished_blackstone_brick_stairs
-cracked_polished_blackstone_bricks
-respawn_anchor
-candle
-white_candle
-orange_candle
-magenta_candle
-light_blue_candle
-yellow_candle
-lime_candle
-pink_candle
-gray_candle
-light_gray_candle
-cyan_candle
-purple_candle
-blue_candle
-brown_candle
-green_candle
-red_candle
-black_candle
-small_amethyst_bud
-medium_amethyst_bud
-large_amethyst_bud
-amethyst_cluster
-pointed_dripstone
-ochre_froglight
-verdant_froglight
-pearlescent_froglight
-echo_shard
-bedrock
-budding_amethyst
-petrified_oak_slab
-chorus_plant
-spawner
-farmland
-infested_stone
-infested_cobblestone
-infested_stone_bricks
-infested_mossy_stone_bricks
-infested_cracked_stone_bricks
-infested_chiseled_stone_bricks
-infested_deepslate
-reinforced_deepslate
-end_portal_frame
-command_block
-barrier
-light
-dirt_path
-repeating_command_block
-chain_command_block
-structure_void
-structure_block
-jigsaw
-bundle
-allay_spawn_egg
-axolotl_spawn_egg
-bat_spawn_egg
-bee_spawn_egg
-blaze_spawn_egg
-cat_spawn_egg
-cave_spider_spawn_egg
-chicken_spawn_egg
-cod_spawn_egg
-cow_spawn_egg
-creeper_spawn_egg
-dolphin_spawn_egg
-donkey_spawn_egg
-drowned_spawn_egg
-elder_guardian_spawn_egg
-enderman_spawn_egg
-endermite_spawn_egg
-evoker_spawn_egg
-fox_spawn_egg
-frog_spawn_egg
-ghast_spawn_egg
-glow_squid_spawn_egg
-goat_spawn_egg
-guardian_spawn_egg
-hoglin_spawn_egg
-horse_spawn_egg
-husk_spawn_egg
-llama_spawn_egg
-magma_cube_spawn_egg
-mooshroom_spawn_egg
-mule_spawn_egg
-ocelot_spawn_egg
-panda_spawn_egg
-parrot_spawn_egg
-phantom_spawn_egg
-pig_spawn_egg
-piglin_spawn_egg
-piglin_brute_spawn_egg
-pillager_spawn_egg
-polar_bear_spawn_egg
-pufferfish_spawn_egg
-rabbit_spawn_egg
-ravager_spawn_egg
-salmon_spawn_egg
-sheep_spawn_egg
-shulker_spawn_egg
-silverfish_spawn_egg
-skeleton_spawn_egg
-skeleton_horse_spawn_egg
-slime_spawn_egg
-spider_spawn_egg
-squid_spawn_egg
-stray_spawn_egg
-strider_spawn_egg
-tadpole_spawn_egg
-trader_llama_spawn_egg
-tropical_fish_spawn_egg
-turtle_spawn_egg
-vex_spawn_egg
-villager_spawn_egg
-vindicator_spawn_egg
-wandering_trader_spawn_egg
-warden_spawn_egg
-witch_spawn_egg
-wither_skeleton_spawn_egg
-wolf_spawn_egg
-zoglin_spawn_egg
-zombie_spawn_egg
-zombie_horse_spawn_egg
-zombie_villager_spawn_egg
-zombified_piglin_spawn_egg
-player_head
-command_block_minecart
-knowledge_book
-debug_stick
-frogspawn
+RELEVANT MINECRAFT BLOCK AND ITEM NAMES (exact names to use; the list is filtered to this request,
+so use other exact Minecraft identifiers if something you need is missing):
+{{BLOCK_NAMES}}
 
 ---
 
@@ -1240,6 +94,7 @@ Parameters:
 craft_item
 Parameters:
 "item_name": The name of the item to craft (string).
+"count" (optional): How many items to make; the recipe is run as often as needed in one go, so use this instead of repeating `craft_item` (integer, default is 1).
 
 use_block
 Parameters:
@@ -1262,6 +117,9 @@ mine_resource
 Parameters:
 "block_name": The name of the block type to find and mine (string).
 "max_distance" (optional): The maximum distance to search for the block (integer, default is 64).
+"count" (optional): How many blocks of this type to mine; they are mined in one planned route, so use this instead of repeating `mine_resource` (integer, default is 1).
+"rank" (optional): "euclidean" mines the nearest block in a straight line; "path" mines the block that is cheapest to walk to, skipping blocks behind walls or deep underground (string, default is "euclidean").
+"mode" (optional): "vein" mines the whole connected cluster (ore vein) around the chosen block in one call, ignoring "count"; use it for ores such as coal_ore or iron_ore when the task does not fix an exact number. "blocks" mines "count" blocks (string, default is "blocks").
 
 kill_entity
 Parameters:
@@ -1289,1159 +147,9 @@ Copy code
 
 ---
 
-ALL MINECRAFT BLOCK NAMES:
-Id
-stone
-granite
-polished_granite
-diorite
-polished_diorite
-andesite
-polished_andesite
-deepslate
-cobbled_deepslate
-polished_deepslate
-calcite
-tuff
-dripstone_block
-grass_block
-dirt
-coarse_dirt
-podzol
-rooted_dirt
-mud
-crimson_nylium
-warped_nylium
-cobblestone
-oak_planks
-spruce_planks
-birch_planks
-jungle_planks
-acacia_planks
-dark_oak_planks
-mangrove_planks
-crimson_planks
-warped_planks
-oak_sapling
-spruce_sapling
-birch_sapling
-jungle_sapling
-acacia_sapling
-dark_oak_sapling
-mangrove_propagule
-sand
-red_sand
-gravel
-coal_ore
-deepslate_coal_ore
-iron_ore
-deepslate_iron_ore
-copper_ore
-deepslate_copper_ore
-gold_ore
-deepslate_gold_ore
-redstone_ore
-deepslate_redstone_ore
-emerald_ore
-deepslate_emerald_ore
-lapis_ore
-deepslate_lapis_ore
-diamond_ore
-deepslate_diamond_ore
-nether_gold_ore
-nether_quartz_ore
-ancient_debris
-coal_block
-raw_iron_block
-raw_copper_block
-raw_gold_block
-amethyst_block
-iron_block
-copper_block
-gold_block
-diamond_block
-netherite_block
-exposed_copper
-weathered_copper
-oxidized_copper
-cut_copper
-exposed_cut_copper
-weathered_cut_copper
-oxidized_cut_copper
-cut_copper_stairs
-exposed_cut_copper_stairs
-weathered_cut_copper_stairs
-oxidized_cut_copper_stairs
-cut_copper_slab
-exposed_cut_copper_slab
-weathered_cut_copper_slab
-oxidized_cut_copper_slab
-waxed_copper_block
-waxed_exposed_copper
-waxed_weathered_copper
-waxed_oxidized_copper
-waxed_cut_copper
-waxed_exposed_cut_copper
-waxed_weathered_cut_copper
-waxed_oxidized_cut_copper
-waxed_cut_copper_stairs
-waxed_exposed_cut_copper_stairs
-waxed_weathered_cut_copper_stairs
-waxed_oxidized_cut_copper_stairs
-waxed_cut_copper_slab
-waxed_exposed_cut_copper_slab
-waxed_weathered_cut_copper_slab
-waxed_oxidized_cut_copper_slab
-oak_log
-spruce_log
-birch_log
-jungle_log
-acacia_log
-dark_oak_log
-mangrove_log
-mangrove_roots
-muddy_mangrove_roots
-crimson_stem
-warped_stem
-stripped_oak_log
-stripped_spruce_log
-stripped_birch_log
-stripped_jungle_log
-stripped_acacia_log
-stripped_dark_oak_log
-stripped_mangrove_log
-stripped_crimson_stem
-stripped_warped_stem
-stripped_oak_wood
-stripped_spruce_wood
-stripped_birch_wood
-stripped_jungle_wood
-stripped_acacia_wood
-stripped_dark_oak_wood
-stripped_mangrove_wood
-stripped_crimson_hyphae
-stripped_warped_hyphae
-oak_wood
-spruce_wood
-birch_wood
-jungle_wood
-acacia_wood
-dark_oak_wood
-mangrove_wood
-crimson_hyphae
-warped_hyphae
-oak_leaves
-spruce_leaves
-birch_leaves
-jungle_leaves
-acacia_leaves
-dark_oak_leaves
-mangrove_leaves
-azalea_leaves
-flowering_azalea_leaves
-sponge
-wet_sponge
-glass
-tinted_glass
-lapis_block
-sandstone
-chiseled_sandstone
-cut_sandstone
-cobweb
-grass
-fern
-azalea
-flowering_azalea
-dead_bush
-seagrass
-sea_pickle
-white_wool
-orange_wool
-magenta_wool
-light_blue_wool
-yellow_wool
-lime_wool
-pink_wool
-gray_wool
-light_gray_wool
-cyan_wool
-purple_wool
-blue_wool
-brown_wool
-green_wool
-red_wool
-black_wool
-dandelion
-poppy
-blue_orchid
-allium
-azure_bluet
-red_tulip
-orange_tulip
-white_tulip
-pink_tulip
-oxeye_daisy
-cornflower
-lily_of_the_valley
-wither_rose
-spore_blossom
-brown_mushroom
-red_mushroom
-crimson_fungus
-warped_fungus
-crimson_roots
-warped_roots
-nether_sprouts
-weeping_vines
-twisting_vines
-sugar_cane
-kelp
-moss_carpet
-moss_block
-hanging_roots
-big_dripleaf
-small_dripleaf
-bamboo
-oak_slab
-spruce_slab
-birch_slab
-jungle_slab
-acacia_slab
-dark_oak_slab
-mangrove_slab
-crimson_slab
-warped_slab
-stone_slab
-smooth_stone_slab
-sandstone_slab
-cut_sandstone_slab
-cobblestone_slab
-brick_slab
-stone_brick_slab
-mud_brick_slab
-nether_brick_slab
-quartz_slab
-red_sandstone_slab
-cut_red_sandstone_slab
-purpur_slab
-prismarine_slab
-prismarine_brick_slab
-dark_prismarine_slab
-smooth_quartz
-smooth_red_sandstone
-smooth_sandstone
-smooth_stone
-bricks
-bookshelf
-mossy_cobblestone
-obsidian
-torch
-end_rod
-chorus_flower
-purpur_block
-purpur_pillar
-purpur_stairs
-chest
-crafting_table
-furnace
-ladder
-cobblestone_stairs
-snow
-ice
-snow_block
-cactus
-clay
-jukebox
-oak_fence
-spruce_fence
-birch_fence
-jungle_fence
-acacia_fence
-dark_oak_fence
-mangrove_fence
-crimson_fence
-warped_fence
-pumpkin
-carved_pumpkin
-jack_o_lantern
-netherrack
-soul_sand
-soul_soil
-basalt
-polished_basalt
-smooth_basalt
-soul_torch
-glowstone
-stone_bricks
-mossy_stone_bricks
-cracked_stone_bricks
-chiseled_stone_bricks
-packed_mud
-mud_bricks
-deepslate_bricks
-cracked_deepslate_bricks
-deepslate_tiles
-cracked_deepslate_tiles
-chiseled_deepslate
-brown_mushroom_block
-red_mushroom_block
-mushroom_stem
-iron_bars
-chain
-glass_pane
-melon
-vine
-glow_lichen
-brick_stairs
-stone_brick_stairs
-mud_brick_stairs
-mycelium
-lily_pad
-nether_bricks
-cracked_nether_bricks
-chiseled_nether_bricks
-nether_brick_fence
-nether_brick_stairs
-sculk
-sculk_vein
-sculk_catalyst
-sculk_shrieker
-enchanting_table
-end_stone
-end_stone_bricks
-dragon_egg
-sandstone_stairs
-ender_chest
-emerald_block
-oak_stairs
-spruce_stairs
-birch_stairs
-jungle_stairs
-acacia_stairs
-dark_oak_stairs
-mangrove_stairs
-crimson_stairs
-warped_stairs
-beacon
-cobblestone_wall
-mossy_cobblestone_wall
-brick_wall
-prismarine_wall
-red_sandstone_wall
-mossy_stone_brick_wall
-granite_wall
-stone_brick_wall
-mud_brick_wall
-nether_brick_wall
-andesite_wall
-red_nether_brick_wall
-sandstone_wall
-end_stone_brick_wall
-diorite_wall
-blackstone_wall
-polished_blackstone_wall
-polished_blackstone_brick_wall
-cobbled_deepslate_wall
-polished_deepslate_wall
-deepslate_brick_wall
-deepslate_tile_wall
-anvil
-chipped_anvil
-damaged_anvil
-chiseled_quartz_block
-quartz_block
-quartz_bricks
-quartz_pillar
-quartz_stairs
-white_terracotta
-orange_terracotta
-magenta_terracotta
-light_blue_terracotta
-yellow_terracotta
-lime_terracotta
-pink_terracotta
-gray_terracotta
-light_gray_terracotta
-cyan_terracotta
-purple_terracotta
-blue_terracotta
-brown_terracotta
-green_terracotta
-red_terracotta
-black_terracotta
-hay_block
-white_carpet
-orange_carpet
-magenta_carpet
-light_blue_carpet
-yellow_carpet
-lime_carpet
-pink_carpet
-gray_carpet
-light_gray_carpet
-cyan_carpet
-purple_carpet
-blue_carpet
-brown_carpet
-green_carpet
-red_carpet
-black_carpet
-terracotta
-packed_ice
-sunflower
-lilac
-rose_bush
-peony
-tall_grass
-large_fern
-white_stained_glass
-orange_stained_glass
-magenta_stained_glass
-light_blue_stained_glass
-yellow_stained_glass
-lime_stained_glass
-pink_stained_glass
-gray_stained_glass
-light_gray_stained_glass
-cyan_stained_glass
-purple_stained_glass
-blue_stained_glass
-brown_stained_glass
-green_stained_glass
-red_stained_glass
-black_stained_glass
-white_stained_glass_pane
-orange_stained_glass_pane
-magenta_stained_glass_pane
-light_blue_stained_glass_pane
-yellow_stained_glass_pane
-lime_stained_glass_pane
-pink_stained_glass_pane
-gray_stained_glass_pane
-light_gray_stained_glass_pane
-cyan_stained_glass_pane
-purple_stained_glass_pane
-blue_stained_glass_pane
-brown_stained_glass_pane
-green_stained_glass_pane
-red_stained_glass_pane
-black_stained_glass_pane
-prismarine
-prismarine_bricks
-dark_prismarine
-prismarine_stairs
-prismarine_brick_stairs
-dark_prismarine_stairs
-sea_lantern
-red_sandstone
-chiseled_red_sandstone
-cut_red_sandstone
-red_sandstone_stairs
-magma_block
-nether_wart_block
-warped_wart_block
-red_nether_bricks
-bone_block
-shulker_box
-white_shulker_box
-orange_shulker_box
-magenta_shulker_box
-light_blue_shulker_box
-yellow_shulker_box
-lime_shulker_box
-pink_shulker_box
-gray_shulker_box
-light_gray_shulker_box
-cyan_shulker_box
-purple_shulker_box
-blue_shulker_box
-brown_shulker_box
-green_shulker_box
-red_shulker_box
-black_shulker_box
-white_glazed_terracotta
-orange_glazed_terracotta
-magenta_glazed_terracotta
-light_blue_glazed_terracotta
-yellow_glazed_terracotta
-lime_glazed_terracotta
-pink_glazed_terracotta
-gray_glazed_terracotta
-light_gray_glazed_terracotta
-cyan_glazed_terracotta
-purple_glazed_terracotta
-blue_glazed_terracotta
-brown_glazed_terracotta
-green_glazed_terracotta
-red_glazed_terracotta
-black_glazed_terracotta
-white_concrete
-orange_concrete
-magenta_concrete
-light_blue_concrete
-yellow_concrete
-lime_concrete
-pink_concrete
-gray_concrete
-light_gray_concrete
-cyan_concrete
-purple_concrete
-blue_concrete
-brown_concrete
-green_concrete
-red_concrete
-black_concrete
-white_concrete_powder
-orange_concrete_powder
-magenta_concrete_powder
-light_blue_concrete_powder
-yellow_concrete_powder
-lime_concrete_powder
-pink_concrete_powder
-gray_concrete_powder
-light_gray_concrete_powder
-cyan_concrete_powder
-purple_concrete_powder
-blue_concrete_powder
-brown_concrete_powder
-green_concrete_powder
-red_concrete_powder
-black_concrete_powder
-turtle_egg
-dead_tube_coral_block
-dead_brain_coral_block
-dead_bubble_coral_block
-dead_fire_coral_block
-dead_horn_coral_block
-tube_coral_block
-brain_coral_block
-bubble_coral_block
-fire_coral_block
-horn_coral_block
-tube_coral
-brain_coral
-bubble_coral
-fire_coral
-horn_coral
-dead_brain_coral
-dead_bubble_coral
-dead_fire_coral
-dead_horn_coral
-dead_tube_coral
-tube_coral_fan
-brain_coral_fan
-bubble_coral_fan
-fire_coral_fan
-horn_coral_fan
-dead_tube_coral_fan
-dead_brain_coral_fan
-dead_bubble_coral_fan
-dead_fire_coral_fan
-dead_horn_coral_fan
-blue_ice
-conduit
-polished_granite_stairs
-smooth_red_sandstone_stairs
-mossy_stone_brick_stairs
-polished_diorite_stairs
-mossy_cobblestone_stairs
-end_stone_brick_stairs
-stone_stairs
-smooth_sandstone_stairs
-smooth_quartz_stairs
-granite_stairs
-andesite_stairs
-red_nether_brick_stairs
-polished_andesite_stairs
-diorite_stairs
-cobbled_deepslate_stairs
-polished_deepslate_stairs
-deepslate_brick_stairs
-deepslate_tile_stairs
-polished_granite_slab
-smooth_red_sandstone_slab
-mossy_stone_brick_slab
-polished_diorite_slab
-mossy_cobblestone_slab
-end_stone_brick_slab
-smooth_sandstone_slab
-smooth_quartz_slab
-granite_slab
-andesite_slab
-red_nether_brick_slab
-polished_andesite_slab
-diorite_slab
-cobbled_deepslate_slab
-polished_deepslate_slab
-deepslate_brick_slab
-deepslate_tile_slab
-scaffolding
-redstone
-redstone_torch
-redstone_block
-repeater
-comparator
-piston
-sticky_piston
-slime_block
-honey_block
-observer
-hopper
-dispenser
-dropper
-lectern
-target
-lever
-lightning_rod
-daylight_detector
-sculk_sensor
-tripwire_hook
-trapped_chest
-tnt
-redstone_lamp
-note_block
-stone_button
-polished_blackstone_button
-oak_button
-spruce_button
-birch_button
-jungle_button
-acacia_button
-dark_oak_button
-mangrove_button
-crimson_button
-warped_button
-stone_pressure_plate
-polished_blackstone_pressure_plate
-light_weighted_pressure_plate
-heavy_weighted_pressure_plate
-oak_pressure_plate
-spruce_pressure_plate
-birch_pressure_plate
-jungle_pressure_plate
-acacia_pressure_plate
-dark_oak_pressure_plate
-mangrove_pressure_plate
-crimson_pressure_plate
-warped_pressure_plate
-iron_door
-oak_door
-spruce_door
-birch_door
-jungle_door
-acacia_door
-dark_oak_door
-mangrove_door
-crimson_door
-warped_door
-iron_trapdoor
-oak_trapdoor
-spruce_trapdoor
-birch_trapdoor
-jungle_trapdoor
-acacia_trapdoor
-dark_oak_trapdoor
-mangrove_trapdoor
-crimson_trapdoor
-warped_trapdoor
-oak_fence_gate
-spruce_fence_gate
-birch_fence_gate
-jungle_fence_gate
-acacia_fence_gate
-dark_oak_fence_gate
-mangrove_fence_gate
-crimson_fence_gate
-warped_fence_gate
-powered_rail
-detector_rail
-rail
-activator_rail
-saddle
-minecart
-chest_minecart
-furnace_minecart
-tnt_minecart
-hopper_minecart
-carrot_on_a_stick
-warped_fungus_on_a_stick
-elytra
-oak_boat
-oak_chest_boat
-spruce_boat
-spruce_chest_boat
-birch_boat
-birch_chest_boat
-jungle_boat
-jungle_chest_boat
-acacia_boat
-acacia_chest_boat
-dark_oak_boat
-dark_oak_chest_boat
-mangrove_boat
-mangrove_chest_boat
-turtle_helmet
-scute
-flint_and_steel
-apple
-bow
-arrow
-coal
-charcoal
-diamond
-emerald
-lapis_lazuli
-quartz
-amethyst_shard
-raw_iron
-iron_ingot
-raw_copper
-copper_ingot
-raw_gold
-gold_ingot
-netherite_ingot
-netherite_scrap
-wooden_sword
-wooden_shovel
-wooden_pickaxe
-wooden_axe
-wooden_hoe
-stone_sword
-stone_shovel
-stone_pickaxe
-stone_axe
-stone_hoe
-golden_sword
-golden_shovel
-golden_pickaxe
-golden_axe
-golden_hoe
-iron_sword
-iron_shovel
-iron_pickaxe
-iron_axe
-iron_hoe
-diamond_sword
-diamond_shovel
-diamond_pickaxe
-diamond_axe
-diamond_hoe
-netherite_sword
-netherite_shovel
-netherite_pickaxe
-netherite_axe
-netherite_hoe
-stick
-bowl
-mushroom_stew
-string
-feather
-gunpowder
-wheat_seeds
-wheat
-bread
-leather_helmet
-leather_chestplate
-leather_leggings
-leather_boots
-chainmail_helmet
-chainmail_chestplate
-chainmail_leggings
-chainmail_boots
-iron_helmet
-iron_chestplate
-iron_leggings
-iron_boots
-diamond_helmet
-diamond_chestplate
-diamond_leggings
-diamond_boots
-golden_helmet
-golden_chestplate
-golden_leggings
-golden_boots
-netherite_helmet
-netherite_chestplate
-netherite_leggings
-netherite_boots
-flint
-porkchop
-cooked_porkchop
-painting
-golden_apple
-enchanted_golden_apple
-oak_sign
-spruce_sign
-birch_sign
-jungle_sign
-acacia_sign
-dark_oak_sign
-mangrove_sign
-crimson_sign
-warped_sign
-bucket
-water_bucket
-lava_bucket
-powder_snow_bucket
-snowball
-leather
-milk_bucket
-pufferfish_bucket
-salmon_bucket
-cod_bucket
-tropical_fish_bucket
-axolotl_bucket
-tadpole_bucket
-brick
-clay_ball
-dried_kelp_block
-paper
-book
-slime_ball
-egg
-compass
-recovery_compass
-fishing_rod
-clock
-spyglass
-glowstone_dust
-cod
-salmon
-tropical_fish
-pufferfish
-cooked_cod
-cooked_salmon
-ink_sac
-glow_ink_sac
-cocoa_beans
-white_dye
-orange_dye
-magenta_dye
-light_blue_dye
-yellow_dye
-lime_dye
-pink_dye
-gray_dye
-light_gray_dye
-cyan_dye
-purple_dye
-blue_dye
-brown_dye
-green_dye
-red_dye
-black_dye
-bone_meal
-bone
-sugar
-cake
-white_bed
-orange_bed
-magenta_bed
-light_blue_bed
-yellow_bed
-lime_bed
-pink_bed
-gray_bed
-light_gray_bed
-cyan_bed
-purple_bed
-blue_bed
-brown_bed
-green_bed
-red_bed
-black_bed
-cookie
-filled_map
-shears
-melon_slice
-dried_kelp
-pumpkin_seeds
-melon_seeds
-beef
-cooked_beef
-chicken
-cooked_chicken
-rotten_flesh
-ender_pearl
-blaze_rod
-ghast_tear
-gold_nugget
-nether_wart
-potion
-glass_bottle
-spider_eye
-fermented_spider_eye
-blaze_powder
-magma_cream
-brewing_stand
-cauldron
-ender_eye
-glistering_melon_slice
-experience_bottle
-fire_charge
-writable_book
-written_book
-item_frame
-glow_item_frame
-flower_pot
-carrot
-potato
-baked_potato
-poisonous_potato
-map
-golden_carrot
-skeleton_skull
-wither_skeleton_skull
-zombie_head
-creeper_head
-dragon_head
-nether_star
-pumpkin_pie
-firework_rocket
-firework_star
-enchanted_book
-nether_brick
-prismarine_shard
-prismarine_crystals
-rabbit
-cooked_rabbit
-rabbit_stew
-rabbit_foot
-rabbit_hide
-armor_stand
-iron_horse_armor
-golden_horse_armor
-diamond_horse_armor
-leather_horse_armor
-lead
-name_tag
-mutton
-cooked_mutton
-white_banner
-orange_banner
-magenta_banner
-light_blue_banner
-yellow_banner
-lime_banner
-pink_banner
-gray_banner
-light_gray_banner
-cyan_banner
-purple_banner
-blue_banner
-brown_banner
-green_banner
-red_banner
-black_banner
-end_crystal
-chorus_fruit
-popped_chorus_fruit
-beetroot
-beetroot_seeds
-beetroot_soup
-dragon_breath
-splash_potion
-spectral_arrow
-tipped_arrow
-lingering_potion
-shield
-totem_of_undying
-shulker_shell
-iron_nugget
-music_disc_13
-music_disc_cat
-music_disc_blocks
-music_disc_chirp
-music_disc_far
-music_disc_mall
-music_disc_mellohi
-music_disc_stal
-music_disc_strad
-music_disc_ward
-music_disc_11
-music_disc_wait
-music_disc_otherside
-music_disc_5
-music_disc_pigstep
-disc_fragment_5
-trident
-phantom_membrane
-nautilus_shell
-heart_of_the_sea
-crossbow
-suspicious_stew
-loom
-flower_banner_pattern
-creeper_banner_pattern
-skull_banner_pattern
-mojang_banner_pattern
-globe_banner_pattern
-piglin_banner_pattern
-goat_horn
-composter
-barrel
-smoker
-blast_furnace
-cartography_table
-fletching_table
-grindstone
-smithing_table
-stonecutter
-bell
-lantern
-soul_lantern
-sweet_berries
-glow_berries
-campfire
-soul_campfire
-shroomlight
-honeycomb
-bee_nest
-beehive
-honey_bottle
-honeycomb_block
-lodestone
-crying_obsidian
-blackstone
-blackstone_slab
-blackstone_stairs
-gilded_blackstone
-polished_blackstone
-polished_blackstone_slab
-polished_blackstone_stairs
-chiseled_polished_blackstone
-polished_blackstone_bricks
-polished_blackstone_brick_slab
-polished_blackstone_brick_stairs
-cracked_polished_blackstone_bricks
-respawn_anchor
-candle
-white_candle
-orange_candle
-magenta_candle
-light_blue_candle
-yellow_candle
-lime_candle
-pink_candle
-gray_candle
-light_gray_candle
-cyan_candle
-purple_candle
-blue_candle
-brown_candle
-green_candle
-red_candle
-black_candle
-small_amethyst_bud
-medium_amethyst_bud
-large_amethyst_bud
-amethyst_cluster
-pointed_dripstone
-ochre_froglight
-verdant_froglight
-pearlescent_froglight
-echo_shard
-bedrock
-budding_amethyst
-petrified_oak_slab
-chorus_plant
-spawner
-farmland
-infested_stone
-infested_cobblestone
-infested_stone_bricks
-infested_mossy_stone_bricks
-infested_cracked_stone_bricks
-infested_chiseled_stone_bricks
-infested_deepslate
-reinforced_deepslate
-end_portal_frame
-command_block
-barrier
-light
-dirt_path
-repeating_command_block
-chain_command_block
-structure_void
-structure_block
-jigsaw
-bundle
-allay_spawn_egg
-axolotl_spawn_egg
-bat_spawn_egg
-bee_spawn_egg
-blaze_spawn_egg
-cat_spawn_egg
-cave_spider_spawn_egg
-chicken_spawn_egg
-cod_spawn_egg
-cow_spawn_egg
-creeper_spawn_egg
-dolphin_spawn_egg
-donkey_spawn_egg
-drowned_spawn_egg
-elder_guardian_spawn_egg
-enderman_spawn_egg
-endermite_spawn_egg
-evoker_spawn_egg
-fox_spawn_egg
-frog_spawn_egg
-ghast_spawn_egg
-glow_squid_spawn_egg
-goat_spawn_egg
-guardian_spawn_egg
-hoglin_spawn_egg
-horse_spawn_egg
-husk_spawn_egg
-llama_spawn_egg
-magma_cube_spawn_egg
-mooshroom_spawn_egg
-mule_spawn_egg
-ocelot_spawn_egg
-panda_spawn_egg
-parrot_spawn_egg
-phantom_spawn_egg
-pig_spawn_egg
-piglin_spawn_egg
-piglin_brute_spawn_egg
-pillager_spawn_egg
-polar_bear_spawn_egg
-pufferfish_spawn_egg
-rabbit_spawn_egg
-ravager_spawn_egg
-salmon_spawn_egg
-sheep_spawn_egg
-shulker_spawn_egg
-silverfish_spawn_egg
-skeleton_spawn_egg
-skeleton_horse_spawn_egg
-slime_spawn_egg
-spider_spawn_egg
-squid_spawn_egg
-stray_spawn_egg
-strider_spawn_egg
-tadpole_spawn_egg
-trader_llama_spawn_egg
-tropical_fish_spawn_egg
-turtle_spawn_egg
-vex_spawn_egg
-villager_spawn_egg
-vindicator_spawn_egg
-wandering_trader_spawn_egg
-warden_spawn_egg
-witch_spawn_egg
-wither_skeleton_spawn_egg
-wolf_spawn_egg
-zoglin_spawn_egg
-zombie_spawn_egg
-zombie_horse_spawn_egg
-zombie_villager_spawn_egg
-zombified_piglin_spawn_egg
-player_head
-command_block_minecart
-knowledge_book
-debug_stick
-frogspawn
+RELEVANT MINECRAFT BLOCK AND ITEM NAMES (exact names to use; the list is filtered to this request,
+so use other exact Minecraft identifiers if something you need is missing):
+{{BLOCK_NAMES}}
 
 ---
 
@@ -0,0 +1,235 @@
+import math
+import re
+from collections import Counter
+from llm import minecraft_data
+from llm.block_catalog import default_catalog, singularize
+from llm.response_cache import normalize_command
+
+# Natural blocks to mine for an item when the block of the same name is rarely found in the world.
+PREFERRED_SOURCES = {
+    'cobblestone': 'stone',
+    'cobbled_deepslate': 'deepslate',
+}
+# Upper bound on recipe-tree nodes explored per goal, so exotic targets fail fast to the LLM.
+SEARCH_BUDGET = 20000
+
+_GOAL = re.compile(r'^(?:craft|make|build|create)\s+(?:(\d+)\s+|an?\s+|the\s+|some\s+)?(.+)$')
+
+
+class _Plan:
+    """Gathers and crafts needed for part of a recipe tree."""
+
+    def __init__(self):
+        # ('gather', block name, blocks to mine, tools that can harvest it) and
+        # ('craft', item name, items to make), dependencies first
+        self.steps = []
+        self.needs_table = False
+
+    @property
+    def raw_needed(self):
+        return sum(step[2] for step in self.steps if step[0] == 'gather')
+
+    @property
+    def crafts(self):
+        return [step for step in self.steps if step[0] == 'craft']
+
+    def extend(self, other):
+        self.steps.extend(other.steps)
+        self.needs_table = self.needs_table or other.needs_table
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def parse_crafting_goal(command):
+    """(item name, count) if ``command`` is purely "craft N X", otherwise None."""
+    match = _GOAL.match(normalize_command(command))
+    if not match:
+        return None
+    words = match.group(2).split()
+    catalog = default_catalog()
+    item = catalog.exact('_'.join(words)) or catalog.exact('_'.join(words[:-1] + [singularize(words[-1])]))
+    if item is None or not minecraft_data.recipes_for(item):
+        return None
+    return item, int(match.group(1) or 1)
+
+
+def _source_block(item):
+    # Craftable blocks (iron_block, campfire) only exist where someone placed them
+    sources = [block for block in minecraft_data.block_sources(item) if not minecraft_data.recipes_for(block)]
+    if not sources:
+        return None
+    preferred = PREFERRED_SOURCES.get(item)
+    if preferred in sources:
+        return preferred
+    return item if item in sources else sources[0]
+
+
+class RecipePlanner:
+    """Expands minecraft-data's recipe DAG against the bot's inventory into gather/craft instructions.
+
+    Where an item has several recipes, the one leaving the least raw material to mine
+    (after using what the bot already carries) wins; ties go to fewer crafting steps.
+    Items that cannot be crafted are mined from the block that drops them. A block that
+    only drops with a tool (stone, coal_ore) pulls in the cheapest tool the bot can make
+    unless it carries one, and is mined after that tool is crafted. Goals that need
+    anything else (smelting, mob drops, or a tool that needs either) are left to the LLM.
+    A recipe that needs a crafting table places one first, the carried one or a newly
+    crafted one, unless the state reports one nearby (``craftingTable``).
+    """
+
+    def __init__(self, budget=SEARCH_BUDGET):
+        self.budget = budget
+        self._explored = 0
+
+    def _expand(self, item, count, inventory, visiting):
+        self._explored += 1
+        if self._explored > self.budget:
+            raise _BudgetExceeded()
+        plan = _Plan()
+        used = min(inventory[item], count)
+        inventory[item] -= used
+        count -= used
+        if count == 0:
+            return plan
+
+        best = None
+        if item not in visiting:
+            for recipe in minecraft_data.recipes_for(item):
+                crafts = math.ceil(count / recipe.count)
+                trial_inventory = inventory.copy()
+                trial = _Plan()
+                for ingredient, needed in recipe.ingredients.items():
+                    sub = self._expand(ingredient, needed * crafts, trial_inventory, visiting | {item})
+                    if sub is None:
+                        break
+                    trial.extend(sub)
+                else:
+                    trial.steps.append(('craft', item, crafts * recipe.count))
+                    trial.needs_table = trial.needs_table or recipe.needs_table
+                    trial_inventory[item] += crafts * recipe.count - count  # leftovers stay in inventory
+                    if best is None or (trial.raw_needed, len(trial.crafts)) < (best[0].raw_needed, len(best[0].crafts)):
+                        best = (trial, trial_inventory)
+
+        # Mining only wins when it is strictly cheaper, e.g. coal_ore over unpacking a coal_block
+        source = _source_block(item)
+        if best is not None and (source is None or best[0].raw_needed <= count):
+            inventory.clear()
+            inventory.update(best[1])
+            return best[0]
+        if source is None:
+            return None
+        # Blocks like stone and coal_ore drop nothing when mined by hand
+        tools = tuple(minecraft_data.harvest_tools(source))
+        if tools and not any(inventory[tool] for tool in tools):
+            tool_plan = self._tool(tools, inventory, visiting | {item})
+            if tool_plan is None:
+                return None
+            plan.extend(tool_plan)
+        plan.steps.append(('gather', source, count, tools))
+        return plan
+
+    def _tool(self, tools, inventory, visiting):
+        """Plan for the first of ``tools`` (minecraft-data lists the cheapest tier first) that can
+        be made; the tool stays in ``inventory`` for later gathers."""
+        for tool in tools:
+            trial_inventory = inventory.copy()
+            trial = self._expand(tool, 1, trial_inventory, visiting)
+            if trial is not None:
+                trial_inventory[tool] += 1  # not used up by mining
+                inventory.clear()
+                inventory.update(trial_inventory)
+                return trial
+        return None
+
+    def plan(self, item, count, state_data):
+        """Ordered instruction list producing ``count`` of ``item``, or None if it can't be planned locally."""
+        inventory = Counter()
+        for entry in (state_data or {}).get('inventory', []):
+            inventory[entry['name']] += entry.get('count', 1)
+
+        self._explored = 0
+        try:
+            goal = self._expand(item, count, inventory.copy(), frozenset())
+            if goal is None:
+                return None
+            table = None
+            if goal.needs_table and not (state_data or {}).get('craftingTable'):
+                # No table nearby: make (unless carried) and place one first, then plan the goal with what's left
+                remaining = inventory.copy()
+                table = self._expand('crafting_table', 1, remaining, frozenset())
+                goal = self._expand(item, count, remaining, frozenset()) if table is not None else None
+                if goal is None:
+                    return None
+        except _BudgetExceeded:
+            print(f"Recipe planner gave up on {item}: search budget exhausted.")
+            return None
+
+        steps = goal.steps
+        if table is not None:
+            position = (state_data or {}).get('position') or {}
+            steps = table.steps + [('place', 'crafting_table', {
+                'x': int(position.get('x', 0)) + 1, 'y': int(position.get('y', 0)), 'z': int(position.get('z', 0)),
+            })] + steps
+        return _schedule(steps, inventory)
+
+
+def _schedule(steps, inventory):
+    """Instructions for ``steps``, each gather moved as early as its tool allows.
+
+    Gathers needing no tool, or one the bot carries, go up front, so the bot does not walk
+    back and forth between crafts; the rest follow the craft of their tool. Crafts and the
+    table placement keep their dependency order.
+    """
+    upfront, after = [], {}  # gathers to run first; index of a tool's craft -> gathers it unlocks
+    crafted = {}             # tool name -> index of the first step crafting it
+    for index, step in enumerate(steps):
+        if step[0] == 'craft':
+            crafted.setdefault(step[1], index)
+        elif step[0] == 'gather':
+            unlocked_by = min((crafted[tool] for tool in step[3] if tool in crafted), default=None)
+            if unlocked_by is None or any(inventory[tool] for tool in step[3]):
+                upfront.append(step)
+            else:
+                after.setdefault(unlocked_by, []).append(step)
+
+    instructions = []
+    _emit_gathers(instructions, upfront)
+    for index, step in enumerate(steps):
+        if step[0] == 'craft':
+            _append(instructions, {'method': 'craft_item', 'parameters': {'item_name': step[1], 'count': step[2]}})
+        elif step[0] == 'place':
+            instructions.append({'method': 'place_block', 'parameters': {'block_name': step[1], **step[2]}})
+        _emit_gathers(instructions, after.get(index, []))
+    return instructions
+
+
+def _emit_gathers(instructions, gathers):
+    blocks = Counter()
+    for _, block, count, _ in gathers:
+        blocks[block] += count
+    for block, count in blocks.items():
+        # Ranked by path cost, so a gather step does not pick a block it cannot reach
+        _append(instructions, {'method': 'mine_resource', 'parameters': {'block_name': block, 'rank': 'path', 'count': count}})
+
+
+def _append(instructions, instruction):
+    # Sibling sub-trees often craft the same intermediate back to back (planks for sticks, then for the head)
+    previous = instructions[-1] if instructions else None
+    key = 'item_name' if instruction['method'] == 'craft_item' else 'block_name'
+    if previous and previous['method'] == instruction['method'] and previous['parameters'].get(key) == instruction['parameters'][key]:
+        previous['parameters']['count'] += instruction['parameters']['count']
+    else:
+        instructions.append(instruction)
+
+
+def plan_crafting(command, state_data):
+    """Instructions for a pure crafting command ("craft a wooden pickaxe"), or None to use the LLM."""
+    goal = parse_crafting_goal(command)
+    if goal is None:
+        return None
+    instructions = RecipePlanner().plan(goal[0], goal[1], state_data)
+    if instructions is not None:
+        print(f"Planned '{command}' from recipes: {len(instructions)} instructions, no LLM call.")
+    return instructions
@@ -0,0 +1,171 @@
+"""Cache for plans and compiled instructions, so a repeated command skips the LLM.
+
+Keys are the normalized command plus a state fingerprint (position bucket, inventory
+multiset). An in-memory LRU sits in front of a SQLite file that survives restarts; callers
+invalidate a response once its instructions have failed. Tune with ``LLM_CACHE_PATH``
+(empty = memory only), ``LLM_CACHE_TTL`` and ``LLM_CACHE_POSITION_BUCKET``.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+DEFAULT_PATH = os.getenv('LLM_CACHE_PATH', '.llm_cache.sqlite3')
+DEFAULT_TTL = float(os.getenv('LLM_CACHE_TTL', 24 * 60 * 60))
+# Positions within the same bucket (in blocks) count as the same state.
+POSITION_BUCKET = int(os.getenv('LLM_CACHE_POSITION_BUCKET', 8))
+
+
+def normalize_command(command):
+    """Lower-cased, whitespace-collapsed command without trailing punctuation."""
+    return re.sub(r'\s+', ' ', command.strip().lower()).rstrip('.!?')
+
+
+def state_fingerprint(state_data, bucket=POSITION_BUCKET):
+    """Quantized view of the bot state: position bucket plus inventory multiset.
+
+    Two states with the same fingerprint are close enough that an LLM answer for one
+    can be reused for the other.
+    """
+    if not state_data:
+        return None
+    position = state_data.get('position') or {}
+    inventory = Counter()
+    for item in state_data.get('inventory', []):
+        inventory[item['name']] += item.get('count', 1)
+    return {
+        'position': [int(position.get(axis, 0)) // bucket for axis in ('x', 'y', 'z')],
+        'inventory': sorted(inventory.items()),
+    }
+
+
+def cache_key(kind, command, state_data, model=None):
+    fingerprint = {
+        'kind': kind,
+        'model': model,
+        'command': normalize_command(command),
+        'state': state_fingerprint(state_data),
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache for parsed LLM responses: an in-memory LRU in front of SQLite.
+
+    Entries expire after ``ttl`` seconds; each tier evicts least-recently-used entries
+    beyond its size limit, and callers ``invalidate`` responses that turned out wrong.
+    Values must be JSON-serializable.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_memory_entries=256, max_disk_entries=5000):
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)'
+            )
+            self._db.commit()
+        self.counters = Counter()
+
+    def get(self, key):
+        now = time.time()
+        expired = False
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+                expired = True
+            if self._db is not None:
+                row = self._db.execute('SELECT value, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    value, expires_at = json.loads(row[0]), row[1]
+                    if expires_at > now:
+                        self._db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+                        self._db.commit()
+                        self._remember(key, expires_at, value)
+                        self.counters['disk_hits'] += 1
+                        return value
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._db.commit()
+                    expired = True
+            self.counters['expired' if expired else 'misses'] += 1
+            return None
+
+    def put(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), expires_at, now),
+                )
+                self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+                evicted = self._db.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    'SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (self.max_disk_entries,),
+                ).rowcount
+                self.counters['disk_evictions'] += max(evicted, 0)
+                self._db.commit()
+            self.counters['stores'] += 1
+
+    def invalidate(self, key):
+        """Drops ``key`` from both tiers, e.g. once the response it holds has failed to execute."""
+        with self._lock:
+            removed = self._memory.pop(key, None) is not None
+            if self._db is not None:
+                removed = self._db.execute('DELETE FROM responses WHERE key = ?', (key,)).rowcount > 0 or removed
+                self._db.commit()
+            if removed:
+                self.counters['invalidations'] += 1
+
+    def _remember(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters['memory_evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    @property
+    def hit_rate(self):
+        hits = self.counters['memory_hits'] + self.counters['disk_hits']
+        lookups = hits + self.counters['misses'] + self.counters['expired']
+        return hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {**self.counters, 'hit_rate': round(self.hit_rate, 3), 'memory_entries': len(self._memory)}
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache; set LLM_CACHE_PATH to an empty string to keep it in memory only."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache(path=DEFAULT_PATH or None)
+    return _default_cache
@@ -0,0 +1,89 @@
+import json
+
+
+class IncrementalJSONParser:
+    """Pulls the elements of one JSON array out of a streamed reply as soon as each is complete.
+
+    Feed it the text chunks of a streamed chat completion; ``feed`` returns the elements
+    finished by that chunk. With ``array_key='instructions'`` each ``instructions[i]``
+    object is returned the moment its closing brace arrives. Without a key, the first
+    array found directly under the top-level object (or the top-level array itself) is used.
+    Once that array has closed ``done`` is set and later text is ignored.
+    """
+
+    def __init__(self, array_key=None):
+        self.array_key = array_key
+        self.buffer = ''
+        self._pos = 0
+        self._stack = []          # open containers: '{' or '['
+        self._in_string = False
+        self._escaped = False
+        self._last_string = None  # most recent string at object level, i.e. the current key
+        self._string_start = None
+        self._array_depth = None  # stack depth of the target array once it has opened
+        self._element_start = None
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done:
+            return []
+        self.buffer += chunk
+        elements = []
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = self.buffer[self._string_start + 1:self._pos]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos
+                self._start_element()
+            elif char in '{[':
+                self._start_element()
+                if char == '[' and self._array_depth is None and self._is_target():
+                    self._stack.append(char)
+                    self._array_depth = len(self._stack)
+                    self._pos += 1
+                    continue
+                self._stack.append(char)
+            elif char in '}]':
+                if self._array_depth is not None and len(self._stack) == self._array_depth:
+                    # Target array closes; flush a trailing scalar element
+                    elements.extend(self._finish_element(self._pos))
+                    self._array_depth = None
+                    self.done = True
+                self._stack.pop()
+                if self._array_depth is not None and len(self._stack) == self._array_depth:
+                    elements.extend(self._finish_element(self._pos + 1))
+            elif char == ',':
+                if self._array_depth is not None and len(self._stack) == self._array_depth:
+                    elements.extend(self._finish_element(self._pos))
+            elif not char.isspace() and char != ':':
+                self._start_element()
+            self._pos += 1
+            if self.done:
+                break
+        return elements
+
+    def _is_target(self):
+        if not self._stack:
+            return self.array_key is None
+        return (len(self._stack) == 1 and self._stack[0] == '{'
+                and (self.array_key is None or self._last_string == self.array_key))
+
+    def _start_element(self):
+        if (self._array_depth is not None and len(self._stack) == self._array_depth
+                and self._element_start is None):
+            self._element_start = self._pos
+
+    def _finish_element(self, end):
+        if self._element_start is None:
+            return []
+        text = self.buffer[self._element_start:end].strip()
+        self._element_start = None
+        return [json.loads(text)] if text else []
@@ -0,0 +1,329 @@
+"""Runs a command: plan, compile each sub-task, execute, learn.
+
+Crafting goals are planned from the recipe tree and repeated sub-tasks from learned
+templates; only the rest go to the LLM (``compile_task``). PipelinedExecutor compiles the
+next sub-task while the current one runs and, with ``streaming``, starts executing a
+sub-task from its first streamed instruction. Each outcome teaches a template or evicts
+the cached responses that failed (``record_outcome``).
+"""
+import copy
+import math
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from llm.prompt_parser import forget_plan, parse_prompt
+from llm.instruction_compiler import forget_instructions, stream_instructions, translate_command_to_instructions
+from llm.instruction_templates import default_library
+from llm.recipe_planner import parse_crafting_goal, plan_crafting
+from llm.response_cache import state_fingerprint
+from llm import instruction_validator
+from llm import minecraft_data
+import tracing
+
+
+def plan(user_command, state_data, attempts=5):
+    """Splits a request into sub-tasks, retrying the LLM call on bad output."""
+    with tracing.span('plan') as plan_span:
+        for attempt in range(attempts):
+            plan_span.set(attempts=attempt + 1)
+            try:
+                tasks = parse_prompt(user_command, state_data)
+                if tasks is None:  # Check if tasks is None
+                    print("Tasks returned None, retrying...")  # Inform about the retry
+                    continue  # Retry the parsing
+                return tasks
+            except Exception as e:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                if attempt == attempts - 1:  # If it's the last attempt, raise the error
+                    raise
+        return None
+
+
+def compile_task(task, state_data, attempts=15):
+    """Compiles one sub-task from the recipe tree or a learned template when possible, otherwise via the LLM."""
+    with tracing.span('compile', task=task) as compile_span:
+        # "Craft 4 torches" and the like expand deterministically from minecraft-data's recipes,
+        # against the current inventory
+        instructions = plan_crafting(task, state_data)
+        if instructions is not None:
+            compile_span.set(source='recipe')
+            return instructions
+        # Sub-tasks matching a template learned from an earlier clean run compile locally
+        instructions = default_library().compile(task, state_data)
+        if instructions is not None:
+            print(f"Compiled '{task}' from template, skipping the LLM.")
+            compile_span.set(source='template')
+            return instructions
+
+        compile_span.set(source='llm')
+        for attempt in range(attempts):
+            compile_span.set(attempts=attempt + 1)
+            try:
+                instructions = translate_command_to_instructions(task, state_data)
+                if instructions is None:  # Check if instructions is None
+                    print("Instructions returned None, retrying...")  # Inform about the retry
+                    continue  # Retry the translation
+                return instructions
+            except Exception as e:
+                print(f"Attempt {attempt + 1} failed: {e}")
+                if attempt == attempts - 1:  # If it's the last attempt, raise the error
+                    raise
+        return None
+
+
+def predict_state(state_data, instructions):
+    """Expected bot state once ``instructions`` have run, as far as it can be told offline.
+
+    Travel moves the bot; mining adds the block's drop; crafting applies the first recipe
+    the inventory can pay for; placing and dropping remove items. Anything else leaves the
+    state alone, so the prediction is only as good as the fingerprint comparison needs.
+    """
+    if state_data is None:
+        return None
+    state = copy.deepcopy(state_data)
+    inventory = Counter()
+    for item in state.get('inventory', []):
+        inventory[item['name']] += item.get('count', 1)
+
+    for instruction in instructions or []:
+        method = instruction.get('method')
+        params = instruction.get('parameters', {})
+        if method == 'travel_to':
+            state['position'] = {axis: params.get(axis) for axis in ('x', 'y', 'z')}
+        elif method == 'mine_resource':
+            inventory[minecraft_data.block_drop(params.get('block_name'))] += params.get('count', 1)
+        elif method == 'craft_item':
+            item_name = params.get('item_name')
+            for recipe in minecraft_data.recipes_for(item_name):
+                times = math.ceil(params.get('count', 1) / recipe.count)
+                if all(inventory[name] >= needed * times for name, needed in recipe.ingredients.items()):
+                    for name, needed in recipe.ingredients.items():
+                        inventory[name] -= needed * times
+                    inventory[item_name] += recipe.count * times
+                    break
+        elif method in ('place_block', 'place_block_at'):
+            inventory[params.get('block_name')] -= 1
+            if params.get('block_name') == 'crafting_table':
+                state['craftingTable'] = {axis: params.get(axis) for axis in ('x', 'y', 'z')}
+        elif method == 'drop_item':
+            inventory[params.get('item_name')] = 0
+
+    state['inventory'] = [{'name': name, 'count': count} for name, count in inventory.items() if count > 0]
+    return state
+
+
+def succeeded(steps, instructions):
+    return len(steps) == len(instructions) and all(step['status'] == 'ok' for step in steps)
+
+
+def record_outcome(task, instructions, steps, state_data):
+    """Learns a template from a cleanly executed sub-task, or evicts a failed one's cached compile.
+
+    Crafting goals are not learned: the recipe planner re-plans them from the live
+    inventory each time, and a replayed chain would redo crafts the inventory no longer
+    needs. Returns whether the sub-task succeeded.
+    """
+    if not (instructions and succeeded(steps, instructions)):
+        # A cached LLM answer that failed would otherwise be replayed on every retry
+        forget_instructions(task, state_data)
+        return False
+    if parse_crafting_goal(task) is None:
+        default_library().learn(task, instructions, state_data)
+    return True
+
+
+def execute_streamed(bot, task, state_data, on_compiled=None):
+    """Compiles a sub-task from a streamed LLM reply and runs each instruction as it arrives.
+
+    The bot starts on instructions[0] while the model is still writing the rest.
+    ``on_compiled`` is called with the full instruction list once the stream ends.
+    Returns (instructions, steps) with steps shaped like ``/batch`` statuses; if the
+    stream fails before anything ran, falls back to ``compile_task`` and a batch.
+    """
+    instructions = plan_crafting(task, state_data)
+    if instructions is None:
+        instructions = default_library().compile(task, state_data)
+        if instructions is not None:
+            print(f"Compiled '{task}' from template, skipping the LLM.")
+    if instructions is not None:
+        source = iter(instructions)
+    else:
+        source = stream_instructions(task, state_data)
+
+    arrived = queue.Queue()
+    done = object()
+
+    def produce():
+        compiled = []
+        try:
+            for instruction in source:
+                compiled.append(instruction)
+                arrived.put(instruction)
+            if on_compiled:
+                on_compiled(compiled)
+        except Exception as e:
+            arrived.put(e)
+        finally:
+            arrived.put(done)
+
+    producer = threading.Thread(target=tracing.bind(produce), name='stream-compile', daemon=True)
+    producer.start()
+    started = time.monotonic()
+    instructions, steps = [], []
+    while True:
+        item = arrived.get()
+        if item is done:
+            break
+        if isinstance(item, Exception):
+            print(f"Streamed compile of '{task}' failed: {item}")
+            if not steps:
+                producer.join()
+                instructions = compile_task(task, state_data) or []
+                if on_compiled:
+                    on_compiled(instructions)
+                return instructions, (bot.execute_instructions(instructions) if instructions else [])
+            break
+        if not steps:
+            print(f"First action for '{task}' after {time.monotonic() - started:.2f}s")
+        instructions.append(item)
+        ok = bot.execute_instruction(item) is not None
+        steps.append({'index': len(steps), 'method': item['method'], 'status': 'ok' if ok else 'error'})
+        print("instruction: ", item, steps[-1]['status'])
+        if not ok:
+            break
+    # Let the stream finish so on_compiled has run before the caller moves on
+    producer.join()
+    return instructions, steps
+
+
+def run_command(bot, user_command, state_data=None):
+    """Runs a user command end to end; pure crafting goals skip both LLM stages.
+
+    "Craft a wooden pickaxe" is planned straight from the recipe tree and sent as one
+    batch. Anything else is split into sub-tasks by the planner and run through a
+    streaming ``PipelinedExecutor``. Returns the per-task step statuses.
+    """
+    with tracing.span('command', command=user_command):
+        state_data = state_data or bot.get_state_data()
+        instructions = plan_crafting(user_command, state_data)
+        if instructions is not None:
+            return [bot.execute_instructions(
+                instructions, on_step=lambda step: print("instruction: ", instructions[step['index']], step['status']))]
+
+        tasks = plan(user_command, state_data)
+        print(tasks)
+        print('--------------------------------')
+        if tasks is None:
+            return []
+        # Compiles each next sub-task while the current one executes; the first one streams,
+        # so the bot starts moving as soon as its first instruction is written
+        executor = PipelinedExecutor(bot, streaming=True)
+        try:
+            results = executor.run([task_object['task'] for task_object in tasks['tasks']], state_data)
+        finally:
+            executor.close()
+        if executor.counters['failed']:
+            forget_plan(user_command, state_data)
+        return results
+
+
+class PipelinedExecutor:
+    """Runs a plan's sub-tasks, compiling the next one while the current one executes.
+
+    Sub-task N+1 is compiled speculatively against the state predicted from sub-task N's
+    instructions. Once N has actually run, the real state is fetched; if its fingerprint
+    (position bucket and inventory, as used by the response cache) differs from the
+    prediction, N+1 is recompiled against the real state before it runs.
+    """
+
+    def __init__(self, bot, pipelined=True, streaming=False):
+        self.bot = bot
+        self.pipelined = pipelined
+        self.streaming = streaming
+        self.counters = Counter()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='compile')
+
+    def _compile(self, task, state_data):
+        started = time.monotonic()
+        instructions = compile_task(task, state_data)
+        return instructions, time.monotonic() - started
+
+    def run(self, tasks, state_data=None):
+        """Executes ``tasks`` (sub-task strings) in order; returns the per-task step statuses.
+
+        With ``streaming``, sub-tasks that have no finished compile waiting for them (the
+        first one, and any whose speculation missed) are compiled from a streamed reply and
+        start executing with the first instruction.
+        """
+        state_data = state_data or self.bot.get_state_data()
+        started = time.monotonic()
+        results = []
+        pending = None
+        basis = state_data
+        if tasks and not self.streaming:
+            pending = self._pool.submit(tracing.bind(self._compile), tasks[0], state_data)
+
+        for index, task in enumerate(tasks):
+            with tracing.span('task', task=task, index=index):
+                instructions, steps = None, None
+                speculated = index > 0 and pending is not None
+                if pending is not None:
+                    instructions, compile_seconds = pending.result()
+                    self.counters['compile_seconds'] += compile_seconds
+                if speculated and state_fingerprint(state_data) != state_fingerprint(basis):
+                    print(f"State diverged from prediction, recompiling '{task}'.")
+                    self.counters['recompiled'] += 1
+                    instructions = None
+                elif speculated:
+                    self.counters['speculation_hits'] += 1
+
+                pending = None
+                has_next = index + 1 < len(tasks)
+
+                def compile_next(compiled, state_data=state_data, index=index):
+                    # Start compiling the next sub-task against the state this one should leave behind
+                    nonlocal pending, basis
+                    basis = predict_state(state_data, compiled)
+                    if self.pipelined:
+                        pending = self._pool.submit(tracing.bind(self._compile), tasks[index + 1], basis)
+
+                if instructions is None and self.streaming:
+                    instructions, steps = execute_streamed(
+                        self.bot, task, state_data, on_compiled=compile_next if has_next else None)
+                elif instructions is None:
+                    instructions, compile_seconds = self._compile(task, state_data)
+                    self.counters['compile_seconds'] += compile_seconds
+                instructions = instructions or []
+
+                if steps is None:
+                    print(task, instructions)
+                    print()
+                    if has_next:
+                        compile_next(instructions)
+                    # One request per compiled task; the server streams back each step as it finishes
+                    steps = []
+                    if instructions:
+                        steps = self.bot.execute_instructions(
+                            instructions, on_step=lambda step: print("instruction: ", instructions[step['index']], step['status']))
+                if not record_outcome(task, instructions, steps, state_data):
+                    self.counters['failed'] += 1
+                results.append(steps)
+
+                if has_next:
+                    state_data = self.bot.get_state_data()
+                    if not self.pipelined:
+                        basis = state_data
+                        pending = None
+
+        elapsed = time.monotonic() - started
+        print(f"Ran {len(tasks)} sub-tasks in {elapsed:.1f}s "
+              f"({self.counters['compile_seconds']:.1f}s compiling, "
+              f"{self.counters['speculation_hits']} speculative compiles used, "
+              f"{self.counters['recompiled']} recompiled, "
+              f"{instruction_validator.stats['llm_calls_avoided']} LLM retries avoided by local repair).")
+        return results
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,251 @@
+"""Runs plans across a fleet of bots: each plan is a chain of dependent sub-tasks that goes,
+whole, to the bot with the lowest estimated finish time (see FleetScheduler).
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from llm import minecraft_data
+from llm.block_catalog import STOP_WORDS, default_catalog, singularize
+from llm.recipe_planner import RecipePlanner, parse_crafting_goal
+from llm.prompt_parser import forget_plan
+from orchestrator import compile_task, plan, record_outcome
+import tracing
+
+# Rough costs, in seconds, used to compare bots; only their ratios matter.
+WALK_SPEED = 4.3            # blocks per second on foot
+STEP_SECONDS = 3.0          # one compiled instruction (dig, craft, place, ...)
+BASE_TASK_SECONDS = 15.0    # a sub-task we know nothing about
+UNREACHABLE_SECONDS = 120.0 # the target block is not within lookup range of this bot
+LOOKUP_DISTANCE = 128
+
+_COORDINATES = re.compile(r'(-?\d+)[,\s]+(-?\d+)[,\s]+(-?\d+)')
+
+
+def task_target(task):
+    """The block a sub-task is about ("mine 5 iron ore" -> iron_ore), or None.
+
+    Item names are mapped to the block that drops them ("collect coal" -> coal_ore).
+    """
+    words = [w for w in re.findall(r'[a-z_]+', task.lower()) if w not in STOP_WORDS]
+    catalog = default_catalog()
+    blocks = set(minecraft_data.block_names())
+    for size in (3, 2, 1):
+        for start in range(len(words) - size + 1):
+            phrase = words[start:start + size]
+            for candidate in ('_'.join(phrase), '_'.join(phrase[:-1] + [singularize(phrase[-1])])):
+                name = catalog.exact(candidate)
+                if name in blocks:
+                    return name
+                sources = minecraft_data.block_sources(name) if name else []
+                if sources:
+                    return sources[0]
+    return None
+
+
+def _describe(chain):
+    return f"'{chain[0]}'" if len(chain) == 1 else f"'{chain[0]}' (+{len(chain) - 1} dependent sub-tasks)"
+
+
+class _Worker:
+    """One bot's queue of (chain index, chain, estimated seconds) and what it is running now."""
+
+    def __init__(self, name, bot):
+        self.name = name
+        self.bot = bot
+        self.queue = deque()
+        self.current_seconds = 0.0
+        self.current_started = None
+        self.completed = 0
+
+    def backlog_seconds(self):
+        running = 0.0
+        if self.current_started is not None:
+            running = max(self.current_seconds - (time.monotonic() - self.current_started), 0.0)
+        return running + sum(seconds for _, _, seconds in self.queue)
+
+
+class FleetScheduler:
+    """Spreads independent chains of sub-tasks over several bots, each running its own queue.
+
+    A chain is an ordered list of sub-tasks where each may need what the previous ones made
+    (a command's plan: gather logs, craft planks, craft a table), so a whole chain runs on one
+    bot, in order, and stops at its first failed sub-task. Only separate chains run in parallel.
+
+    Every chain goes to the bot with the lowest estimated finish time: its current backlog
+    plus, per sub-task, the walk to the task's target block (the nearest one to that bot, from
+    ``find_blocks``, or coordinates in the task) and the work left after
+    counting the bot's inventory, which for crafting goals is the length of the recipe plan
+    against that inventory. A bot whose queue runs dry steals the last queued chain of the most
+    loaded bot when it can finish it sooner than that bot would get to it.
+    """
+
+    def __init__(self, bots):
+        self.workers = {name: _Worker(name, bot) for name, bot in bots.items()}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._lookups = {}
+
+    def _find(self, worker, block_name):
+        # Nearest block as the crow flies: a path-ranked lookup costs up to a second of A* per
+        # (bot, target), and every one of them would run before any bot starts working
+        key = (worker.name, block_name)
+        with self._lock:
+            if key in self._lookups:
+                return self._lookups[key]
+        # Looked up outside the lock; two threads racing on one key just ask twice
+        candidates = worker.bot.find_blocks(block_name, 1, LOOKUP_DISTANCE, rank='euclidean')
+        with self._lock:
+            return self._lookups.setdefault(key, candidates[0] if candidates else None)
+
+    def estimate(self, task, worker, state_data):
+        """Seconds for ``worker`` to do ``task`` once it gets to it (backlog not included)."""
+        position = (state_data or {}).get('position') or {}
+        travel = 0.0
+        coordinates = _COORDINATES.search(task)
+        target = task_target(task)
+        if coordinates and position:
+            x, y, z = map(int, coordinates.groups())
+            travel = ((x - position['x']) ** 2 + (y - position['y']) ** 2 + (z - position['z']) ** 2) ** 0.5 / WALK_SPEED
+        elif target:
+            found = self._find(worker, target)
+            travel = found['cost'] / WALK_SPEED if found else UNREACHABLE_SECONDS
+
+        goal = parse_crafting_goal(task)
+        if goal is not None:
+            instructions = RecipePlanner().plan(goal[0], goal[1], state_data)
+            # A mining tour of n blocks is n steps' worth of work; a counted craft is one step
+            steps = sum(i['parameters'].get('count', 1) if i['method'] == 'mine_resource' else 1
+                        for i in instructions) if instructions is not None else None
+            work = steps * STEP_SECONDS if steps is not None else BASE_TASK_SECONDS
+        else:
+            held = {item['name'] for item in (state_data or {}).get('inventory', [])}
+            # A bot already carrying what the task names skips (some of) the gathering
+            work = BASE_TASK_SECONDS / 2 if target and minecraft_data.block_drop(target) in held else BASE_TASK_SECONDS
+        return travel + work
+
+    def estimate_chain(self, chain, worker, state_data):
+        return sum(self.estimate(task, worker, state_data) for task in chain)
+
+    def assign(self, chains):
+        """Queues each chain on the bot that would finish it first; returns {bot name: [chains]}."""
+        with self._lock:
+            # Bots have moved and blocks have been mined since the last run
+            self._lookups.clear()
+        states = {name: worker.bot.get_state_data() for name, worker in self.workers.items()}
+        for index, chain in enumerate(chains):
+            costs = {name: worker.backlog_seconds() + self.estimate_chain(chain, worker, states[name])
+                     for name, worker in self.workers.items()}
+            name = min(costs, key=costs.get)
+            worker = self.workers[name]
+            worker.queue.append((index, chain, costs[name] - worker.backlog_seconds()))
+            print(f"Assigned {_describe(chain)} to {name} (estimated finish in {costs[name]:.0f}s)")
+        return {name: [chain for _, chain, _ in worker.queue] for name, worker in self.workers.items()}
+
+    def _steal(self, thief):
+        """Moves the most loaded bot's last queued chain to ``thief`` if it would finish sooner there."""
+        with self._lock:
+            victims = [w for w in self.workers.values() if w is not thief and w.queue]
+            if not victims:
+                return None
+            victim = max(victims, key=_Worker.backlog_seconds)
+            index, chain, seconds = victim.queue[-1]
+        cost = self.estimate_chain(chain, thief, thief.bot.get_state_data())
+        with self._lock:
+            # The victim may have started it meanwhile
+            if not victim.queue or victim.queue[-1][0] != index or cost >= victim.backlog_seconds():
+                return None
+            victim.queue.pop()
+            self.counters['stolen'] += 1
+        print(f"{thief.name} stole {_describe(chain)} from {victim.name}")
+        return index, chain, cost
+
+    def _run_task(self, worker, task):
+        with tracing.span('task', task=task, bot=worker.name):
+            state_data = worker.bot.get_state_data()
+            instructions = compile_task(task, state_data) or []
+            steps = worker.bot.execute_instructions(instructions) if instructions else []
+        ok = record_outcome(task, instructions, steps, state_data)
+        with self._lock:
+            self.counters['succeeded' if ok else 'failed'] += 1
+        return steps, ok
+
+    def _run_chain(self, worker, chain):
+        """Runs ``chain`` in order; sub-tasks after a failed one are skipped (their steps are None)."""
+        results = []
+        for task in chain:
+            steps, ok = self._run_task(worker, task)
+            results.append(steps)
+            if not ok:
+                break
+        with self._lock:
+            self.counters['skipped'] += len(chain) - len(results)
+        return results + [None] * (len(chain) - len(results))
+
+    def _work(self, worker, results):
+        while True:
+            with self._lock:
+                item = worker.queue.popleft() if worker.queue else None
+            if item is None:
+                item = self._steal(worker)
+            if item is None:
+                return
+            index, chain, seconds = item
+            worker.current_seconds, worker.current_started = seconds, time.monotonic()
+            results[index] = (worker.name, self._run_chain(worker, chain))
+            worker.current_started = None
+            worker.completed += 1
+
+    def run(self, chains):
+        """Assigns and runs ``chains`` (lists of sub-tasks; a bare string is a chain of one).
+
+        Returns a (bot name, steps per sub-task) pair per chain, in order.
+        """
+        started = time.monotonic()
+        chains = [[chain] if isinstance(chain, str) else list(chain) for chain in chains]
+        self.assign(chains)
+        results = {}
+        threads = [threading.Thread(target=tracing.bind(self._work), args=(worker, results), name=f'bot-{name}')
+                   for name, worker in self.workers.items()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.monotonic() - started
+        tasks = sum(len(chain) for chain in chains)
+        per_bot = ', '.join(f"{w.name}: {w.completed}" for w in self.workers.values())
+        print(f"Fleet ran {len(chains)} chains ({tasks} sub-tasks) in {elapsed:.1f}s "
+              f"({tasks / elapsed * 3600 if elapsed else 0:.0f} tasks/hour; chains per bot {per_bot}; "
+              f"{self.counters['stolen']} stolen, {self.counters['failed']} failed, {self.counters['skipped']} skipped).")
+        # Keyed by position, so a chain repeated in the list keeps each of its results
+        return [results.get(index) for index in range(len(chains))]
+
+    def run_commands(self, user_commands):
+        """Plans each command against the first bot's state and runs the plans across the fleet.
+
+        The commands must be independent of each other; each plan runs as one chain on one bot.
+        Returns a (bot name, steps per sub-task) pair per command, or None where planning failed.
+        """
+        with tracing.span('commands', commands=len(user_commands), bots=len(self.workers)):
+            first = next(iter(self.workers.values()))
+            state_data = first.bot.get_state_data()
+            chains, planned = [], []
+            for user_command in user_commands:
+                tasks = plan(user_command, state_data)
+                if tasks is not None:
+                    planned.append(len(chains))
+                    chains.append([task_object['task'] for task_object in tasks['tasks']])
+                else:
+                    planned.append(None)
+            results = self.run(chains) if chains else []
+            for user_command, index in zip(user_commands, planned):
+                # A plan whose chain failed part way is asked for again next time
+                if index is not None and (results[index] is None or any(
+                        not steps or any(step['status'] != 'ok' for step in steps) for steps in results[index][1])):
+                    forget_plan(user_command, state_data)
+            return [results[index] if index is not None else None for index in planned]
+
+    def run_command(self, user_command):
+        """Plans ``user_command`` and runs its sub-tasks, in order, on the bot best placed for them."""
+        return self.run_commands([user_command])[0]
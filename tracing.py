@@ -0,0 +1,231 @@
+"""Lightweight tracing for the plan -> compile -> execute pipeline.
+
+Spans are written as JSON lines to ``TRACE_PATH`` (tracing is off when it is unset). A span
+opened while another is current becomes its child; the outermost one starts a new trace.
+HTTP calls to the bot API carry ``X-Trace-Id``/``X-Parent-Span-Id``, and the Node server
+writes its own spans (request, travel, dig, craft, fight, batch step) under them, to the
+same file or to its own ``TRACE_PATH``.
+
+    python tracing.py [trace_id] [--path traces.jsonl ...]
+
+renders one command's timeline (the latest trace by default) and how much of it was spent
+waiting on the model versus the bot.
+"""
+import argparse
+import contextlib
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from urllib.parse import urlsplit
+
+import dotenv
+
+dotenv.load_dotenv()
+
+TRACE_PATH = os.getenv('TRACE_PATH', '')
+
+_current = contextvars.ContextVar('current_span', default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation; ``set`` adds attributes until ``end`` writes it out."""
+
+    def __init__(self, name, parent=None, **attrs):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(8)
+        self.span_id = secrets.token_hex(4)
+        self.parent_id = parent.span_id if parent else None
+        self.attrs = attrs
+        self.status = 'ok'
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._ended = False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def fail(self, error):
+        self.status = 'error'
+        self.attrs['error'] = str(error)
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        _write({
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'service': 'python',
+            'start': round(self.start, 6),
+            'duration_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'status': self.status,
+            'attrs': self.attrs,
+        })
+
+
+def _write(record):
+    if not TRACE_PATH:
+        return
+    line = json.dumps(record, default=str) + '\n'
+    with _write_lock, open(TRACE_PATH, 'a', encoding='utf-8') as f:
+        f.write(line)
+
+
+def current_span():
+    return _current.get()
+
+
+def start_span(name, **attrs):
+    """A child of the current span that is not made current; call ``end`` on it.
+
+    For work that outlives the caller's frame, such as a streamed LLM reply consumed by a
+    generator, where making it current would adopt whatever the consumer does meanwhile.
+    """
+    return Span(name, _current.get(), **attrs)
+
+
+@contextlib.contextmanager
+def span(name, **attrs):
+    """Times the block as a child of the current span (or as a new trace) and makes it current."""
+    current = Span(name, _current.get(), **attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(e)
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+
+
+def bind(fn):
+    """Wraps ``fn`` to run in a copy of the caller's context, so spans it opens on another
+    thread (a compile pool, a stream consumer) nest under the caller's span."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def trace_headers(parent=None):
+    """Headers that put the server's spans under ``parent`` (default: the current span);
+    empty when not tracing."""
+    parent = parent or _current.get()
+    if not TRACE_PATH or parent is None:
+        return {}
+    return {'X-Trace-Id': parent.trace_id, 'X-Parent-Span-Id': parent.span_id}
+
+
+@contextlib.contextmanager
+def http_span(method, url, headers):
+    """Span for one call to the bot API; yields it and ``headers`` plus the trace headers naming it."""
+    with span(f"http {method} {urlsplit(url).path}") as current:
+        yield current, {**headers, **trace_headers(current)}
+
+
+def record_usage(current, usage):
+    """Copies an OpenAI ``usage`` object's token counts onto a span."""
+    if usage is not None:
+        current.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+
+
+# -------------------- Timeline -------------------- #
+
+def load_spans(paths):
+    spans = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            spans.extend(json.loads(line) for line in f if line.strip())
+    return spans
+
+
+def _busy_ms(spans):
+    """Wall time covered by at least one of ``spans`` (overlapping spans count once)."""
+    total, reach = 0.0, None
+    for s in sorted(spans, key=lambda s: s['start']):
+        start, end = s['start'] * 1000, s['start'] * 1000 + s['duration_ms']
+        if reach is None or start > reach:
+            total += end - start
+            reach = end
+        elif end > reach:
+            total += end - reach
+            reach = end
+    return total
+
+
+def _label(s):
+    attrs = s.get('attrs', {})
+    details = [f"{key}={attrs[key]}" for key in
+               ('task', 'source', 'attempts', 'model', 'prompt_tokens', 'completion_tokens',
+                'route', 'method', 'block', 'item', 'target', 'outcome', 'status_code')
+               if key in attrs]
+    if s.get('status') == 'error':
+        details.append(f"error={attrs.get('error', '')}")
+    return f"{s['name']}" + (f" ({', '.join(details)})" if details else '')
+
+
+def render_timeline(spans, width=40):
+    """Lines of an indented timeline: offset and duration in ms, a bar, and the span."""
+    if not spans:
+        return ['(no spans)']
+    origin = min(s['start'] for s in spans)
+    finish = max(s['start'] + s['duration_ms'] / 1000 for s in spans)
+    total_ms = max((finish - origin) * 1000, 1e-6)
+    ids = {s['span_id'] for s in spans}
+    children = {}
+    for s in spans:
+        parent = s['parent_id'] if s['parent_id'] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    lines = []
+
+    def walk(parent, depth):
+        for s in sorted(children.get(parent, []), key=lambda s: s['start']):
+            offset = (s['start'] - origin) * 1000
+            begin = int(offset / total_ms * width)
+            length = max(1, round(s['duration_ms'] / total_ms * width))
+            bar = ' ' * begin + '#' * min(length, width - begin)
+            service = 'node' if s.get('service') == 'node' else 'py'
+            lines.append(f"{offset:9.0f} {s['duration_ms']:9.0f}  |{bar:<{width}}| {service:<4} {'  ' * depth}{_label(s)}")
+            walk(s['span_id'], depth + 1)
+
+    walk(None, 0)
+    llm = [s for s in spans if s['name'].startswith('llm.')]
+    bot = [s for s in spans if s['name'].startswith('http ')]
+    llm_ms, bot_ms = _busy_ms(llm), _busy_ms(bot)
+    overlap_ms = llm_ms + bot_ms - _busy_ms(llm + bot)
+    tokens = sum(s['attrs'].get('prompt_tokens', 0) + s['attrs'].get('completion_tokens', 0) for s in llm)
+    lines.append('')
+    lines.append(f"total {total_ms:.0f} ms: model {llm_ms:.0f} ms ({llm_ms / total_ms:.0%}, {len(llm)} calls, {tokens} tokens), "
+                 f"bot {bot_ms:.0f} ms ({bot_ms / total_ms:.0%}, {len(bot)} calls), overlapping {overlap_ms:.0f} ms")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render the timeline of one traced command.')
+    parser.add_argument('trace_id', nargs='?', help='trace to show (default: the most recent one)')
+    parser.add_argument('--path', action='append', help='span file(s) to read (default: TRACE_PATH)')
+    args = parser.parse_args()
+    paths = args.path or [TRACE_PATH or 'traces.jsonl']
+    spans = load_spans(paths)
+    if not spans:
+        print(f"No spans in {', '.join(paths)}")
+        return
+    trace_id = args.trace_id or max((s for s in spans if s['service'] == 'python'), key=lambda s: s['start'],
+                                    default=spans[-1])['trace_id']
+    trace = [s for s in spans if s['trace_id'] == trace_id]
+    roots = [s for s in trace if s['parent_id'] is None]
+    title = roots[0]['attrs'].get('command', roots[0]['name']) if roots else ''
+    print(f"trace {trace_id}: {title}")
+    print(f"{'start ms':>9} {'dur ms':>9}")
+    for line in render_timeline(trace):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()